@@ -1,11 +1,14 @@
 import asyncio
 import hashlib
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from datetime import datetime
 from importlib.metadata import PackageNotFoundError, version
 
 import structlog
 from fastapi import APIRouter, Depends, Header, Query, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import ValidationError
 from slowapi import Limiter
 
@@ -15,6 +18,10 @@ from app.api.schemas import (
     BatchDescribeResponse,
     BatchItemError,
     BatchItemResult,
+    BulkGeocodeItem,
+    BulkGeocodeRequest,
+    CacheInvalidateRequest,
+    CacheInvalidateResponse,
     CacheStatsResponse,
     CircuitBreakerResponse,
     Context,
@@ -28,23 +35,36 @@ from app.api.schemas import (
     Location,
     Warning,
 )
-from app.auth import authenticate
+from app.auth import authenticate, require_api_key
 from app.config import settings
 from app.db import supabase as db
-from app.services.composer import compose_description, get_breaker_statuses
+from app.services.composer import (
+    STREAM_EVENTS,
+    compose_description,
+    get_breaker_statuses,
+    prefetch_batch,
+    stream_description,
+)
 from app.utils.errors import DescriptorError, ProblemDetail
 from app.utils.metrics import batch_job_dec, batch_job_inc
 from app.utils.rate_limit import get_real_ip
 from app.utils.timeout import apply_timeout
+from app.utils.token_bucket import RateLimitQueueFullError
 
 logger = structlog.get_logger()
 
 router = APIRouter()
 limiter = Limiter(key_func=get_real_ip)
 
+_BATCH_INTERRUPTED_ERROR = "interrupted: server shutting down"
+
 
 async def _describe_and_save(item: DescribeRequest, cache) -> DescribeResponse:
     result = await compose_description(item, cache)
+    return await _save_result(item, result)
+
+
+async def _save_result(item: DescribeRequest, result: DescribeResponse) -> DescribeResponse:
     if item.cog_image_id and result.description:
         saved = await db.save_description(
             cog_image_id=item.cog_image_id,
@@ -68,11 +88,44 @@ async def _describe_and_save(item: DescribeRequest, cache) -> DescribeResponse:
     response_model=CacheStatsResponse,
     tags=["system"],
     summary="캐시 통계 조회",
-    description="SQLite 캐시의 히트/미스 통계 및 항목 수를 반환합니다.",
+    description="SQLite 캐시의 히트/미스 통계 및 항목 수를 반환합니다. "
+    "`module`을 지정하면 해당 모듈의 통계만 반환합니다.",
+)
+async def cache_stats(
+    request: Request,
+    module: str | None = Query(
+        default=None,
+        pattern="^(geocode|landcover|mission|context|describe|unknown)$",
+        description="통계를 조회할 캐시 모듈",
+    ),
+):
+    cache = request.app.state.cache
+    return await cache.stats(module=module)
+
+
+@router.post(
+    "/cache/invalidate",
+    response_model=CacheInvalidateResponse,
+    tags=["system"],
+    summary="캐시 접두사 무효화",
+    description="키가 `prefix`로 시작하는 캐시 항목을 청크 단위로 삭제합니다. "
+    "삭제 중에도 다른 요청은 계속 처리됩니다. 관리용으로 API 키 인증만 허용합니다.",
+    responses={
+        401: {"model": ProblemDetail, "description": "인증 실패"},
+        403: {"model": ProblemDetail, "description": "API 키가 아닌 인증 (JWT)"},
+        422: {"model": ErrorResponse, "description": "허용되지 않는 접두사"},
+        429: {"description": "요청 횟수 초과"},
+    },
 )
-async def cache_stats(request: Request):
+@limiter.limit(lambda: settings.rate_limit_data)
+async def cache_invalidate(
+    body: CacheInvalidateRequest,
+    request: Request,
+    _auth: dict = Depends(require_api_key),
+):
     cache = request.app.state.cache
-    return await cache.stats()
+    deleted = await cache.invalidate_prefix(body.prefix)
+    return CacheInvalidateResponse(prefix=body.prefix, deleted=deleted)
 
 
 @router.get(
@@ -217,6 +270,82 @@ async def describe(
     )
 
 
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_payload(module: str, value) -> dict | None:
+    if value is None:
+        return None
+    if module == "describer":
+        description, cached = value
+        return {"description": description, "cached": cached}
+    return value.model_dump(mode="json")
+
+
+async def _describe_events(body: DescribeRequest, cache) -> AsyncIterator[str]:
+    try:
+        async with asyncio.timeout(settings.request_timeout):
+            async for module, value in stream_description(body, cache):
+                if module == "summary":
+                    result = await _save_result(body, value)
+                    yield _sse_event("summary", result.model_dump(mode="json"))
+                else:
+                    yield _sse_event(STREAM_EVENTS[module], _stream_payload(module, value))
+    except TimeoutError:
+        logger.warning("describe_stream_timeout", timeout=settings.request_timeout)
+        yield _sse_event(
+            "error",
+            {
+                "status": 504,
+                "title": "Gateway Timeout",
+                "detail": "요청 처리 시간이 초과되었습니다",
+            },
+        )
+    except Exception as e:
+        # 응답 헤더가 이미 전송되어 예외 핸들러가 응답할 수 없으므로 error 이벤트로 알림
+        logger.error("describe_stream_error", error=str(e), exc_info=True)
+        yield _sse_event(
+            "error",
+            {
+                "status": 500,
+                "title": "Internal Server Error",
+                "detail": "서버 내부 오류가 발생했습니다",
+            },
+        )
+
+
+@router.post(
+    "/describe/stream",
+    tags=["analysis"],
+    summary="위성영상 통합 분석 (SSE 스트리밍)",
+    description=(
+        "`/describe`와 동일한 분석을 Server-Sent Events로 스트리밍합니다. 각 모듈이 완료되는 "
+        "즉시 `location`, `land_cover`, `mission`, `context`, `description` 이벤트를 전송하고, "
+        "마지막에 `DescribeResponse` 전체를 담은 `summary` 이벤트를 전송합니다. "
+        "실패한 모듈의 이벤트 data는 `null`이며 사유는 `summary`의 `warnings`에 포함됩니다."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "SSE 이벤트 스트림"},
+        422: {"model": ProblemDetail, "description": "유효하지 않은 요청"},
+        429: {"description": "요청 횟수 초과 (Rate Limit Exceeded)"},
+    },
+)
+@limiter.limit(lambda: settings.rate_limit_describe)
+async def describe_stream(
+    body: DescribeRequest,
+    request: Request,
+    _auth: dict = Depends(authenticate),
+):
+    cache = request.app.state.cache
+    return StreamingResponse(
+        _describe_events(body, cache),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/describe/batch",
     response_model=BatchDescribeResponse,
@@ -269,37 +398,44 @@ async def describe_batch(
             )
             return BatchItemResult(index=index, error=str(e), error_detail=error_detail)
 
+    from app.main import is_shutting_down
+
     semaphore = asyncio.Semaphore(settings.batch_concurrency)
 
     async def _limited(index: int, item: BatchDescribeItem) -> BatchItemResult:
         async with semaphore:
+            # 슬롯 대기 중 shutdown이 시작되면 새 항목은 시작하지 않음 (진행 중 항목은 완료)
+            if is_shutting_down():
+                return BatchItemResult(index=index, error=_BATCH_INTERRUPTED_ERROR)
             return await _process_one(index, item)
 
-    from app.main import is_shutting_down
-
     batch_job_inc()
     try:
-        results: list[BatchItemResult] = []
-        for i, item in enumerate(body.items):
-            if is_shutting_down():
-                for j in range(i, len(body.items)):
-                    results.append(
-                        BatchItemResult(
-                            index=j,
-                            error="interrupted: server shutting down",
-                        )
-                    )
-                logger.warning(
-                    "batch_interrupted_by_shutdown",
-                    completed=i,
-                    interrupted=len(body.items) - i,
-                )
-                break
-            results.append(await _limited(i, item))
+        # 항목별 모듈 캐시 조회를 일괄 조회 한두 번으로 미리 채운다 (검증 실패 항목은 제외)
+        valid_items = []
+        for raw_item in body.items:
+            try:
+                valid_items.append(DescribeRequest.model_validate(raw_item.model_dump()))
+            except ValidationError:
+                pass
+        await prefetch_batch(valid_items, cache)
+        tasks = [asyncio.create_task(_limited(i, item)) for i, item in enumerate(body.items)]
+        try:
+            results: list[BatchItemResult] = list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
     finally:
         batch_job_dec()
     succeeded = sum(1 for r in results if r.result is not None)
-    interrupted = sum(1 for r in results if r.error and "interrupted" in r.error)
+    interrupted = sum(1 for r in results if r.error == _BATCH_INTERRUPTED_ERROR)
+    if interrupted:
+        logger.warning(
+            "batch_interrupted_by_shutdown",
+            completed=len(body.items) - interrupted,
+            interrupted=interrupted,
+        )
     failed = len(body.items) - succeeded - interrupted
     logger.info(
         "batch_complete",
@@ -326,6 +462,7 @@ async def describe_batch(
     responses={
         422: {"model": ErrorResponse, "description": "유효하지 않은 요청 (좌표 범위 초과 등)"},
         429: {"description": "요청 횟수 초과"},
+        503: {"model": ErrorResponse, "description": "Nominatim 전송 대기열 초과"},
     },
 )
 @limiter.limit(lambda: settings.rate_limit_data)
@@ -338,7 +475,80 @@ async def geocode_endpoint(
 
     lon, lat = body.coordinates
     cache = request.app.state.cache
-    return await apply_timeout(geocode(lon, lat, cache), request)
+    try:
+        return await apply_timeout(geocode(lon, lat, cache), request)
+    except RateLimitQueueFullError as e:
+        raise DescriptorError(status_code=503, code="UPSTREAM_BUSY", message=str(e)) from e
+
+
+def _bulk_geocode_line(index: int, result: Location | Exception) -> str:
+    if isinstance(result, Location):
+        item = BulkGeocodeItem(index=index, location=result)
+    else:
+        error_type = "timeout" if isinstance(result, TimeoutError) else "service"
+        item = BulkGeocodeItem(
+            index=index, error=BatchItemError(error_type=error_type, message=str(result))
+        )
+    return json.dumps(item.model_dump(mode="json"), ensure_ascii=False) + "\n"
+
+
+def _bulk_geocode_error(status: int, title: str, detail: str) -> str:
+    error = {"status": status, "title": title, "detail": detail}
+    return json.dumps({"error": error}, ensure_ascii=False) + "\n"
+
+
+async def _bulk_geocode_lines(body: BulkGeocodeRequest, cache) -> AsyncIterator[str]:
+    from app.modules.geocoder import geocode_many
+
+    points = [(lon, lat) for lon, lat in body.coordinates]
+    try:
+        async with asyncio.timeout(settings.request_timeout):
+            async with aclosing(geocode_many(points, cache)) as results:
+                async for index, result in results:
+                    yield _bulk_geocode_line(index, result)
+    except TimeoutError:
+        logger.warning("geocode_bulk_timeout", timeout=settings.request_timeout)
+        yield _bulk_geocode_error(504, "Gateway Timeout", "요청 처리 시간이 초과되었습니다")
+    except Exception as e:
+        # 응답 헤더가 이미 전송되어 예외 핸들러가 응답할 수 없으므로 마지막 줄로 알림
+        logger.error("geocode_bulk_error", error=str(e), exc_info=True)
+        yield _bulk_geocode_error(500, "Internal Server Error", "서버 내부 오류가 발생했습니다")
+
+
+@router.post(
+    "/geocode/bulk",
+    tags=["data"],
+    summary="일괄 역지오코딩 (NDJSON 스트리밍)",
+    description=(
+        "좌표 목록(최대 1000건)을 역지오코딩하여 입력 순서대로 한 줄에 하나씩 NDJSON으로 "
+        "스트리밍합니다. 같은 캐시 셀(소수점 3자리)에 속한 좌표는 한 번만 조회하고, 캐시는 "
+        "일괄 조회하며 캐시에 없는 셀만 Nominatim 전송 제한을 거쳐 조회합니다. 실패한 좌표는 "
+        "`error`가 채워진 줄로 반환되며 나머지 좌표는 계속 처리됩니다. 전체 처리가 "
+        "`REQUEST_TIMEOUT`을 넘기거나 예기치 않은 오류로 중단되면 `index` 없이 "
+        '`{"error": {status, title, detail}}`만 담긴 줄로 스트림을 끝냅니다.'
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "`BulkGeocodeItem` NDJSON 스트림 (입력 순서)",
+        },
+        422: {"model": ProblemDetail, "description": "유효하지 않은 요청"},
+        429: {"description": "요청 횟수 초과"},
+    },
+)
+@limiter.limit(lambda: settings.rate_limit_batch)
+async def geocode_bulk_endpoint(
+    body: BulkGeocodeRequest,
+    request: Request,
+    _auth: dict = Depends(authenticate),
+):
+    cache = request.app.state.cache
+    return StreamingResponse(
+        _bulk_geocode_lines(body, cache),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post(
@@ -416,6 +416,60 @@ class BatchItemResult(BaseModel):
     }
 
 
+MAX_BULK_GEOCODE_POINTS = 1000
+
+
+class BulkGeocodeRequest(BaseModel):
+    coordinates: list[list[float]] = Field(
+        description="[[longitude, latitude], ...] 좌표 목록 (최대 1000건)",
+        min_length=1,
+        max_length=MAX_BULK_GEOCODE_POINTS,
+    )
+
+    @field_validator("coordinates")
+    @classmethod
+    def validate_coordinates(cls, v: list[list[float]]) -> list[list[float]]:
+        for i, point in enumerate(v):
+            if len(point) != 2:
+                raise ValueError(f"coordinates[{i}] must be [longitude, latitude]")
+            lon, lat = point
+            if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+                raise ValueError(f"Invalid coordinates range at coordinates[{i}]")
+        return v
+
+    model_config = {
+        "json_schema_extra": {"examples": [{"coordinates": [[126.978, 37.566], [129.075, 35.179]]}]}
+    }
+
+
+class BulkGeocodeItem(BaseModel):
+    """일괄 역지오코딩 NDJSON 응답의 한 줄 (입력 순서)."""
+
+    index: int
+    location: Location | None = None
+    error: BatchItemError | None = None
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "index": 0,
+                    "location": {
+                        "country": "대한민국",
+                        "country_code": "kr",
+                        "region": "서울특별시",
+                        "city": "중구",
+                        "place_name": "서울특별시 중구",
+                        "lat": 37.566,
+                        "lon": 126.978,
+                    },
+                    "error": None,
+                }
+            ]
+        }
+    }
+
+
 class BatchDescribeResponse(BaseModel):
     results: list[BatchItemResult]
     total: int
@@ -491,19 +545,47 @@ class CircuitBreakerResponse(BaseModel):
 
 
 class ModuleStats(BaseModel):
+    entries: int = Field(default=0, description="모듈의 캐시 항목 수")
+    bytes: int = Field(default=0, description="모듈의 캐시 크기(바이트)")
     hits: int = Field(description="캐시 히트 횟수")
     misses: int = Field(description="캐시 미스 횟수")
     hit_rate: float = Field(description="히트율 (0.0 ~ 1.0)")
+    l1_hits: int = Field(default=0, description="메모리(L1) 캐시 히트 횟수")
+    l2_hits: int = Field(default=0, description="SQLite(L2) 캐시 히트 횟수")
+    l1_hit_rate: float = Field(default=0.0, description="전체 조회 대비 L1 히트율")
+    l2_hit_rate: float = Field(default=0.0, description="L1 미스 조회 대비 L2 히트율")
 
     model_config = {
-        "json_schema_extra": {"examples": [{"hits": 10, "misses": 3, "hit_rate": 0.7692}]}
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "entries": 30,
+                    "bytes": 61440,
+                    "hits": 10,
+                    "misses": 3,
+                    "hit_rate": 0.7692,
+                    "l1_hits": 8,
+                    "l2_hits": 2,
+                    "l1_hit_rate": 0.6154,
+                    "l2_hit_rate": 0.4,
+                }
+            ]
+        }
     }
 
 
+class L1CacheStats(BaseModel):
+    entries: int = Field(description="L1 항목 수")
+    bytes: int = Field(description="L1 근사 크기(바이트)")
+    max_entries: int = Field(description="L1 최대 항목 수")
+    max_bytes: int = Field(description="L1 최대 크기(바이트)")
+
+
 class CacheStatsResponse(BaseModel):
     entry_count: int = Field(description="캐시 항목 수")
     total_bytes: int = Field(description="캐시 총 크기(바이트)")
     modules: dict[str, ModuleStats] = Field(description="모듈별 캐시 통계")
+    l1: L1CacheStats = Field(description="메모리(L1) 캐시 상태")
 
     model_config = {
         "json_schema_extra": {
@@ -512,7 +594,23 @@ class CacheStatsResponse(BaseModel):
                     "entry_count": 42,
                     "total_bytes": 102400,
                     "modules": {
-                        "geocode": {"hits": 10, "misses": 3, "hit_rate": 0.7692},
+                        "geocode": {
+                            "entries": 30,
+                            "bytes": 61440,
+                            "hits": 10,
+                            "misses": 3,
+                            "hit_rate": 0.7692,
+                            "l1_hits": 8,
+                            "l2_hits": 2,
+                            "l1_hit_rate": 0.6154,
+                            "l2_hit_rate": 0.4,
+                        },
+                    },
+                    "l1": {
+                        "entries": 12,
+                        "bytes": 4096,
+                        "max_entries": 4096,
+                        "max_bytes": 33554432,
                     },
                 }
             ]
@@ -520,6 +618,23 @@ class CacheStatsResponse(BaseModel):
     }
 
 
+class CacheInvalidateRequest(BaseModel):
+    prefix: str = Field(
+        description="삭제할 캐시 키 접두사. 모듈 이름과 `:`로 시작해야 함 (예: `describe:`)",
+        pattern="^(geocode|landcover|mission|context|describe):",
+        max_length=512,
+    )
+
+    model_config = {"json_schema_extra": {"examples": [{"prefix": "landcover:"}]}}
+
+
+class CacheInvalidateResponse(BaseModel):
+    prefix: str = Field(description="무효화한 캐시 키 접두사")
+    deleted: int = Field(description="삭제된 항목 수")
+
+    model_config = {"json_schema_extra": {"examples": [{"prefix": "landcover:", "deleted": 1200}]}}
+
+
 class DependencyCheck(BaseModel):
     supabase: str = Field(description="Supabase 연결 상태")
     cache: str = Field(description="캐시 연결 상태")
@@ -4,7 +4,7 @@ import json
 import time
 
 import structlog
-from fastapi import Security
+from fastapi import Depends, Security
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
@@ -83,3 +83,15 @@ async def authenticate(
         code="UNAUTHORIZED",
         message="Valid API key or JWT required",
     )
+
+
+async def require_api_key(auth: dict = Depends(authenticate)) -> dict:
+    """Admin endpoints accept only the service API key, not end-user JWTs."""
+    if auth["type"] != "api_key":
+        logger.warning("auth_forbidden", auth_type=auth["type"])
+        raise DescriptorError(
+            status_code=403,
+            code="FORBIDDEN",
+            message="API key required for admin endpoints",
+        )
+    return auth
@@ -0,0 +1,464 @@
+"""Cache backend interface and the pieces shared by every backend.
+
+``CacheBackend`` is what the modules and the API depend on. ``CacheStore`` (SQLite, one
+file per instance) is the default; ``RedisCacheStore`` shares one cache between replicas.
+Both keep the in-process L1 tier, stale-while-revalidate refreshes and per-module hit/miss
+accounting defined here.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import NamedTuple
+
+import structlog
+
+from app.cache.negative import negative_entry, negative_outcome
+from app.config import settings
+from app.utils.metrics import (
+    cache_hits,
+    cache_invalidations,
+    cache_l1_hits,
+    cache_misses,
+    cache_negative_hits,
+    cache_refreshes,
+    cache_spatial_lookups,
+    cache_stale_hits,
+)
+
+logger = structlog.get_logger()
+
+
+_ALLOWED_MODULES = frozenset({"geocode", "landcover", "mission", "context", "describe"})
+
+
+class _L1Entry(NamedTuple):
+    value: dict
+    expires_at: float | None
+    stale_at: float | None
+    size: int
+
+
+class _MemoryCache:
+    """프로세스 내 LRU 캐시(L1): 디코드된 dict를 보관해 백엔드 왕복과 JSON 파싱을 생략.
+
+    항목 수와 근사 바이트(JSON 직렬화 길이) 두 한도 중 하나라도 넘으면 가장 오래 쓰지 않은
+    항목부터 제거한다. 한도가 0이면 L1을 사용하지 않는다.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: OrderedDict[str, _L1Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: float) -> _L1Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at and now > entry.expires_at:
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: _L1Entry) -> None:
+        self.pop(key)
+        if self.max_entries <= 0 or entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+
+    def pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def pop_prefix(self, prefix: str) -> None:
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self.pop(key)
+
+
+class CacheBackend(ABC):
+    """Key/value cache of JSON dicts with soft/hard TTLs.
+
+    Subclasses implement storage; lookups go through the L1 tier (``self._l1``) first and
+    report hits/misses with ``self._hits``/``self._l1_hits``/``self._misses``.
+    """
+
+    def __init__(self) -> None:
+        self._hits: dict[str, int] = defaultdict(int)
+        self._l1_hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+        self._l1 = _MemoryCache(settings.cache_l1_max_entries, settings.cache_l1_max_bytes)
+        # stale-while-revalidate 백그라운드 갱신 큐 (key 단위 중복 제거)
+        self._refresh_queue: asyncio.Queue | None = None
+        self._refresh_pending: set[str] = set()
+        self._refresh_workers: list[asyncio.Task] = []
+
+    @abstractmethod
+    async def init(self) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def get(
+        self, key: str, refresh: Callable[[], Awaitable[object]] | None = None
+    ) -> dict | None:
+        """Return the cached value, or None on a miss.
+
+        Entries past their soft TTL are still returned and, if ``refresh`` is given, it is
+        queued to repopulate the entry in the background.
+        """
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        """Store a value; with ``stale_grace_seconds`` the TTL becomes the soft TTL."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Remove a key. Returns whether it existed."""
+
+    @abstractmethod
+    async def stats(self, module: str | None = None) -> dict: ...
+
+    @abstractmethod
+    async def ping(self) -> bool: ...
+
+    @abstractmethod
+    async def _delete_prefix(self, prefix: str, chunk_size: int) -> int:
+        """Delete stored entries whose key starts with ``prefix``, ``chunk_size`` at a time.
+
+        Each chunk is its own short operation and the loop yields between chunks, so
+        lookups and writes keep being served while a large prefix is dropped.
+        """
+
+    @abstractmethod
+    async def _load_many(self, keys: list[str], now: float) -> dict[str, _L1Entry]:
+        """Fetch live entries for ``keys`` from the backend in bulk (no accounting).
+
+        Keys that are missing, expired or undecodable are left out; backend errors are
+        logged and yield an empty result.
+        """
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        """Return the cached values of ``keys`` (misses are left out).
+
+        L1 is checked first and the rest is read from the backend in one bulk call. Hits
+        and misses are counted per module as if each key had been looked up with ``get``;
+        stale entries are returned without scheduling a refresh.
+        """
+        now = time.time()
+        found: dict[str, dict] = {}
+        remote = []
+        for key in dict.fromkeys(keys):
+            entry = self._l1.get(key, now)
+            if entry is None:
+                remote.append(key)
+                continue
+            module = self._module_from_key(key)
+            self._l1_hits[module] += 1
+            cache_l1_hits.labels(module=module).inc()
+            found[key] = self._serve(key, module, entry, now, None)
+        if not remote:
+            return found
+        entries = await self._load_many(remote, now)
+        for key in remote:
+            module = self._module_from_key(key)
+            entry = entries.get(key)
+            if entry is None:
+                self._misses[module] += 1
+                cache_misses.labels(module=module).inc()
+                continue
+            self._l1.put(key, entry)
+            found[key] = self._serve(key, module, entry, now, None)
+        return found
+
+    async def prefetch(self, keys: Iterable[str]) -> dict[str, dict]:
+        """Load ``keys`` into L1 with one bulk read, without counting hits or misses.
+
+        The lookups that follow (e.g. the modules' own ``get``) are then served from L1
+        and counted there. Returns the values found. Has no lasting effect when L1 is
+        disabled, beyond the returned values.
+        """
+        now = time.time()
+        found: dict[str, dict] = {}
+        remote = []
+        for key in dict.fromkeys(keys):
+            entry = self._l1.get(key, now)
+            if entry is None:
+                remote.append(key)
+            else:
+                found[key] = entry.value
+        if remote:
+            for key, entry in (await self._load_many(remote, now)).items():
+                self._l1.put(key, entry)
+                found[key] = entry.value
+        return found
+
+    async def set_many(
+        self,
+        items: Mapping[str, dict],
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        """Store several values with the same TTL."""
+        await asyncio.gather(
+            *(
+                self.set(key, value, ttl_days, ttl_seconds, stale_grace_seconds)
+                for key, value in items.items()
+            )
+        )
+
+    async def set_negative(self, key: str, outcome: str, detail: str = "") -> None:
+        """Cache a failed lookup's ``outcome`` under ``key`` for the negative TTL.
+
+        No-op when ``CACHE_NEGATIVE_TTL_SECONDS`` is 0, and while a background refresh of
+        ``key`` is running: the stale value it is refreshing stays served until its hard TTL.
+        The entry has no stale grace, so it simply expires and the next lookup goes to the
+        upstream again.
+        """
+        if settings.cache_negative_ttl_seconds <= 0:
+            return
+        if key in self._refresh_pending:
+            logger.info("cache_negative_skipped", key=key, outcome=outcome)
+            return
+        await self.set(
+            key, negative_entry(outcome, detail), ttl_seconds=settings.cache_negative_ttl_seconds
+        )
+
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Delete every entry whose key starts with ``prefix``; returns the number deleted.
+
+        Runs in chunks of ``CACHE_CLEANUP_CHUNK_SIZE``. Only this process's L1 is cleared;
+        other processes drop their copies when the L1 entry expires.
+        """
+        self._l1.pop_prefix(prefix)
+        deleted = await self._delete_prefix(prefix, settings.cache_cleanup_chunk_size)
+        # 삭제 도중 다시 읽혀 L1에 올라온 항목도 제거
+        self._l1.pop_prefix(prefix)
+        if deleted:
+            cache_invalidations.labels(module=self._module_from_key(prefix)).inc(deleted)
+        logger.info("cache_invalidated", prefix=prefix, deleted=deleted)
+        return deleted
+
+    async def index_point(self, key: str, lon: float, lat: float) -> None:
+        """Register the stored ``key`` at a point for ``nearest`` lookups.
+
+        Backends without a spatial index ignore it, so ``nearest`` never matches there.
+        """
+
+    async def nearest(
+        self, module: str, version: int, lon: float, lat: float, radius_m: float
+    ) -> dict | None:
+        """Value of the closest live ``module`` entry within ``radius_m`` of the point.
+
+        Only keys of the module's current cache ``version`` match, so bumping the version
+        retires neighbours the same way it retires exact keys. Negative entries are
+        skipped: a neighbour's failure says nothing about this point.
+        """
+        found = await self._nearest(module, version, lon, lat, radius_m)
+        match = "neighbour" if found is not None else "miss"
+        cache_spatial_lookups.labels(module=module, match=match).inc()
+        return found[1] if found is not None else None
+
+    async def _nearest(
+        self, module: str, version: int, lon: float, lat: float, radius_m: float
+    ) -> tuple[float, dict] | None:
+        """``(distance_m, value)`` of the closest match, or None."""
+        return None
+
+    async def cleanup_expired(self) -> int:
+        """Delete expired entries; backends that expire keys themselves return 0."""
+        return 0
+
+    async def evict_to_budget(self) -> int:
+        """Enforce the size budget; backends with their own eviction return 0."""
+        return 0
+
+    def _module_from_key(self, key: str) -> str:
+        module = key.split(":")[0] if ":" in key else "unknown"
+        return module if module in _ALLOWED_MODULES else "unknown"
+
+    @staticmethod
+    def _expiry(
+        now: float,
+        ttl_days: int | None,
+        ttl_seconds: int | None,
+        stale_grace_seconds: int | None,
+    ) -> tuple[float | None, float | None]:
+        """Return ``(expires_at, stale_at)``; the grace period extends the hard expiry."""
+        if ttl_seconds is not None:
+            expires_at = now + ttl_seconds
+        elif ttl_days is not None:
+            expires_at = now + ttl_days * 86400
+        else:
+            expires_at = None
+        stale_at = None
+        if expires_at is not None and stale_grace_seconds:
+            stale_at, expires_at = expires_at, expires_at + stale_grace_seconds
+        return expires_at, stale_at
+
+    def _serve(
+        self,
+        key: str,
+        module: str,
+        entry: _L1Entry,
+        now: float,
+        refresh: Callable[[], Awaitable[object]] | None,
+    ) -> dict:
+        """Count a hit and queue ``refresh`` when the entry is past its soft TTL."""
+        self._hits[module] += 1
+        cache_hits.labels(module=module).inc()
+        outcome = negative_outcome(entry.value)
+        if outcome is not None:
+            cache_negative_hits.labels(module=module, outcome=outcome).inc()
+        if entry.stale_at and now > entry.stale_at:
+            cache_stale_hits.labels(module=module).inc()
+            if refresh is not None:
+                self._schedule_refresh(key, module, refresh)
+        return entry.value
+
+    def _take_counts(self) -> dict[str, tuple[int, int, int]]:
+        """Swap out the pending per-module (hits, l1_hits, misses) deltas."""
+        modules = self._hits.keys() | self._misses.keys()
+        counts = {m: (self._hits[m], self._l1_hits[m], self._misses[m]) for m in modules}
+        self._hits, self._l1_hits, self._misses = (defaultdict(int) for _ in range(3))
+        return counts
+
+    def _restore_counts(self, counts: dict[str, tuple[int, int, int]]) -> None:
+        # 저장 실패 시 다음 기회에 다시 반영되도록 되돌린다
+        for module, (hits, l1_hits, misses) in counts.items():
+            self._hits[module] += hits
+            self._l1_hits[module] += l1_hits
+            self._misses[module] += misses
+
+    def _add_pending(self, totals: dict[str, list[int]], module: str | None) -> None:
+        """Add this process's not-yet-stored hit/miss counters to ``totals`` in place."""
+        for m in self._hits.keys() | self._misses.keys():
+            if module is not None and m != module:
+                continue
+            pending = totals.setdefault(m, [0, 0, 0, 0, 0])
+            pending[2] += self._hits[m]
+            pending[3] += self._l1_hits[m]
+            pending[4] += self._misses[m]
+
+    def _build_stats(self, totals: dict[str, list[int]], module: str | None) -> dict:
+        """Build the stats response from stored ``[entries, bytes, hits, l1_hits, misses]``.
+
+        This process's not-yet-stored counters are added on top.
+        """
+        self._add_pending(totals, module)
+
+        per_module = {}
+        for m, (entries, size, hits, l1_hits, misses) in sorted(totals.items()):
+            if not (entries or hits or misses):
+                continue
+            l2_hits = hits - l1_hits
+            total = hits + misses
+            per_module[m] = {
+                "entries": entries,
+                "bytes": size,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total > 0 else 0.0,
+                "l1_hits": l1_hits,
+                "l2_hits": l2_hits,
+                # L1: 전체 조회 대비, L2: L1을 통과해 백엔드까지 내려간 조회 대비
+                "l1_hit_rate": round(l1_hits / total, 4) if total > 0 else 0.0,
+                "l2_hit_rate": (
+                    round(l2_hits / (l2_hits + misses), 4) if l2_hits + misses > 0 else 0.0
+                ),
+            }
+
+        return {
+            "entry_count": sum(v[0] for v in totals.values()),
+            "total_bytes": sum(v[1] for v in totals.values()),
+            "modules": per_module,
+            "l1": {
+                "entries": len(self._l1),
+                "bytes": self._l1.bytes,
+                "max_entries": self._l1.max_entries,
+                "max_bytes": self._l1.max_bytes,
+            },
+        }
+
+    def _schedule_refresh(
+        self, key: str, module: str, refresh: Callable[[], Awaitable[object]]
+    ) -> None:
+        if key in self._refresh_pending:
+            return
+        if self._refresh_queue is None:
+            self._refresh_queue = asyncio.Queue(maxsize=settings.cache_refresh_queue_size)
+            self._refresh_workers = [
+                asyncio.create_task(self._refresh_worker())
+                for _ in range(settings.cache_refresh_workers)
+            ]
+        try:
+            self._refresh_queue.put_nowait((key, module, refresh))
+        except asyncio.QueueFull:
+            cache_refreshes.labels(module=module, outcome="dropped").inc()
+            return
+        self._refresh_pending.add(key)
+
+    async def _refresh_worker(self) -> None:
+        while True:
+            key, module, refresh = await self._refresh_queue.get()
+            try:
+                await refresh()
+                cache_refreshes.labels(module=module, outcome="success").inc()
+            except Exception as e:
+                logger.warning("cache_refresh_error", key=key, error=str(e))
+                cache_refreshes.labels(module=module, outcome="error").inc()
+            finally:
+                self._refresh_pending.discard(key)
+                self._refresh_queue.task_done()
+
+    async def wait_refreshes(self) -> None:
+        """Block until every queued background refresh has finished."""
+        if self._refresh_queue is not None:
+            await self._refresh_queue.join()
+
+    async def _stop_refresh_workers(self) -> None:
+        for task in self._refresh_workers:
+            task.cancel()
+        await asyncio.gather(*self._refresh_workers, return_exceptions=True)
+        self._refresh_workers = []
+        self._refresh_queue = None
+        self._refresh_pending.clear()
+
+
+def create_cache_backend() -> CacheBackend:
+    """Build the backend selected by ``CACHE_BACKEND``."""
+    if settings.cache_backend == "redis":
+        from app.cache.redis_store import RedisCacheStore
+
+        return RedisCacheStore(settings.cache_redis_url)
+    if settings.cache_shard_mode != "none":
+        from app.cache.sharded import ShardedCacheStore
+
+        return ShardedCacheStore(settings.cache_db_path)
+    from app.cache.store import CacheStore
+
+    return CacheStore(settings.cache_db_path)
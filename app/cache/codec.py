@@ -0,0 +1,100 @@
+"""Cache value encoding: JSON bytes with a leading codec byte and optional compression.
+
+Layout of a stored BLOB: ``<codec byte><payload>`` where the payload is UTF-8 JSON,
+optionally compressed. Rows written before migration 004 are TEXT and decode as plain JSON.
+"""
+
+import json
+import zlib
+
+import structlog
+
+from app.config import settings
+
+try:  # 선택 의존성: 설치되어 있으면 더 빠른 JSON 직렬화 사용
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # 선택 의존성: zstd 압축
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = structlog.get_logger()
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+_DECOMPRESS_ERRORS: tuple[type[Exception], ...] = (zlib.error,) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+
+
+class CodecError(ValueError):
+    """Stored value cannot be decoded (unknown codec or corrupt payload)."""
+
+
+def dumps(value: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(raw: bytes | str) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def check_available() -> None:
+    """Log once at startup when the configured compression is not installed."""
+    if settings.cache_compression == "zstd" and zstandard is None:
+        logger.warning("cache_zstd_unavailable", fallback="zlib")
+
+
+def _compression() -> int:
+    mode = settings.cache_compression
+    if mode == "zstd" and zstandard is not None:
+        return CODEC_ZSTD
+    # zstandard가 없으면 zlib으로 대체
+    return CODEC_ZLIB if mode in ("zlib", "zstd") else CODEC_RAW
+
+
+def pack(raw: bytes) -> bytes:
+    """Prefix ``raw`` JSON with a codec byte, compressing it above the size threshold."""
+    codec = _compression()
+    if codec != CODEC_RAW and len(raw) >= settings.cache_compress_min_bytes:
+        if codec == CODEC_ZSTD:
+            compressed = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+        else:
+            compressed = zlib.compress(raw, _ZLIB_LEVEL)
+        # 압축 이득이 없으면 원본 저장
+        if len(compressed) < len(raw):
+            return bytes((codec,)) + compressed
+    return bytes((CODEC_RAW,)) + raw
+
+
+def unpack(stored: bytes | str) -> bytes | str:
+    """Return the raw JSON of a stored value (TEXT rows are returned unchanged)."""
+    if isinstance(stored, str):
+        return stored
+    if not stored:
+        raise CodecError("empty cache value")
+    codec, payload = stored[0], stored[1:]
+    try:
+        if codec == CODEC_RAW:
+            return payload
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise CodecError("zstd-compressed value but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+    except _DECOMPRESS_ERRORS as e:
+        raise CodecError(f"corrupt cache value: {e}") from e
+    raise CodecError(f"unknown cache codec {codec}")
@@ -0,0 +1,41 @@
+"""Drop cache entries by key prefix from the command line.
+
+Same operation as ``POST /api/v1/cache/invalidate``, for use from a shell or a deploy
+job. Deletes run in chunks of ``CACHE_CLEANUP_CHUNK_SIZE``, so a serving process sharing
+the database keeps working meanwhile. A running server's L1 is not cleared from here: with
+the Redis backend its copies expire after ``CACHE_REDIS_L1_TTL_SECONDS``; with SQLite use
+the endpoint instead (or restart) to drop them immediately.
+
+실행:
+    python -m app.cache.invalidate describe: [--db cache.db]
+    python -m app.cache.invalidate landcover:v2:
+"""
+
+import argparse
+import asyncio
+import re
+
+from app.cache.backend import create_cache_backend
+from app.cache.store import CacheStore
+
+_PREFIX = re.compile(r"^(geocode|landcover|mission|context|describe):")
+
+
+async def _main(prefix: str, db_path: str | None) -> None:
+    cache = CacheStore(db_path) if db_path else create_cache_backend()
+    await cache.init()
+    try:
+        deleted = await cache.invalidate_prefix(prefix)
+    finally:
+        await cache.close()
+    print(f"invalidate: prefix={prefix} deleted={deleted}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="캐시 키 접두사 무효화")
+    parser.add_argument("prefix", help="삭제할 키 접두사 (모듈 이름과 ':'로 시작, 예: describe:)")
+    parser.add_argument("--db", default=None, help="SQLite 캐시 DB 경로 (기본: CACHE_BACKEND 설정)")
+    args = parser.parse_args()
+    if not _PREFIX.match(args.prefix):
+        parser.error("prefix must start with a module name and ':' (e.g. describe:)")
+    asyncio.run(_main(args.prefix, args.db))
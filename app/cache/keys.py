@@ -0,0 +1,30 @@
+"""Cache key layout: ``module[:v<version>]:part:...``.
+
+Each module declares a ``CACHE_VERSION`` and builds its keys with ``versioned_key``. Bump
+the version when a change alters what the module caches (prompt, tag mapping, result
+shape): new lookups use keys with the new version, so old rows are never read again and
+age out through TTL and eviction without a scan. Version 1 is the original unversioned
+layout, so rows written before versioning stay valid.
+
+To drop entries right away instead, use prefix invalidation
+(``CacheBackend.invalidate_prefix``, ``POST /api/v1/cache/invalidate`` or
+``python -m app.cache.invalidate``); ``landcover:`` covers every landcover version.
+"""
+
+
+def versioned_key(module: str, version: int, *parts: object) -> str:
+    segments = [module] if version <= 1 else [module, f"v{version}"]
+    return ":".join([*segments, *(str(part) for part in parts)])
+
+
+def key_version(key: str) -> int:
+    """Version a key was built with by ``versioned_key`` (1 for unversioned keys)."""
+    parts = key.split(":", 2)
+    if len(parts) == 3 and parts[1][:1] == "v" and parts[1][1:].isdigit():
+        return int(parts[1][1:])
+    return 1
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix`` (for range scans)."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -0,0 +1,5 @@
+"""Soft TTL: rows past stale_at are served stale and refreshed in the background."""
+
+SQL_UP = """
+ALTER TABLE cache ADD COLUMN stale_at REAL;
+"""
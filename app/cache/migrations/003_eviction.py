@@ -0,0 +1,17 @@
+"""Size-bounded eviction: per-row module, size, access frequency and GDSF priority."""
+
+SQL_UP = """
+ALTER TABLE cache ADD COLUMN module TEXT NOT NULL DEFAULT 'unknown';
+ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE cache ADD COLUMN hits INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE cache ADD COLUMN last_access REAL;
+ALTER TABLE cache ADD COLUMN priority REAL NOT NULL DEFAULT 0;
+UPDATE cache SET
+    module = CASE
+        WHEN instr(key, ':') > 0 THEN substr(key, 1, instr(key, ':') - 1)
+        ELSE 'unknown'
+    END,
+    size = LENGTH(key) + LENGTH(value),
+    last_access = CAST(strftime('%s', 'now') AS REAL);
+CREATE INDEX IF NOT EXISTS idx_cache_priority ON cache (priority);
+"""
@@ -0,0 +1,25 @@
+"""Store cache values as BLOBs (codec byte + JSON, optionally compressed).
+
+SQLite cannot change a column type in place, so the table is rebuilt. Existing rows keep
+their TEXT values, which the codec still reads as plain JSON.
+"""
+
+SQL_UP = """
+CREATE TABLE cache_new (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    stale_at REAL,
+    module TEXT NOT NULL DEFAULT 'unknown',
+    size INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 1,
+    last_access REAL,
+    priority REAL NOT NULL DEFAULT 0
+);
+INSERT INTO cache_new
+    SELECT key, value, expires_at, stale_at, module, size, hits, last_access, priority
+    FROM cache;
+DROP TABLE cache;
+ALTER TABLE cache_new RENAME TO cache;
+CREATE INDEX IF NOT EXISTS idx_cache_priority ON cache (priority);
+"""
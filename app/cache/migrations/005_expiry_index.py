@@ -0,0 +1,13 @@
+"""Index expires_at (partial) and module; switch to incremental auto-vacuum.
+
+auto_vacuum only takes effect on an existing database after a VACUUM, which rebuilds the
+file once. From then on freed pages are returned with ``PRAGMA incremental_vacuum``.
+"""
+
+SQL_UP = """
+CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at)
+    WHERE expires_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_cache_module ON cache (module);
+PRAGMA auto_vacuum = INCREMENTAL;
+VACUUM;
+"""
@@ -0,0 +1,39 @@
+"""Per-module stats table maintained by triggers, so stats need no full-table scan.
+
+``entries``/``bytes`` follow every insert, update and delete on ``cache`` (including
+eviction and expiry cleanup). ``hits``/``l1_hits``/``misses`` are accumulated by the store
+and flushed with its group commits. Writes must use UPSERT rather than
+``INSERT OR REPLACE``: REPLACE deletes do not fire triggers unless recursive_triggers is on.
+"""
+
+SQL_UP = """
+CREATE TABLE IF NOT EXISTS cache_stats (
+    module TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    l1_hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO cache_stats (module, entries, bytes)
+    SELECT module, COUNT(*), COALESCE(SUM(size), 0) FROM cache GROUP BY module;
+
+CREATE TRIGGER IF NOT EXISTS cache_stats_insert AFTER INSERT ON cache BEGIN
+    INSERT INTO cache_stats (module, entries, bytes) VALUES (NEW.module, 1, NEW.size)
+        ON CONFLICT (module) DO UPDATE SET
+            entries = entries + 1, bytes = bytes + excluded.bytes;
+END;
+
+CREATE TRIGGER IF NOT EXISTS cache_stats_delete AFTER DELETE ON cache BEGIN
+    UPDATE cache_stats SET entries = entries - 1, bytes = bytes - OLD.size
+        WHERE module = OLD.module;
+END;
+
+CREATE TRIGGER IF NOT EXISTS cache_stats_update AFTER UPDATE OF module, size ON cache BEGIN
+    UPDATE cache_stats SET entries = entries - 1, bytes = bytes - OLD.size
+        WHERE module = OLD.module;
+    INSERT INTO cache_stats (module, entries, bytes) VALUES (NEW.module, 1, NEW.size)
+        ON CONFLICT (module) DO UPDATE SET
+            entries = entries + 1, bytes = bytes + excluded.bytes;
+END;
+"""
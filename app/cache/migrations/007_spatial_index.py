@@ -0,0 +1,25 @@
+"""Spatial index over point-keyed entries (geocode, landcover) for nearest-neighbour reuse.
+
+``cache_geo`` gives each indexed key a stable integer id (``cache`` rowids can change on
+VACUUM) and keeps its exact coordinates; ``cache_rtree`` indexes the ids by position.
+Deleting a cache row (expiry, eviction, invalidation) drops its spatial entries too.
+"""
+
+SQL_UP = """
+CREATE TABLE IF NOT EXISTS cache_geo (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    module TEXT NOT NULL,
+    lon REAL NOT NULL,
+    lat REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cache_rtree USING rtree (
+    id, min_lon, max_lon, min_lat, max_lat
+);
+
+CREATE TRIGGER IF NOT EXISTS cache_geo_delete AFTER DELETE ON cache
+    WHEN OLD.module IN ('geocode', 'landcover') BEGIN
+    DELETE FROM cache_rtree WHERE id = (SELECT id FROM cache_geo WHERE key = OLD.key);
+    DELETE FROM cache_geo WHERE key = OLD.key;
+END;
+"""
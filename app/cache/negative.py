@@ -0,0 +1,67 @@
+"""Negative cache entries: short-lived records of upstream lookups that failed for good.
+
+A module whose upstream answers a lookup with a failure that will repeat for the same
+input (4xx, unparsable body) stores a negative entry under its usual cache key with
+``CacheBackend.set_negative``, which expires after ``CACHE_NEGATIVE_TTL_SECONDS``.
+Identical lookups are then answered locally: modules with a fallback value return it,
+the others raise ``CachedUpstreamError``, which the composer reports as a warning without
+calling the upstream or counting a circuit breaker failure.
+"""
+
+from typing import NoReturn
+
+import httpx
+from google.genai.errors import ClientError
+
+NEGATIVE_FIELD = "_negative"
+
+INVALID_JSON = "invalid_json"
+NOT_FOUND = "not_found"
+CLIENT_ERROR = "client_error"
+
+_MAX_DETAIL = 500
+
+# 입력 자체가 잘못된 경우만: 401/403/407 등 인증·차단·정책 실패는 입력과 무관하므로 제외
+_INPUT_ERROR_STATUS_CODES = frozenset({400, 422})
+
+
+class CachedUpstreamError(Exception):
+    """A failure replayed from a negative cache entry; the upstream was not called."""
+
+    def __init__(self, outcome: str, detail: str = ""):
+        super().__init__(detail or outcome)
+        self.outcome = outcome
+
+
+def negative_entry(outcome: str, detail: str = "") -> dict:
+    return {NEGATIVE_FIELD: outcome, "detail": detail[:_MAX_DETAIL]}
+
+
+def negative_outcome(value: dict | None) -> str | None:
+    """Outcome class of a negative entry, or None for a regular cached value."""
+    if not value:
+        return None
+    outcome = value.get(NEGATIVE_FIELD)
+    return outcome if isinstance(outcome, str) else None
+
+
+def replay(value: dict) -> NoReturn:
+    raise CachedUpstreamError(value[NEGATIVE_FIELD], value.get("detail", ""))
+
+
+def failure_outcome(exc: BaseException) -> str | None:
+    """Outcome class of a failure that will repeat for the same input; None otherwise.
+
+    Only input errors qualify. Credential, IP-block and policy failures (401/403/407, a
+    revoked Gemini key) would otherwise pin every key they touch for the negative TTL and
+    bypass the circuit breaker, so they are reported like transient failures.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status in (404, 410):
+            return NOT_FOUND
+        if status in _INPUT_ERROR_STATUS_CODES:
+            return CLIENT_ERROR
+    elif isinstance(exc, ClientError) and exc.code in _INPUT_ERROR_STATUS_CODES:
+        return CLIENT_ERROR
+    return None
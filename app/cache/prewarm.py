@@ -0,0 +1,341 @@
+"""Fill the geocode, landcover and context caches for an area before users arrive.
+
+The area (a bbox or a GeoJSON Polygon/MultiPolygon) is cut into the modules' own cache
+cells: 0.001° for geocode and 0.01° for landcover, the precision their keys are rounded
+to. ``--stride N`` keeps every Nth cell per axis, e.g. together with
+``CACHE_GEOCODE_NEIGHBOUR_M`` covering the gap. Cells whose key is already cached are
+skipped after a bulk lookup, so an interrupted run simply resumes when started again.
+
+Geocode requests go through the same Nominatim token bucket as the server
+(``NOMINATIM_RATE_PER_SECOND``); the bucket is per process, so leave room for a server
+sharing the same upstream. Landcover (Overpass) and context (DuckDuckGo) have no limiter
+and are bounded by ``--concurrency`` only. Context needs the geocode results (region,
+city) and a month; it runs after geocode when ``--month`` is given.
+
+실행:
+    python -m app.cache.prewarm --bbox 126.9,37.5,127.1,37.6 [--modules geocode,landcover]
+    python -m app.cache.prewarm --geojson seoul.geojson --month 2026-10 --stride 3
+    python -m app.cache.prewarm --bbox ... --dry-run   # 셀 수와 캐시된 수만 출력
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+import httpx
+import structlog
+
+from app.cache.backend import CacheBackend, create_cache_backend
+from app.cache.negative import CachedUpstreamError, negative_outcome
+from app.cache.store import CacheStore
+from app.config import settings
+from app.http_client import close_client
+from app.modules import context, geocoder, landcover
+from app.utils.geo import in_rings, polygon_rings
+from app.utils.token_bucket import RateLimitQueueFullError
+
+logger = structlog.get_logger()
+
+MODULES = ("geocode", "landcover", "context")
+
+# 모듈별 캐시 키 반올림 자릿수 (geocoder/landcover의 _round_coords와 같아야 함)
+_DECIMALS = {"geocode": 3, "landcover": 2}
+_LOOKUP_CHUNK = 500
+_FAILURES = (httpx.HTTPError, TimeoutError, CachedUpstreamError, RateLimitQueueFullError)
+
+
+class AreaError(ValueError):
+    """The bbox or GeoJSON does not describe a usable area."""
+
+
+@dataclass
+class Area:
+    """``bbox`` is ``(min_lon, min_lat, max_lon, max_lat)``; ``rings`` narrows it to a polygon."""
+
+    bbox: tuple[float, float, float, float]
+    rings: list[list[float]] = field(default_factory=list)
+
+    @classmethod
+    def from_bbox(cls, text: str) -> "Area":
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in text.split(","))
+        except ValueError as e:
+            raise AreaError("bbox must be min_lon,min_lat,max_lon,max_lat") from e
+        if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+            raise AreaError(f"invalid bbox {text}")
+        return cls((min_lon, min_lat, max_lon, max_lat))
+
+    @classmethod
+    def from_geojson(cls, data: dict) -> "Area":
+        """Polygon/MultiPolygon geometry, Feature or FeatureCollection (all polygons)."""
+        if data.get("type") == "FeatureCollection":
+            geometries = [f.get("geometry") or {} for f in data.get("features", [])]
+        elif data.get("type") == "Feature":
+            geometries = [data.get("geometry") or {}]
+        else:
+            geometries = [data]
+        rings = [ring for g in geometries if g.get("type") for ring in polygon_rings(g)]
+        if not rings:
+            raise AreaError("GeoJSON has no Polygon or MultiPolygon geometry")
+        xs = [v for ring in rings for v in ring[0::2]]
+        ys = [v for ring in rings for v in ring[1::2]]
+        return cls((min(xs), min(ys), max(xs), max(ys)), rings)
+
+    def cells(
+        self, decimals: int, stride: int = 1, limit: int | None = None
+    ) -> list[tuple[float, float]]:
+        """Cache cell coordinates inside the area at ``decimals`` precision, every ``stride``.
+
+        Raises ``AreaError`` as soon as more than ``limit`` cells are found.
+        """
+        scale = 10**decimals
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        xs = range(round(min_lon * scale), round(max_lon * scale) + 1, stride)
+        ys = range(round(min_lat * scale), round(max_lat * scale) + 1, stride)
+        cells = []
+        for y in ys:
+            for x in xs:
+                lon, lat = round(x / scale, decimals), round(y / scale, decimals)
+                if not self.rings or in_rings(lon, lat, self.rings):
+                    cells.append((lon, lat))
+                    if limit is not None and len(cells) > limit:
+                        raise AreaError(f"area has more than {limit} cells")
+        return cells
+
+
+@dataclass
+class ModuleProgress:
+    """Counters for one module; ``line`` renders them with rate and ETA."""
+
+    module: str
+    total: int = 0
+    cached: int = 0
+    filled: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        return self.filled + self.failed
+
+    def line(self) -> str:
+        todo = self.total - self.cached
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = _duration((todo - self.done) / rate) if rate > 0 else "-"
+        percent = 100 * self.done / todo if todo else 100.0
+        return (
+            f"{self.module}: {self.done}/{todo} ({percent:.1f}%) cached={self.cached}"
+            f" failed={self.failed} {rate:.2f}/s ETA {eta}"
+        )
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+async def _cached_keys(cache: CacheBackend, keys: list[str]) -> set[str]:
+    """Keys already holding a live entry (negative ones included until they expire)."""
+    found: set[str] = set()
+    for i in range(0, len(keys), _LOOKUP_CHUNK):
+        found.update(await cache.prefetch(keys[i : i + _LOOKUP_CHUNK]))
+    return found
+
+
+async def _fill(
+    jobs: dict[str, Callable],
+    cache: CacheBackend,
+    progress: ModuleProgress,
+    concurrency: int,
+    report: Callable[[ModuleProgress], None],
+) -> None:
+    """Run ``jobs`` (cache key → coroutine factory) for keys that are not cached yet."""
+    progress.total = len(jobs)
+    cached = await _cached_keys(cache, list(jobs))
+    progress.cached = len(cached)
+    progress.started = time.monotonic()
+    report(progress)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(key: str, job: Callable) -> None:
+        async with sem:
+            try:
+                await job()
+                progress.filled += 1
+            except _FAILURES as e:
+                # 실패는 세고 넘어간다: 부정 캐시가 만료된 뒤 다시 실행하면 재시도
+                logger.warning("prewarm_failed", module=progress.module, key=key, error=str(e))
+                progress.failed += 1
+            report(progress)
+
+    await asyncio.gather(*(_one(key, job) for key, job in jobs.items() if key not in cached))
+
+
+async def _context_jobs(
+    cache: CacheBackend, cells: list[tuple[float, float]], month: str
+) -> dict[str, Callable]:
+    """One context lookup per distinct place among the cells' cached geocode results."""
+    keys = [geocoder.cache_key_for(lon, lat) for lon, lat in cells]
+    locations: dict[str, dict] = {}
+    for i in range(0, len(keys), _LOOKUP_CHUNK):
+        locations.update(await cache.prefetch(keys[i : i + _LOOKUP_CHUNK]))
+    jobs: dict[str, Callable] = {}
+    for location in locations.values():
+        if negative_outcome(location) is not None:
+            continue
+        place, region, city = location["place_name"], location["region"], location["city"]
+        key = context.cache_key_for(place, month, region, city)
+        if key not in jobs:
+            jobs[key] = lambda p=place, r=region, c=city: context.research_context(
+                p, month, cache, region=r, city=c
+            )
+    return jobs
+
+
+async def prewarm(
+    cache: CacheBackend,
+    area: Area,
+    modules: Iterable[str] = ("geocode", "landcover"),
+    *,
+    month: str | None = None,
+    stride: int = 1,
+    concurrency: int = 4,
+    report: Callable[[ModuleProgress], None] = lambda progress: None,
+) -> dict[str, ModuleProgress]:
+    """Fill ``modules`` for every cell of ``area``; returns per-module counters.
+
+    Geocode and landcover run side by side (different upstreams); context follows
+    geocode. ``concurrency`` applies per module and is capped for geocode at
+    ``NOMINATIM_QUEUE_SIZE`` so callers queue in the token bucket instead of failing.
+    """
+    modules = set(modules)
+    if "context" in modules and not month:
+        raise ValueError("context prewarming needs a month (YYYY-MM)")
+    progress = {m: ModuleProgress(m) for m in MODULES if m in modules}
+    geocode_cells = area.cells(_DECIMALS["geocode"], stride)
+
+    async def _geocode_then_context() -> None:
+        if "geocode" in modules:
+            limit = min(concurrency, settings.nominatim_queue_size)
+            jobs = {
+                geocoder.cache_key_for(lon, lat): (
+                    lambda lon=lon, lat=lat: geocoder.fetch_and_store(lon, lat, cache)
+                )
+                for lon, lat in geocode_cells
+            }
+            await _fill(jobs, cache, progress["geocode"], limit, report)
+        if "context" in modules:
+            jobs = await _context_jobs(cache, geocode_cells, month)
+            await _fill(jobs, cache, progress["context"], concurrency, report)
+
+    async def _landcover() -> None:
+        if "landcover" in modules:
+            jobs = {
+                landcover.cache_key_for(lon, lat): (
+                    lambda lon=lon, lat=lat: landcover.fetch_and_store(lon, lat, cache)
+                )
+                for lon, lat in area.cells(_DECIMALS["landcover"], stride)
+            }
+            await _fill(jobs, cache, progress["landcover"], concurrency, report)
+
+    await asyncio.gather(_geocode_then_context(), _landcover())
+    return progress
+
+
+def _printer(interval: float) -> Callable[[ModuleProgress], None]:
+    last: dict[str, float] = {}
+
+    def _report(progress: ModuleProgress) -> None:
+        now = time.monotonic()
+        finished = progress.done >= progress.total - progress.cached
+        if finished or now - last.get(progress.module, 0.0) >= interval:
+            last[progress.module] = now
+            print(progress.line(), file=sys.stderr, flush=True)
+
+    return _report
+
+
+async def _dry_run(cache: CacheBackend, area: Area, modules: set[str], stride: int) -> None:
+    for module in ("geocode", "landcover"):
+        if module in modules:
+            key_for = geocoder.cache_key_for if module == "geocode" else landcover.cache_key_for
+            keys = [key_for(lon, lat) for lon, lat in area.cells(_DECIMALS[module], stride)]
+            cached = len(await _cached_keys(cache, keys))
+            print(f"{module}: cells={len(keys)} cached={cached} todo={len(keys) - cached}")
+
+
+async def _main(args: argparse.Namespace, area: Area, modules: set[str]) -> None:
+    cache = CacheStore(args.db) if args.db else create_cache_backend()
+    await cache.init()
+    try:
+        if args.dry_run:
+            await _dry_run(cache, area, modules, args.stride)
+            return
+        try:
+            result = await prewarm(
+                cache,
+                area,
+                modules,
+                month=args.month,
+                stride=args.stride,
+                concurrency=args.concurrency,
+                report=_printer(args.progress_every),
+            )
+        except asyncio.CancelledError:
+            print("prewarm: interrupted, run again to resume", file=sys.stderr)
+            raise
+        for progress in result.values():
+            print(
+                f"prewarm: module={progress.module} cells={progress.total}"
+                f" cached={progress.cached} filled={progress.filled} failed={progress.failed}"
+            )
+    finally:
+        await cache.wait_refreshes()
+        await close_client()
+        await cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="관심 지역 캐시 사전 적재")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--bbox", help="min_lon,min_lat,max_lon,max_lat")
+    where.add_argument("--geojson", help="Polygon/MultiPolygon GeoJSON 파일")
+    parser.add_argument(
+        "--modules", default="geocode,landcover", help=f"쉼표 구분 ({','.join(MODULES)})"
+    )
+    parser.add_argument("--month", help="context 검색 월 (YYYY-MM, context 포함 시 필수)")
+    parser.add_argument("--stride", type=int, default=1, help="축마다 N번째 셀만 채움")
+    parser.add_argument("--concurrency", type=int, default=4, help="모듈별 동시 요청 수")
+    parser.add_argument("--max-cells", type=int, default=100_000, help="모듈별 셀 수 상한")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="진행 출력 간격(초)")
+    parser.add_argument("--dry-run", action="store_true", help="셀 수와 캐시된 수만 출력")
+    parser.add_argument("--db", default=None, help="SQLite 캐시 DB 경로 (기본: CACHE_BACKEND 설정)")
+    args = parser.parse_args()
+
+    modules = {m.strip() for m in args.modules.split(",") if m.strip()}
+    if not modules or not modules <= set(MODULES):
+        parser.error(f"--modules must be a subset of {','.join(MODULES)}")
+    if "context" in modules and not (args.month and len(args.month) == 7):
+        parser.error("--month YYYY-MM is required with the context module")
+    if args.stride < 1 or args.concurrency < 1:
+        parser.error("--stride and --concurrency must be positive")
+    try:
+        if args.bbox:
+            area = Area.from_bbox(args.bbox)
+        else:
+            with open(args.geojson, encoding="utf-8") as f:
+                area = Area.from_geojson(json.load(f))
+    except (AreaError, OSError, json.JSONDecodeError) as e:
+        parser.error(str(e))
+    # 가장 촘촘한 격자 기준으로 상한 확인 (실수로 넓은 영역을 지정해 수일간 도는 것 방지)
+    finest = _DECIMALS["geocode"] if modules & {"geocode", "context"} else _DECIMALS["landcover"]
+    try:
+        area.cells(finest, args.stride, limit=args.max_cells)
+    except AreaError as e:
+        parser.error(f"{e} (--max-cells); use --stride or a smaller area")
+    asyncio.run(_main(args, area, modules))
@@ -0,0 +1,318 @@
+"""Redis backend: one cache shared by every replica.
+
+Each entry is a plain string ``{prefix}k:{key}`` holding an 8-byte big-endian ``stale_at``
+(0 = none) followed by the codec-packed value, with the hard expiry as the key's TTL.
+Hit/miss counters are kept in the hash ``{prefix}stats`` so they aggregate across
+replicas. A short-lived per-process L1 (``CACHE_REDIS_L1_TTL_SECONDS``) can sit in front;
+it bounds how long a replica keeps serving a value another replica has replaced.
+
+The client is ``redis.asyncio`` (the ``redis`` extra), so ``rediss://`` TLS, ACL users and
+``?protocol=3`` work as documented for ``redis.from_url``.
+"""
+
+import struct
+import time
+from collections.abc import Awaitable, Callable, Mapping
+
+import structlog
+
+from app.cache import codec
+from app.cache.backend import CacheBackend, _L1Entry
+from app.config import settings
+from app.utils.metrics import cache_errors, cache_l1_hits, cache_misses
+
+try:  # 선택 의존성: CACHE_BACKEND=redis에서만 필요
+    import redis.asyncio as aioredis
+    from redis.asyncio.retry import Retry
+    from redis.backoff import NoBackoff
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - depends on environment
+    aioredis = None
+
+    class RedisError(Exception):  # type: ignore[no-redef]
+        pass
+
+
+logger = structlog.get_logger()
+
+_HEADER = struct.Struct(">d")
+
+_REDIS_ERRORS = (RedisError, ConnectionError, OSError, TimeoutError)
+
+_COUNT_FIELDS = ("hits", "l1_hits", "misses")
+
+
+class RedisCacheStore(CacheBackend):
+    """Shared cache over the Redis protocol with pipelined bulk operations."""
+
+    def __init__(self, url: str):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' extra")
+        super().__init__()
+        pool = aioredis.BlockingConnectionPool.from_url(
+            url,
+            max_connections=settings.cache_redis_pool_size,
+            timeout=settings.cache_redis_timeout,
+            socket_timeout=settings.cache_redis_timeout,
+            socket_connect_timeout=settings.cache_redis_timeout,
+            # 캐시는 실패를 미스로 처리하므로 재시도하지 않는다 (파이프라인 카운터 중복 방지)
+            retry=Retry(NoBackoff(), 0),
+        )
+        self._client = aioredis.Redis.from_pool(pool)
+        self._prefix = settings.cache_redis_key_prefix
+        self._stats_key = f"{self._prefix}stats"
+        if settings.cache_redis_l1_ttl_seconds <= 0:
+            self._l1.max_entries = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}k:{key}"
+
+    async def init(self) -> None:
+        codec.check_available()
+        # Redis 장애는 캐시 미스로 처리되므로 시작은 막지 않는다
+        if not await self.ping():
+            logger.warning("cache_redis_unreachable")
+
+    async def close(self) -> None:
+        await self._stop_refresh_workers()
+        counts = self._take_counts()
+        if counts:
+            try:
+                await self._pipeline(self._count_commands(counts))
+            except _REDIS_ERRORS as e:
+                logger.warning("cache_stats_flush_error", error=str(e))
+        await self._client.aclose()
+
+    async def _pipeline(self, commands: list[tuple]) -> list:
+        """Send ``commands`` in one round trip and return their replies in order.
+
+        Error replies are returned as ``RedisError`` instances, not raised, so one failed
+        command does not hide the others' results. Connection problems and timeouts raise.
+        """
+        pipe = self._client.pipeline(transaction=False)
+        for command in commands:
+            pipe.execute_command(*command)
+        return await pipe.execute(raise_on_error=False)
+
+    def _count_commands(self, counts: dict[str, tuple[int, int, int]]) -> list[tuple]:
+        return [
+            ("HINCRBY", self._stats_key, f"{module}:{field}", n)
+            for module, values in counts.items()
+            for field, n in zip(_COUNT_FIELDS, values, strict=True)
+            if n
+        ]
+
+    @staticmethod
+    def _l1_entry(
+        data: dict, expires_at: float | None, stale_at: float | None, size: int
+    ) -> _L1Entry:
+        # 다른 인스턴스가 값을 바꿔도 L1 TTL 이후에는 Redis에서 다시 읽는다
+        l1_expires = time.time() + settings.cache_redis_l1_ttl_seconds
+        if expires_at is not None:
+            l1_expires = min(l1_expires, expires_at)
+        return _L1Entry(data, l1_expires, stale_at, size)
+
+    def _decode(self, key: str, payload: bytes, pttl: object, now: float) -> _L1Entry | None:
+        try:
+            (stale_at,) = _HEADER.unpack_from(payload)
+            raw = codec.unpack(payload[_HEADER.size :])
+            data = codec.loads(raw)
+        except (ValueError, struct.error) as e:
+            logger.error("cache_get_json_error", key=key, error=str(e))
+            cache_errors.labels(operation="get").inc()
+            return None
+        # PTTL이 오류 응답이면 만료 시각을 모르는 것으로 보고 L1 TTL만 적용
+        expires_at = now + pttl / 1000 if isinstance(pttl, int) and pttl > 0 else None
+        return self._l1_entry(data, expires_at, stale_at or None, len(key) + len(raw))
+
+    async def get(
+        self, key: str, refresh: Callable[[], Awaitable[object]] | None = None
+    ) -> dict | None:
+        module = self._module_from_key(key)
+        now = time.time()
+        entry = self._l1.get(key, now)
+        if entry is not None:
+            self._l1_hits[module] += 1
+            cache_l1_hits.labels(module=module).inc()
+            return self._serve(key, module, entry, now, refresh)
+        redis_key = self._key(key)
+        try:
+            payload, pttl = await self._pipeline([("GET", redis_key), ("PTTL", redis_key)])
+        except _REDIS_ERRORS as e:
+            logger.error("cache_get_error", key=key, error=str(e))
+            cache_errors.labels(operation="get").inc()
+            return None
+        if not isinstance(payload, bytes):
+            self._misses[module] += 1
+            cache_misses.labels(module=module).inc()
+            return None
+        entry = self._decode(key, payload, pttl, now)
+        if entry is None:
+            return None
+        self._l1.put(key, entry)
+        return self._serve(key, module, entry, now, refresh)
+
+    async def _load_many(self, keys: list[str], now: float) -> dict[str, _L1Entry]:
+        """GET + PTTL for every key in one pipelined round trip."""
+        commands = []
+        for key in keys:
+            commands += [("GET", self._key(key)), ("PTTL", self._key(key))]
+        try:
+            replies = await self._pipeline(commands)
+        except _REDIS_ERRORS as e:
+            logger.error("cache_get_error", keys=len(keys), error=str(e))
+            cache_errors.labels(operation="get").inc()
+            return {}
+        entries = {}
+        for i, key in enumerate(keys):
+            payload, pttl = replies[2 * i], replies[2 * i + 1]
+            if not isinstance(payload, bytes):
+                continue
+            entry = self._decode(key, payload, pttl, now)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def _set_command(
+        self, key: str, raw: bytes, now: float, expires_at: float | None, stale_at: float | None
+    ) -> tuple | None:
+        payload = _HEADER.pack(stale_at or 0.0) + codec.pack(raw)
+        if expires_at is None:
+            return ("SET", self._key(key), payload)
+        ttl_ms = int((expires_at - now) * 1000)
+        if ttl_ms <= 0:
+            return None
+        return ("SET", self._key(key), payload, "PX", ttl_ms)
+
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        await self.set_many({key: value}, ttl_days, ttl_seconds, stale_grace_seconds)
+
+    async def set_many(
+        self,
+        items: Mapping[str, dict],
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        """Write all items (and pending hit/miss counters) in one pipelined round trip."""
+        now = time.time()
+        expires_at, stale_at = self._expiry(now, ttl_days, ttl_seconds, stale_grace_seconds)
+        commands = []
+        encoded = {}
+        for key, value in items.items():
+            raw = codec.dumps(value)
+            command = self._set_command(key, raw, now, expires_at, stale_at)
+            if command is not None:
+                commands.append(command)
+                encoded[key] = (value, len(key) + len(raw))
+        if not commands:
+            return
+        counts = self._take_counts()
+        try:
+            replies = await self._pipeline(commands + self._count_commands(counts))
+        except _REDIS_ERRORS as e:
+            logger.warning("cache_set_error", keys=len(commands), error=str(e))
+            cache_errors.labels(operation="set").inc()
+            self._restore_counts(counts)
+            for key in encoded:
+                self._l1.pop(key)
+            return
+        for (key, (value, size)), reply in zip(encoded.items(), replies, strict=False):
+            if isinstance(reply, Exception):
+                logger.warning("cache_set_error", key=key, error=str(reply))
+                cache_errors.labels(operation="set").inc()
+                self._l1.pop(key)
+            else:
+                self._l1.put(key, self._l1_entry(value, expires_at, stale_at, size))
+
+    async def delete(self, key: str) -> bool:
+        self._l1.pop(key)
+        try:
+            return bool(await self._client.delete(self._key(key)))
+        except _REDIS_ERRORS as e:
+            logger.warning("cache_delete_error", key=key, error=str(e))
+            cache_errors.labels(operation="delete").inc()
+            return False
+
+    async def _delete_prefix(self, prefix: str, chunk_size: int) -> int:
+        """SCAN the matching keys and UNLINK each batch (freed in the background by Redis)."""
+        pattern = _glob_escape(self._key(prefix)) + "*"
+        cursor = 0
+        deleted = 0
+        try:
+            while True:
+                cursor, keys = await self._client.scan(cursor, match=pattern, count=chunk_size)
+                if keys:
+                    deleted += await self._client.unlink(*keys)
+                if cursor == 0:
+                    break
+        except _REDIS_ERRORS as e:
+            logger.warning("cache_invalidate_error", prefix=prefix, error=str(e))
+            cache_errors.labels(operation="invalidate").inc()
+        return deleted
+
+    async def stats(self, module: str | None = None) -> dict:
+        """Hit/miss counters aggregated over all replicas, plus this cache's stored entries.
+
+        Entries are counted by SCANning this cache's key prefix, so other data in the same
+        database is not included, and sized with ``MEMORY USAGE``. Counts and sizes are 0
+        when Redis is unreachable.
+        """
+        counts = self._take_counts()
+        try:
+            replies = await self._pipeline(
+                [*self._count_commands(counts), ("HGETALL", self._stats_key)]
+            )
+        except _REDIS_ERRORS as e:
+            logger.warning("cache_stats_error", error=str(e))
+            self._restore_counts(counts)
+            return self._build_stats({}, module)
+        stored = replies[-1]
+        totals: dict[str, list[int]] = {}
+        for name, value in (stored if isinstance(stored, dict) else {}).items():
+            m, _, field = name.decode().rpartition(":")
+            if field in _COUNT_FIELDS and (module is None or m == module):
+                totals.setdefault(m, [0, 0, 0, 0, 0])[2 + _COUNT_FIELDS.index(field)] = int(value)
+        try:
+            await self._add_sizes(totals, module)
+        except _REDIS_ERRORS as e:
+            logger.warning("cache_stats_error", error=str(e))
+        return self._build_stats(totals, module)
+
+    async def _add_sizes(self, totals: dict[str, list[int]], module: str | None) -> None:
+        """Add each module's entry count and bytes, one SCAN batch per round trip."""
+        prefix_len = len(self._key(""))
+        pattern = _glob_escape(self._key(f"{module}:" if module else "")) + "*"
+        cursor = 0
+        while True:
+            cursor, keys = await self._client.scan(
+                cursor, match=pattern, count=settings.cache_cleanup_chunk_size
+            )
+            sizes = await self._pipeline([("MEMORY USAGE", k) for k in keys]) if keys else []
+            for key, size in zip(keys, sizes, strict=True):
+                # SCAN과 MEMORY USAGE 사이에 만료된 키는 nil
+                if not isinstance(size, int):
+                    continue
+                m = self._module_from_key(key[prefix_len:].decode())
+                row = totals.setdefault(m, [0, 0, 0, 0, 0])
+                row[0] += 1
+                row[1] += size
+            if cursor == 0:
+                break
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await self._client.ping())
+        except _REDIS_ERRORS:
+            return False
+
+
+def _glob_escape(text: str) -> str:
+    return "".join("\\" + c if c in "*?[]\\" else c for c in text)
@@ -0,0 +1,307 @@
+"""Sharded SQLite backend: the cache split over several database files.
+
+Each shard is a complete ``CacheStore`` with its own WAL file, write connection, group
+commit, read pool, L1 and eviction, so large describe writes or frequent context writes
+no longer queue behind the one writer that also serves geocode lookups.
+
+Layouts (``CACHE_SHARD_MODE``):
+
+- ``module``: every module listed in ``CACHE_SHARD_MODULES`` gets its own file next to
+  ``CACHE_DB_PATH`` (``cache.describe.db``, ...); other keys stay in ``CACHE_DB_PATH``.
+- ``hash``: keys are spread over ``CACHE_SHARD_COUNT`` files (``cache.0.db``, ...) by
+  CRC32 of the key, which also splits a single hot module.
+
+The L1 budget (``CACHE_L1_MAX_*``) is split evenly between shards. The size budget
+(``CACHE_MAX_*``) is enforced for the whole cache: once the shards' combined usage exceeds
+it, GDSF eviction picks the lowest-priority rows across all shards (the shards share one
+inflation value, so priorities are comparable), so a busy shard can use the space an idle
+one leaves free. Stats are summed over shards, so ``/cache/stats``
+looks the same as with one file. Changing the layout starts from a cold cache; carry
+entries over with a snapshot export before and an import after the change.
+"""
+
+import asyncio
+import zlib
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from pathlib import Path
+
+import aiosqlite
+import structlog
+
+from app.cache.backend import CacheBackend, _L1Entry
+from app.cache.store import _EVICT_CHUNK, _EVICT_LOW_WATERMARK, CacheStore
+from app.config import settings
+from app.utils.metrics import cache_bytes, cache_errors, cache_evictions
+
+logger = structlog.get_logger()
+
+
+def shard_path(db_path: str, name: str) -> str:
+    """``cache.db`` -> ``cache.<name>.db`` (in-memory databases stay in memory)."""
+    if ":memory:" in db_path:
+        return db_path
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.{name}{path.suffix}"))
+
+
+class ShardedCacheStore(CacheBackend):
+    """SQLite backend spread over several ``CacheStore`` shards by module or key hash."""
+
+    def __init__(
+        self,
+        db_path: str,
+        mode: str | None = None,
+        modules: Iterable[str] | None = None,
+        count: int | None = None,
+    ):
+        super().__init__()
+        self._mode = mode or settings.cache_shard_mode
+        # L1은 샤드마다 두므로 상위 L1은 사용하지 않는다
+        self._l1.max_entries = 0
+        self._by_module: dict[str, CacheStore] = {}
+        if self._mode == "module":
+            if modules is None:
+                modules = settings.cache_shard_modules.split(",")
+            self._by_module = {m: CacheStore(shard_path(db_path, m)) for m in modules if m}
+            self._stores = [*self._by_module.values(), CacheStore(db_path)]
+        elif self._mode == "hash":
+            count = count or settings.cache_shard_count
+            self._stores = [CacheStore(shard_path(db_path, str(i))) for i in range(count)]
+        else:
+            raise ValueError(f"unknown cache shard mode '{self._mode}'")
+
+        # 샤드 전체에 대한 eviction은 한 번에 하나만 실행
+        self._evict_lock = asyncio.Lock()
+        share = 1 / len(self._stores)
+        for store in self._stores:
+            store._check_budget = self._check_budget
+            store._l1.max_entries = int(settings.cache_l1_max_entries * share)
+            store._l1.max_bytes = int(settings.cache_l1_max_bytes * share)
+            store._report_bytes = False
+
+    def _shard(self, key: str) -> CacheStore:
+        if self._mode == "module":
+            return self._by_module.get(self._module_from_key(key), self._stores[-1])
+        return self._stores[zlib.crc32(key.encode()) % len(self._stores)]
+
+    def _group(self, keys: Iterable[str]) -> dict[CacheStore, list[str]]:
+        groups: dict[CacheStore, list[str]] = defaultdict(list)
+        for key in dict.fromkeys(keys):
+            groups[self._shard(key)].append(key)
+        return groups
+
+    def _shards_for_prefix(self, prefix: str) -> list[CacheStore]:
+        # module 모드에서는 접두사의 모듈이 있는 샤드만, hash 모드에서는 모든 샤드
+        if self._mode == "module" and ":" in prefix:
+            return [self._shard(prefix)]
+        return self._stores
+
+    async def init(self) -> None:
+        for store in self._stores:
+            await store.init()
+        self._share_inflation(max(store._inflation for store in self._stores))
+
+    def _share_inflation(self, inflation: float) -> None:
+        for store in self._stores:
+            store._inflation = inflation
+
+    async def close(self) -> None:
+        await asyncio.gather(*(store.close() for store in self._stores))
+
+    async def get(
+        self, key: str, refresh: Callable[[], Awaitable[object]] | None = None
+    ) -> dict | None:
+        return await self._shard(key).get(key, refresh)
+
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        await self._shard(key).set(key, value, ttl_days, ttl_seconds, stale_grace_seconds)
+
+    async def set_many(
+        self,
+        items: Mapping[str, dict],
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        await asyncio.gather(
+            *(
+                store.set_many(
+                    {key: items[key] for key in keys}, ttl_days, ttl_seconds, stale_grace_seconds
+                )
+                for store, keys in self._group(items).items()
+            )
+        )
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for part in await asyncio.gather(
+            *(store.get_many(group) for store, group in self._group(keys).items())
+        ):
+            found.update(part)
+        return found
+
+    async def prefetch(self, keys: Iterable[str]) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for part in await asyncio.gather(
+            *(store.prefetch(group) for store, group in self._group(keys).items())
+        ):
+            found.update(part)
+        return found
+
+    async def _load_many(self, keys: list[str], now: float) -> dict[str, _L1Entry]:
+        entries: dict[str, _L1Entry] = {}
+        for part in await asyncio.gather(
+            *(store._load_many(group, now) for store, group in self._group(keys).items())
+        ):
+            entries.update(part)
+        return entries
+
+    async def set_negative(self, key: str, outcome: str, detail: str = "") -> None:
+        # 백그라운드 갱신 상태는 샤드가 가지고 있으므로 샤드에서 판단
+        await self._shard(key).set_negative(key, outcome, detail)
+
+    async def delete(self, key: str) -> bool:
+        return await self._shard(key).delete(key)
+
+    async def index_point(self, key: str, lon: float, lat: float) -> None:
+        await self._shard(key).index_point(key, lon, lat)
+
+    async def _nearest(
+        self, module: str, version: int, lon: float, lat: float, radius_m: float
+    ) -> tuple[float, dict] | None:
+        found = await asyncio.gather(
+            *(
+                store._nearest(module, version, lon, lat, radius_m)
+                for store in self._shards_for_prefix(f"{module}:")
+            )
+        )
+        return min((f for f in found if f is not None), key=lambda f: f[0], default=None)
+
+    async def _delete_prefix(self, prefix: str, chunk_size: int) -> int:
+        deleted = 0
+        for store in self._shards_for_prefix(prefix):
+            store._l1.pop_prefix(prefix)
+            deleted += await store._delete_prefix(prefix, chunk_size)
+            store._l1.pop_prefix(prefix)
+        return deleted
+
+    async def ping(self) -> bool:
+        return all(await asyncio.gather(*(store.ping() for store in self._stores)))
+
+    async def cleanup_expired(self) -> int:
+        return sum(await asyncio.gather(*(store.cleanup_expired() for store in self._stores)))
+
+    async def _check_budget(self) -> None:
+        total_bytes = sum(store._approx_bytes for store in self._stores)
+        total_entries = sum(store._approx_entries for store in self._stores)
+        if CacheStore._over_budget(total_bytes, total_entries):
+            await self.evict_to_budget()
+
+    async def evict_to_budget(self) -> int:
+        """Evict the lowest-priority rows of all shards until the total is under budget."""
+        async with self._evict_lock:
+            try:
+                evicted = await self._evict()
+            except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+                logger.warning("cache_evict_error", error=str(e))
+                cache_errors.labels(operation="evict").inc()
+                evicted = 0
+        try:
+            totals = await self._totals(None)
+        except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+            logger.warning("cache_evict_error", error=str(e))
+            cache_errors.labels(operation="evict").inc()
+            return evicted
+        for module, values in totals.items():
+            cache_bytes.labels(module=module).set(values[1])
+        return evicted
+
+    async def _evict(self) -> int:
+        for store in self._stores:
+            totals = await store._stored_totals()
+            store._approx_entries = sum(values[0] for values in totals.values())
+            store._approx_bytes = sum(values[1] for values in totals.values())
+        total_entries = sum(store._approx_entries for store in self._stores)
+        total_bytes = sum(store._approx_bytes for store in self._stores)
+        if not CacheStore._over_budget(total_bytes, total_entries):
+            return 0
+
+        inflation = max(store._inflation for store in self._stores)
+        evicted = 0
+        while CacheStore._over_budget(total_bytes, total_entries, _EVICT_LOW_WATERMARK):
+            candidates = []
+            horizon = float("inf")
+            for i, store in enumerate(self._stores):
+                rows = await store._eviction_candidates(_EVICT_CHUNK)
+                candidates += [(prio, i, key, module, size) for key, module, size, prio in rows]
+                if len(rows) == _EVICT_CHUNK:
+                    # 청크 밖 행은 이 값 이상이므로 이보다 높은 후보는 다음 차례에 다시 비교
+                    horizon = min(horizon, rows[-1][3])
+            if not candidates:
+                break
+            chosen: dict[int, list[tuple[str, int]]] = defaultdict(list)
+            for priority, i, key, module, size in sorted(candidates):
+                if priority > horizon:
+                    break
+                chosen[i].append((key, size))
+                total_bytes -= size
+                total_entries -= 1
+                inflation = max(inflation, priority)
+                cache_evictions.labels(module=module).inc()
+                if not CacheStore._over_budget(total_bytes, total_entries, _EVICT_LOW_WATERMARK):
+                    break
+            for i, victims in chosen.items():
+                store = self._stores[i]
+                async with store._maintenance_lock:
+                    await store._delete_victims([key for key, _ in victims])
+                store._approx_entries -= len(victims)
+                store._approx_bytes -= sum(size for _, size in victims)
+                evicted += len(victims)
+        self._share_inflation(inflation)
+        logger.info("cache_evicted", evicted=evicted, total_bytes=total_bytes)
+        return evicted
+
+    async def _totals(self, module: str | None) -> dict[str, list[int]]:
+        """Per-module totals summed over shards, including their pending counters."""
+        totals: dict[str, list[int]] = {}
+        for store in self._stores:
+            shard_totals = await store._stored_totals(module)
+            store._add_pending(shard_totals, module)
+            for m, values in shard_totals.items():
+                summed = totals.setdefault(m, [0, 0, 0, 0, 0])
+                for i, value in enumerate(values):
+                    summed[i] += value
+        return totals
+
+    async def stats(self, module: str | None = None) -> dict:
+        result = self._build_stats(await self._totals(module), module)
+        result["l1"] = {
+            "entries": sum(len(store._l1) for store in self._stores),
+            "bytes": sum(store._l1.bytes for store in self._stores),
+            "max_entries": sum(store._l1.max_entries for store in self._stores),
+            "max_bytes": sum(store._l1.max_bytes for store in self._stores),
+        }
+        return result
+
+    async def wait_refreshes(self) -> None:
+        await asyncio.gather(*(store.wait_refreshes() for store in self._stores))
+
+    async def iter_rows(self, chunk_size: int = 1000) -> AsyncIterator[list[tuple]]:
+        """Yield unexpired rows of every shard in turn (see ``CacheStore.iter_rows``)."""
+        for store in self._stores:
+            async for rows in store.iter_rows(chunk_size):
+                yield rows
+
+    async def load_rows(self, rows: list[tuple]) -> int:
+        groups: dict[CacheStore, list[tuple]] = defaultdict(list)
+        for row in rows:
+            groups[self._shard(row[0])].append(row)
+        return sum(await asyncio.gather(*(store.load_rows(part) for store, part in groups.items())))
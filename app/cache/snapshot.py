@@ -0,0 +1,200 @@
+"""Cache snapshots: export unexpired rows to a gzip NDJSON file and load them back.
+
+A new container starts with an empty cache (``CACHE_DB_PATH`` lives in ``/tmp``), so its
+first requests all go upstream. Loading a snapshot at startup (``CACHE_SNAPSHOT_PATH``)
+warms it before traffic arrives.
+
+File layout: a header line ``{"format": ..., "version": 1, "created_at": ...}`` followed by
+one row per line ``{"k": key, "v": base64(stored value), "e": expires_at, "s": stale_at}``.
+Values are copied as stored (codec byte + possibly compressed JSON), so they are not
+re-encoded on either side.
+
+실행:
+    python -m app.cache.snapshot export snapshot.ndjson.gz [--db cache.db]
+    python -m app.cache.snapshot import snapshot.ndjson.gz [--db cache.db]
+
+Without ``--db`` the configured layout (``CACHE_DB_PATH`` and ``CACHE_SHARD_MODE``) is used,
+so a snapshot exported before changing the shard layout can be imported into the new one.
+"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+
+from app.cache import codec
+from app.cache.sharded import ShardedCacheStore
+from app.cache.store import CacheStore
+from app.config import settings
+
+logger = structlog.get_logger()
+
+SNAPSHOT_FORMAT = "cognito-cache-snapshot"
+SNAPSHOT_VERSION = 1
+
+# 한 번에 읽고 쓰는 행 수: 가져오기 메모리 사용량의 상한
+_CHUNK_ROWS = 1000
+
+
+class SnapshotError(ValueError):
+    """Snapshot file is not a cache snapshot or is corrupt."""
+
+
+class SnapshotResult(NamedTuple):
+    rows: int  # 내보낸/가져온 행 수
+    skipped: int  # 만료되었거나 이미 캐시에 있어 건너뛴 행 수
+    seconds: float
+
+
+def _encode_rows(rows: list[tuple]) -> bytes:
+    lines = []
+    for key, value, expires_at, stale_at in rows:
+        if isinstance(value, str):  # 마이그레이션 004 이전의 TEXT 행
+            value = codec.pack(value.encode())
+        record = {
+            "k": key,
+            "v": base64.b64encode(value).decode(),
+            "e": expires_at,
+            "s": stale_at,
+        }
+        lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _decode_line(line: str) -> tuple:
+    try:
+        record = json.loads(line)
+        return record["k"], base64.b64decode(record["v"]), record["e"], record["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise SnapshotError(f"corrupt snapshot row: {e}") from e
+
+
+def _read_header(f) -> None:
+    try:
+        header = json.loads(f.readline())
+    except (ValueError, OSError) as e:
+        raise SnapshotError(f"not a cache snapshot: {e}") from e
+    if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError("not a cache snapshot")
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {header.get('version')}")
+
+
+def _read_lines(f, n: int) -> list[str]:
+    return [line for line in itertools.islice(f, n) if line.strip()]
+
+
+async def export_snapshot(
+    store: CacheStore | ShardedCacheStore, path: str | Path
+) -> SnapshotResult:
+    """Write every unexpired row of ``store`` to ``path``.
+
+    The file is written next to ``path`` and renamed into place, so readers never see a
+    partial snapshot.
+    """
+    started = time.perf_counter()
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.time(),
+    }
+    rows = 0
+    f = await asyncio.to_thread(gzip.open, tmp, "wb")
+    try:
+        await asyncio.to_thread(f.write, (json.dumps(header) + "\n").encode())
+        async for chunk in store.iter_rows(_CHUNK_ROWS):
+            await asyncio.to_thread(f.write, _encode_rows(chunk))
+            rows += len(chunk)
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, tmp, path)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        tmp.unlink(missing_ok=True)
+        raise
+    result = SnapshotResult(rows, 0, round(time.perf_counter() - started, 3))
+    logger.info("cache_snapshot_exported", path=str(path), rows=rows, seconds=result.seconds)
+    return result
+
+
+async def import_snapshot(
+    store: CacheStore | ShardedCacheStore, path: str | Path
+) -> SnapshotResult:
+    """Stream ``path`` into ``store`` chunk by chunk, keeping rows already cached.
+
+    Raises ``SnapshotError`` for a file that is not a snapshot or has a corrupt row
+    (rows before the corrupt one stay imported) and ``OSError`` if it cannot be read.
+    """
+    started = time.perf_counter()
+    imported = read = 0
+    f = await asyncio.to_thread(gzip.open, path, "rt", encoding="utf-8")
+    try:
+        try:
+            await asyncio.to_thread(_read_header, f)
+            while lines := await asyncio.to_thread(_read_lines, f, _CHUNK_ROWS):
+                read += len(lines)
+                imported += await store.load_rows([_decode_line(line) for line in lines])
+        except (gzip.BadGzipFile, EOFError, UnicodeDecodeError) as e:
+            raise SnapshotError(f"corrupt snapshot: {e}") from e
+    finally:
+        await asyncio.to_thread(f.close)
+    result = SnapshotResult(imported, read - imported, round(time.perf_counter() - started, 3))
+    logger.info(
+        "cache_snapshot_imported",
+        path=str(path),
+        rows=result.rows,
+        skipped=result.skipped,
+        seconds=result.seconds,
+    )
+    return result
+
+
+async def restore_on_startup(
+    store: CacheStore | ShardedCacheStore, path: str
+) -> SnapshotResult | None:
+    """Load the startup snapshot if it exists; failures only cost a cold start."""
+    if not Path(path).is_file():
+        logger.info("cache_snapshot_missing", path=path)
+        return None
+    try:
+        return await import_snapshot(store, path)
+    except (SnapshotError, OSError) as e:
+        logger.warning("cache_snapshot_import_error", path=path, error=str(e))
+        return None
+
+
+def _open_store(db_path: str | None) -> CacheStore | ShardedCacheStore:
+    if db_path is None and settings.cache_shard_mode != "none":
+        return ShardedCacheStore(settings.cache_db_path)
+    return CacheStore(db_path or settings.cache_db_path)
+
+
+async def _main(command: str, path: str, db_path: str | None) -> None:
+    store = _open_store(db_path)
+    await store.init()
+    try:
+        if command == "export":
+            result = await export_snapshot(store, path)
+        else:
+            result = await import_snapshot(store, path)
+    finally:
+        await store.close()
+    print(f"{command}: rows={result.rows} skipped={result.skipped} seconds={result.seconds}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="캐시 스냅샷 내보내기/가져오기")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="스냅샷 파일 경로 (gzip NDJSON)")
+    parser.add_argument("--db", help="캐시 DB 경로 (기본: 설정된 DB/샤드 구성)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.command, args.path, args.db))
@@ -0,0 +1,29 @@
+"""Distance helpers for nearest-neighbour cache lookups (``CacheBackend.nearest``)."""
+
+import math
+
+_EARTH_RADIUS_M = 6_371_008.8
+_METERS_PER_DEGREE = _EARTH_RADIUS_M * math.pi / 180
+
+
+def haversine_m(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Great-circle distance in meters."""
+    rlat1, rlat2 = math.radians(lat1), math.radians(lat2)
+    h = (
+        math.sin((rlat2 - rlat1) / 2) ** 2
+        + math.cos(rlat1) * math.cos(rlat2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+def bounding_box(lon: float, lat: float, radius_m: float) -> tuple[float, float, float, float]:
+    """``(min_lon, max_lon, min_lat, max_lat)`` enclosing the circle.
+
+    Widened at the poleward edge; not wrapped at the antimeridian, so neighbours across
+    it are not found (the exact key still is).
+    """
+    # 반올림 오차로 원 가장자리의 후보가 빠지지 않도록 약간 여유를 둔다
+    dlat = radius_m * 1.001 / _METERS_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 89.9)))
+    dlon = min(180.0, dlat / cos_lat)
+    return lon - dlon, lon + dlon, lat - dlat, lat + dlat
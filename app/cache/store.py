@@ -1,68 +1,221 @@
-import json
+import asyncio
 import time
 from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
 
 import aiosqlite
 import structlog
 
+from app.cache import codec
+from app.cache.backend import CacheBackend, _L1Entry
+from app.cache.keys import key_version, prefix_upper_bound
 from app.cache.migrator import run_migrations
-from app.utils.metrics import cache_cleanup_total, cache_errors, cache_hits, cache_misses
+from app.cache.negative import negative_outcome
+from app.cache.spatial import bounding_box, haversine_m
+from app.config import settings
+from app.utils.metrics import (
+    cache_bytes,
+    cache_cleanup_total,
+    cache_errors,
+    cache_evictions,
+    cache_l1_hits,
+    cache_misses,
+    cache_write_batch_size,
+)
 
 logger = structlog.get_logger()
 
 
-_ALLOWED_MODULES = frozenset({"geocode", "landcover", "mission", "context", "describe"})
+# 모듈별 재조회 비용 가중치 (GDSF). Nominatim은 저렴하고 Gemini 설명 생성이 가장 비싸다.
+_REFETCH_COST = {
+    "geocode": 1.0,
+    "mission": 1.0,
+    "context": 2.0,
+    "landcover": 3.0,
+    "describe": 50.0,
+}
+_DEFAULT_REFETCH_COST = 1.0
 
+# 접근 기록이 이만큼 쌓이면 쓰기가 없어도 DB에 반영
+_ACCESS_FLUSH_THRESHOLD = 1024
+# 예산 초과 시 한도의 90%까지 비워 매 쓰기마다 eviction이 반복되지 않게 한다
+_EVICT_LOW_WATERMARK = 0.9
+_EVICT_CHUNK = 500
+# get_many의 IN (...) 한 번에 넣을 최대 키 수 (SQLite 변수 개수 제한 이내)
+_IN_CHUNK = 500
+
+# INSERT OR REPLACE는 삭제 트리거를 실행하지 않아 cache_stats가 어긋나므로 UPSERT 사용
+_UPSERT_SQL = (
+    "INSERT INTO cache (key, value, expires_at, stale_at, module, size, hits, last_access,"
+    " priority) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?) ON CONFLICT (key) DO UPDATE SET"
+    " value = excluded.value, expires_at = excluded.expires_at, stale_at = excluded.stale_at,"
+    " module = excluded.module, size = excluded.size, hits = 1,"
+    " last_access = excluded.last_access, priority = excluded.priority"
+)
+
+
+class CacheStore(CacheBackend):
+    """SQLite backend (default): one database file per instance."""
 
-class CacheStore:
     def __init__(self, db_path: str):
+        super().__init__()
         self._db_path = db_path
+        # 쓰기 전용 연결 1개 + WAL 읽기 연결 풀
         self._db: aiosqlite.Connection | None = None
-        self._hits: dict[str, int] = defaultdict(int)
-        self._misses: dict[str, int] = defaultdict(int)
+        self._readers: list[aiosqlite.Connection] = []
+        self._next_reader = 0
+        # group commit: 대기 중인 쓰기를 모아 한 트랜잭션으로 커밋
+        self._write_batch: list[tuple[tuple, asyncio.Future]] = []
+        # index_point로 등록할 좌표: 같은 트랜잭션에서 행 upsert 뒤에 반영
+        self._point_batch: list[tuple[tuple, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        # GDSF eviction: 반영 대기 중인 접근 횟수, inflation 값(L), 근사 사용량
+        self._accessed: dict[str, int] = defaultdict(int)
+        self._inflation = 0.0
+        self._approx_bytes = 0
+        self._approx_entries = 0
+        # eviction/만료 정리는 쓰기 연결에서 한 번에 하나만 실행
+        self._maintenance_lock = asyncio.Lock()
+        # 읽기 경로에서 발견한 만료 행 수: 삭제는 sweeper(cleanup_expired)가 담당
+        self._expired_seen = 0
+        self._sweep_task: asyncio.Task | None = None
+        # 샤드로 쓰일 때: 크기 예산은 상위 저장소가 샤드 전체에 대해 점검(_check_budget 교체),
+        # cache_bytes 게이지도 상위에서 합산해 기록
+        self._check_budget: Callable[[], Awaitable[object]] = self._check_own_budget
+        self._report_bytes = True
 
     async def init(self):
         self._db = await aiosqlite.connect(self._db_path)
+        await self._db.execute("PRAGMA journal_mode = WAL")
+        await self._apply_pragmas(self._db)
         await run_migrations(self._db)
+        codec.check_available()
+        rows = await self._db.execute_fetchall(
+            "SELECT (SELECT COALESCE(MIN(priority), 0) FROM cache),"
+            " COALESCE(SUM(entries), 0), COALESCE(SUM(bytes), 0) FROM cache_stats"
+        )
+        self._inflation, self._approx_entries, self._approx_bytes = rows[0]
+
+        # 인메모리 DB는 연결마다 별도 DB이므로 읽기 풀을 쓰지 않는다
+        if ":memory:" not in self._db_path:
+            for _ in range(settings.cache_read_pool_size):
+                conn = await aiosqlite.connect(self._db_path)
+                await self._apply_pragmas(conn)
+                await conn.execute("PRAGMA query_only = ON")
+                self._readers.append(conn)
+
+    @staticmethod
+    async def _apply_pragmas(conn: aiosqlite.Connection) -> None:
+        # WAL에서 synchronous=NORMAL은 체크포인트 시에만 fsync (커밋마다 fsync하지 않음)
+        await conn.execute(f"PRAGMA synchronous = {settings.cache_sqlite_synchronous}")
+        await conn.execute(f"PRAGMA mmap_size = {settings.cache_sqlite_mmap_bytes}")
+        await conn.execute(f"PRAGMA cache_size = -{settings.cache_sqlite_cache_kib}")
+        await conn.execute("PRAGMA busy_timeout = 5000")
+
+    def _reader(self) -> aiosqlite.Connection:
+        """Pick a read connection round-robin (the writer when there is no pool).
+
+        Reads are issued as single ``execute_fetchall`` calls, so connections can be
+        shared without checkout: each aiosqlite connection serializes its own queries.
+        """
+        if not self._readers:
+            return self._db
+        self._next_reader = (self._next_reader + 1) % len(self._readers)
+        return self._readers[self._next_reader]
 
-    def _module_from_key(self, key: str) -> str:
-        module = key.split(":")[0] if ":" in key else "unknown"
-        return module if module in _ALLOWED_MODULES else "unknown"
+    def _priority(self, module: str, hits: int, size: int) -> float:
+        """GreedyDual-Size-Frequency: L + frequency * cost / size."""
+        cost = _REFETCH_COST.get(module, _DEFAULT_REFETCH_COST)
+        return self._inflation + hits * cost / max(size, 1)
 
-    async def get(self, key: str) -> dict | None:
+    async def get(
+        self, key: str, refresh: Callable[[], Awaitable[object]] | None = None
+    ) -> dict | None:
+        """Return the cached value, or None on a miss.
+
+        Lookups hit the in-memory L1 first and fall back to SQLite (L2), promoting L2 hits
+        into L1. The returned dict may be shared with L1 and must not be mutated.
+
+        Rows past their soft TTL (``stale_at``) but not yet expired are still returned;
+        if ``refresh`` is given it is queued to run in the background to repopulate the
+        entry. Rows past the hard TTL are misses and are left for ``cleanup_expired``.
+        """
         module = self._module_from_key(key)
+        now = time.time()
+        entry = self._l1.get(key, now)
+        if entry is not None:
+            self._l1_hits[module] += 1
+            cache_l1_hits.labels(module=module).inc()
+            return self._serve(key, module, entry, now, refresh)
         try:
-            async with self._db.execute(
-                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
-            ) as cursor:
-                row = await cursor.fetchone()
+            rows = await self._reader().execute_fetchall(
+                "SELECT value, expires_at, stale_at FROM cache WHERE key = ?", (key,)
+            )
         except (aiosqlite.DatabaseError, OSError, ValueError) as e:
             logger.error("cache_get_error", key=key, error=str(e))
             cache_errors.labels(operation="get").inc()
             return None
+        row = rows[0] if rows else None
+        if row is not None and row[1] and now > row[1]:
+            self._hand_off_expired()
+            row = None
         if row is None:
             self._misses[module] += 1
             cache_misses.labels(module=module).inc()
             return None
-        value, expires_at = row
-        if expires_at and time.time() > expires_at:
-            try:
-                await self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
-                await self._db.commit()
-            except (aiosqlite.DatabaseError, OSError, ValueError) as e:
-                logger.warning("cache_expire_delete_error", key=key, error=str(e))
-                cache_errors.labels(operation="delete").inc()
-            self._misses[module] += 1
-            cache_misses.labels(module=module).inc()
-            return None
-        self._hits[module] += 1
-        cache_hits.labels(module=module).inc()
+        value, expires_at, stale_at = row
         try:
-            return json.loads(value)
-        except json.JSONDecodeError as e:
+            raw = codec.unpack(value)
+            data = codec.loads(raw)
+        except ValueError as e:
             logger.error("cache_get_json_error", key=key, error=str(e))
             cache_errors.labels(operation="get").inc()
             return None
+        entry = _L1Entry(data, expires_at, stale_at, len(key) + len(raw))
+        self._l1.put(key, entry)
+        return self._serve(key, module, entry, now, refresh)
+
+    def _serve(
+        self,
+        key: str,
+        module: str,
+        entry: _L1Entry,
+        now: float,
+        refresh: Callable[[], Awaitable[object]] | None,
+    ) -> dict:
+        self._accessed[key] += 1
+        if len(self._accessed) >= _ACCESS_FLUSH_THRESHOLD and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_writes())
+        return super()._serve(key, module, entry, now, refresh)
+
+    async def _load_many(self, keys: list[str], now: float) -> dict[str, _L1Entry]:
+        """Read live rows for ``keys`` with ``IN (...)`` queries on one read connection."""
+        entries: dict[str, _L1Entry] = {}
+        conn = self._reader()
+        try:
+            for start in range(0, len(keys), _IN_CHUNK):
+                chunk = keys[start : start + _IN_CHUNK]
+                rows = await conn.execute_fetchall(
+                    "SELECT key, value, expires_at, stale_at FROM cache"
+                    f" WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, value, expires_at, stale_at in rows:
+                    if expires_at and now > expires_at:
+                        self._hand_off_expired()
+                        continue
+                    try:
+                        raw = codec.unpack(value)
+                        data = codec.loads(raw)
+                    except ValueError as e:
+                        logger.error("cache_get_json_error", key=key, error=str(e))
+                        cache_errors.labels(operation="get").inc()
+                        continue
+                    entries[key] = _L1Entry(data, expires_at, stale_at, len(key) + len(raw))
+        except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+            logger.error("cache_get_error", keys=len(keys), error=str(e))
+            cache_errors.labels(operation="get").inc()
+        return entries
 
     async def set(
         self,
@@ -70,49 +223,395 @@ class CacheStore:
         value: dict,
         ttl_days: int | None = None,
         ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
     ):
-        if ttl_seconds is not None:
-            expires_at = time.time() + ttl_seconds
-        elif ttl_days is not None:
-            expires_at = time.time() + ttl_days * 86400
-        else:
-            expires_at = None
+        """Store a value for ``ttl_*``.
+
+        With ``stale_grace_seconds`` the TTL becomes the soft TTL: the row is kept for the
+        extra grace period and served stale by ``get`` while it is refreshed.
+        """
+        await self.set_many({key: value}, ttl_days, ttl_seconds, stale_grace_seconds)
+
+    async def set_many(
+        self,
+        items: Mapping[str, dict],
+        ttl_days: int | None = None,
+        ttl_seconds: int | None = None,
+        stale_grace_seconds: int | None = None,
+    ) -> None:
+        """Queue all rows into the same group commit (one ``executemany`` + commit)."""
+        if not items:
+            return
+        now = time.time()
+        expires_at, stale_at = self._expiry(now, ttl_days, ttl_seconds, stale_grace_seconds)
+        future = asyncio.get_running_loop().create_future()
+        sizes = {}
+        for key, value in items.items():
+            raw = codec.dumps(value)
+            blob = codec.pack(raw)
+            module = self._module_from_key(key)
+            size = len(key) + len(blob)
+            row = (
+                key,
+                blob,
+                expires_at,
+                stale_at,
+                module,
+                size,
+                now,
+                self._priority(module, 1, size),
+            )
+            self._write_batch.append((row, future))
+            sizes[key] = len(key) + len(raw)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_writes())
+        ok = await future
+        for key, value in items.items():
+            if ok:
+                self._l1.put(key, _L1Entry(value, expires_at, stale_at, sizes[key]))
+            else:
+                self._l1.pop(key)
+
+    async def _flush_writes(self) -> None:
+        """Group commit: write everything queued so far in one transaction, then repeat.
+
+        Writes that arrive while a commit is in flight join the next batch, so batch size
+        grows with load. ``cache_write_batch_ms`` is an extra window to collect the first batch.
+        Queued spatial points, pending access counts and hit/miss counters are applied in the
+        same transaction, and the size budget is enforced once the approximate usage exceeds it.
+        """
+        await asyncio.sleep(settings.cache_write_batch_ms / 1000)
+        try:
+            while self._write_batch or self._point_batch or self._accessed:
+                batch, self._write_batch = self._write_batch, []
+                points, self._point_batch = self._point_batch, []
+                accessed, self._accessed = self._accessed, defaultdict(int)
+                counts = self._take_counts()
+                # 쓰기 연결의 트랜잭션이 eviction/정리/삭제와 섞이지 않도록 직렬화
+                async with self._maintenance_lock:
+                    try:
+                        await self._db.executemany(_UPSERT_SQL, [row for row, _ in batch])
+                        await self._apply_points([row for row, _ in points])
+                        await self._apply_accesses(accessed)
+                        await self._apply_counts(counts)
+                        await self._db.commit()
+                        ok = True
+                    except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+                        logger.warning("cache_set_error", keys=len(batch), error=str(e))
+                        cache_errors.labels(operation="set").inc()
+                        self._restore_counts(counts)
+                        ok = False
+                        await self._rollback()
+                if batch:
+                    cache_write_batch_size.observe(len(batch))
+                for _, future in batch + points:
+                    if not future.done():
+                        future.set_result(ok)
+                if ok:
+                    self._approx_entries += len(batch)
+                    self._approx_bytes += sum(row[5] for row, _ in batch)
+                    await self._check_budget()
+        finally:
+            self._flush_task = None
+
+    async def _rollback(self) -> None:
+        """Discard a failed batch so its partial writes don't ride along the next commit."""
         try:
-            await self._db.execute(
-                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
-                (key, json.dumps(value, ensure_ascii=False), expires_at),
+            await self._db.rollback()
+        except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+            logger.warning("cache_rollback_error", error=str(e))
+
+    async def _apply_points(self, points: list[tuple]) -> None:
+        if not points:
+            return
+        # 행이 있을 때만 등록: 삭제 트리거가 정리하지 못하는 고아 항목 방지
+        await self._db.executemany(
+            "INSERT INTO cache_geo (key, module, lon, lat) SELECT key, ?, ?, ? FROM cache"
+            " WHERE key = ? ON CONFLICT (key) DO UPDATE SET lon = excluded.lon,"
+            " lat = excluded.lat",
+            points,
+        )
+        await self._db.executemany(
+            "INSERT OR REPLACE INTO cache_rtree SELECT id, lon, lon, lat, lat"
+            " FROM cache_geo WHERE key = ?",
+            [(key,) for *_, key in points],
+        )
+
+    async def _apply_accesses(self, accessed: dict[str, int]) -> None:
+        if not accessed:
+            return
+        now = time.time()
+        await self._db.executemany(
+            "UPDATE cache SET hits = hits + ?, last_access = ?,"
+            " priority = ? + (hits + ?) * ? / MAX(size, 1) WHERE key = ?",
+            [
+                (
+                    n,
+                    now,
+                    self._inflation,
+                    n,
+                    _REFETCH_COST.get(self._module_from_key(key), _DEFAULT_REFETCH_COST),
+                    key,
+                )
+                for key, n in accessed.items()
+            ],
+        )
+
+    async def _apply_counts(self, counts: dict[str, tuple[int, int, int]]) -> None:
+        if not counts:
+            return
+        await self._db.executemany(
+            "INSERT INTO cache_stats (module, hits, l1_hits, misses) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (module) DO UPDATE SET hits = hits + excluded.hits,"
+            " l1_hits = l1_hits + excluded.l1_hits, misses = misses + excluded.misses",
+            [(module, *values) for module, values in counts.items()],
+        )
+
+    @staticmethod
+    def _over_budget(total_bytes: int, total_entries: int, ratio: float = 1.0) -> bool:
+        max_bytes, max_entries = settings.cache_max_bytes, settings.cache_max_entries
+        return bool(
+            (max_bytes and total_bytes > max_bytes * ratio)
+            or (max_entries and total_entries > max(1, int(max_entries * ratio)))
+        )
+
+    async def _check_own_budget(self) -> None:
+        if self._over_budget(self._approx_bytes, self._approx_entries):
+            await self.evict_to_budget()
+
+    async def evict_to_budget(self) -> int:
+        """Evict lowest-priority rows until usage is back under the low watermark.
+
+        Priority follows GreedyDual-Size-Frequency, so small, rarely used, cheap-to-refetch
+        rows (e.g. geocode) go before large, hot or expensive ones (e.g. describe). The
+        inflation value L advances to the priority of each evicted row, ageing out entries
+        that are not accessed again. Returns the number of evicted rows.
+        """
+        async with self._maintenance_lock:
+            try:
+                return await self._evict()
+            except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+                logger.warning("cache_evict_error", error=str(e))
+                cache_errors.labels(operation="evict").inc()
+                return 0
+
+    async def _evict(self) -> int:
+        rows = await self._db.execute_fetchall("SELECT module, entries, bytes FROM cache_stats")
+        module_bytes = {module: size for module, _, size in rows}
+        total_entries = sum(count for _, count, _ in rows)
+        total_bytes = sum(module_bytes.values())
+
+        evicted = 0
+        if self._over_budget(total_bytes, total_entries):
+            while self._over_budget(total_bytes, total_entries, _EVICT_LOW_WATERMARK):
+                victims = await self._eviction_candidates(_EVICT_CHUNK)
+                if not victims:
+                    break
+                chosen = []
+                for key, module, size, priority in victims:
+                    chosen.append(key)
+                    total_bytes -= size
+                    total_entries -= 1
+                    module_bytes[module] = module_bytes.get(module, 0) - size
+                    self._inflation = max(self._inflation, priority)
+                    cache_evictions.labels(module=module).inc()
+                    if not self._over_budget(total_bytes, total_entries, _EVICT_LOW_WATERMARK):
+                        break
+                await self._delete_victims(chosen)
+                evicted += len(chosen)
+            logger.info("cache_evicted", evicted=evicted, total_bytes=total_bytes)
+
+        if self._report_bytes:
+            for module, size in module_bytes.items():
+                cache_bytes.labels(module=module).set(size)
+        self._approx_bytes, self._approx_entries = total_bytes, total_entries
+        return evicted
+
+    async def _eviction_candidates(self, limit: int) -> list[tuple[str, str, int, float]]:
+        """Lowest-priority rows ``(key, module, size, priority)``, lowest first."""
+        return await self._db.execute_fetchall(
+            "SELECT key, module, size, priority FROM cache ORDER BY priority LIMIT ?", (limit,)
+        )
+
+    async def _delete_victims(self, keys: list[str]) -> None:
+        try:
+            await self._db.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+            await self._db.commit()
+        except (aiosqlite.DatabaseError, OSError, ValueError):
+            await self._rollback()
+            raise
+        for key in keys:
+            self._l1.pop(key)
+            self._accessed.pop(key, None)
+
+    async def stats(self, module: str | None = None) -> dict:
+        """Return entry/byte totals and hit/miss counters, optionally for one module.
+
+        Everything comes from the trigger-maintained ``cache_stats`` table (one row per
+        module) plus this process's not-yet-flushed counters, so the cost does not grow
+        with the number of cached rows.
+        """
+        return self._build_stats(await self._stored_totals(module), module)
+
+    async def _stored_totals(self, module: str | None = None) -> dict[str, list[int]]:
+        """Per-module ``[entries, bytes, hits, l1_hits, misses]`` from ``cache_stats``."""
+        sql = "SELECT module, entries, bytes, hits, l1_hits, misses FROM cache_stats"
+        params: tuple = ()
+        if module is not None:
+            sql += " WHERE module = ?"
+            params = (module,)
+        rows = await self._reader().execute_fetchall(sql, params)
+        return {row[0]: list(row[1:]) for row in rows}
+
+    async def iter_rows(self, chunk_size: int = 1000) -> AsyncIterator[list[tuple]]:
+        """Yield unexpired rows ``(key, value, expires_at, stale_at)`` in chunks.
+
+        All chunks come from one SELECT on a dedicated connection, which in WAL mode reads
+        a single consistent snapshot while writes continue. ``value`` is the stored BLOB.
+        """
+        if self._flush_task is not None:
+            await self._flush_task
+        dedicated = ":memory:" not in self._db_path
+        conn = await aiosqlite.connect(self._db_path) if dedicated else self._db
+        try:
+            async with conn.execute(
+                "SELECT key, value, expires_at, stale_at FROM cache"
+                " WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            ) as cursor:
+                while rows := await cursor.fetchmany(chunk_size):
+                    yield rows
+        finally:
+            if dedicated:
+                await conn.close()
+
+    async def load_rows(self, rows: list[tuple]) -> int:
+        """Insert ``(key, value, expires_at, stale_at)`` rows that are not cached yet.
+
+        Existing keys are kept (they are at least as fresh as a snapshot) and expired rows
+        are skipped. Returns the number of inserted rows.
+        """
+        now = time.time()
+        params = []
+        for key, value, expires_at, stale_at in rows:
+            if expires_at is not None and expires_at <= now:
+                continue
+            module = self._module_from_key(key)
+            size = len(key) + len(value)
+            priority = self._priority(module, 1, size)
+            params.append((key, value, expires_at, stale_at, module, size, now, priority))
+        if not params:
+            return 0
+        async with self._maintenance_lock:
+            cursor = await self._db.executemany(
+                "INSERT INTO cache (key, value, expires_at, stale_at, module, size, hits,"
+                " last_access, priority) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT (key) DO NOTHING",
+                params,
             )
+            inserted = cursor.rowcount
             await self._db.commit()
+        self._approx_entries += inserted
+        self._approx_bytes += sum(row[5] for row in params)
+        await self._check_budget()
+        return inserted
+
+    async def delete(self, key: str) -> bool:
+        if self._flush_task is not None:
+            await self._flush_task  # 대기 중인 쓰기가 삭제 뒤에 커밋되지 않도록
+        self._l1.pop(key)
+        self._accessed.pop(key, None)
+        try:
+            return await self._delete_rows("DELETE FROM cache WHERE key = ?", (key,)) > 0
         except (aiosqlite.DatabaseError, OSError, ValueError) as e:
-            logger.warning("cache_set_error", key=key, error=str(e))
-            cache_errors.labels(operation="set").inc()
-
-    async def stats(self) -> dict:
-        async with self._db.execute("SELECT COUNT(*) FROM cache") as cursor:
-            row = await cursor.fetchone()
-            entry_count = row[0]
-
-        async with self._db.execute("SELECT SUM(LENGTH(key) + LENGTH(value)) FROM cache") as cursor:
-            row = await cursor.fetchone()
-            total_bytes = row[0] or 0
-
-        modules = sorted(set(list(self._hits.keys()) + list(self._misses.keys())))
-        per_module = {}
-        for m in modules:
-            hits = self._hits.get(m, 0)
-            misses = self._misses.get(m, 0)
-            total = hits + misses
-            per_module[m] = {
-                "hits": hits,
-                "misses": misses,
-                "hit_rate": round(hits / total, 4) if total > 0 else 0.0,
-            }
-
-        return {
-            "entry_count": entry_count,
-            "total_bytes": total_bytes,
-            "modules": per_module,
-        }
+            logger.warning("cache_delete_error", key=key, error=str(e))
+            cache_errors.labels(operation="delete").inc()
+            return False
+
+    async def _delete_rows(self, sql: str, params: tuple) -> int:
+        """Run one ``DELETE`` in its own transaction and return the number of deleted rows.
+
+        A failed statement is rolled back before the error propagates, so its partial
+        deletes don't ride along the next group commit. The approximate usage drops by the
+        rows and bytes actually deleted.
+        """
+        async with self._maintenance_lock:
+            try:
+                rows = await self._db.execute_fetchall(f"{sql} RETURNING size", params)
+                await self._db.commit()
+            except (aiosqlite.DatabaseError, OSError, ValueError):
+                await self._rollback()
+                raise
+        self._approx_entries = max(0, self._approx_entries - len(rows))
+        self._approx_bytes = max(0, self._approx_bytes - sum(size for (size,) in rows))
+        return len(rows)
+
+    async def index_point(self, key: str, lon: float, lat: float) -> None:
+        """Queue the point into the group commit, applied after the batch's row upserts."""
+        future = asyncio.get_running_loop().create_future()
+        self._point_batch.append(((self._module_from_key(key), lon, lat, key), future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_writes())
+        await future
+
+    async def _nearest(
+        self, module: str, version: int, lon: float, lat: float, radius_m: float
+    ) -> tuple[float, dict] | None:
+        """Scan the R*Tree box around the point, then pick by great-circle distance."""
+        min_lon, max_lon, min_lat, max_lat = bounding_box(lon, lat, radius_m)
+        try:
+            rows = await self._reader().execute_fetchall(
+                "SELECT g.key, g.lon, g.lat, c.value, c.expires_at FROM cache_rtree r"
+                " JOIN cache_geo g ON g.id = r.id JOIN cache c ON c.key = g.key"
+                " WHERE r.min_lon <= ? AND r.max_lon >= ? AND r.min_lat <= ?"
+                " AND r.max_lat >= ? AND g.module = ?",
+                (max_lon, min_lon, max_lat, min_lat, module),
+            )
+        except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+            logger.error("cache_nearest_error", module=module, error=str(e))
+            cache_errors.labels(operation="nearest").inc()
+            return None
+        now = time.time()
+        candidates = sorted(
+            (haversine_m(lon, lat, g_lon, g_lat), key, value)
+            for key, g_lon, g_lat, value, expires_at in rows
+            if not (expires_at and now > expires_at) and key_version(key) == version
+        )
+        for distance, key, value in candidates:
+            if distance > radius_m:
+                break
+            try:
+                data = codec.loads(codec.unpack(value))
+            except ValueError as e:
+                logger.error("cache_get_json_error", key=key, error=str(e))
+                continue
+            if negative_outcome(data) is None:
+                return distance, data
+        return None
+
+    async def _delete_prefix(self, prefix: str, chunk_size: int) -> int:
+        if self._flush_task is not None:
+            await self._flush_task
+        for key in [k for k in self._accessed if k.startswith(prefix)]:
+            del self._accessed[key]
+        # 기본 키 인덱스의 범위 조건으로 청크마다 해당 접두사 행만 읽는다
+        bounds = (prefix, prefix_upper_bound(prefix))
+        deleted = 0
+        try:
+            while True:
+                count = await self._delete_rows(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache"
+                    " WHERE key >= ? AND key < ? LIMIT ?)",
+                    (*bounds, chunk_size),
+                )
+                deleted += count
+                if count < chunk_size:
+                    break
+                await asyncio.sleep(0)
+        except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+            logger.warning("cache_invalidate_error", prefix=prefix, deleted=deleted, error=str(e))
+            cache_errors.labels(operation="invalidate").inc()
+        return deleted
 
     async def ping(self) -> bool:
         try:
@@ -122,23 +621,74 @@ class CacheStore:
         except (aiosqlite.DatabaseError, OSError, ValueError):
             return False
 
+    def _hand_off_expired(self) -> None:
+        """Schedule an early sweep once the read path has seen a chunk of expired rows."""
+        self._expired_seen += 1
+        if self._expired_seen >= settings.cache_cleanup_chunk_size and self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        try:
+            await self.cleanup_expired()
+        finally:
+            self._sweep_task = None
+
     async def cleanup_expired(self) -> int:
+        """Delete expired rows in bounded chunks, yielding to other tasks between chunks.
+
+        Uses the partial ``expires_at`` index, so each chunk touches only expired rows.
+        Freed pages are then returned to the OS with an incremental vacuum. If a chunk
+        fails, the rows deleted by earlier, already committed chunks are still counted.
+        """
+        deleted = await self._delete_expired()
+        if deleted > 0:
+            cache_cleanup_total.inc(deleted)
+            logger.info("cache_cleanup", deleted=deleted)
+        return deleted
+
+    async def _delete_expired(self) -> int:
         now = time.time()
+        chunk = settings.cache_cleanup_chunk_size
+        deleted = 0
+        self._expired_seen = 0
         try:
-            async with self._db.execute(
-                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
-            ) as cursor:
-                deleted = cursor.rowcount
-            await self._db.commit()
+            while True:
+                # 청크마다 잠금을 잡아 그 사이 group commit·eviction이 끼어들 수 있게 함
+                count = await self._delete_rows(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache"
+                    " WHERE expires_at IS NOT NULL AND expires_at < ? LIMIT ?)",
+                    (now, chunk),
+                )
+                deleted += count
+                if count < chunk:
+                    break
+                # 청크 사이에 쓰기 잠금을 놓고 다른 태스크에 양보
+                await asyncio.sleep(0)
+            # execute()는 한 스텝만 진행해 페이지 하나만 반환하므로 executescript로 끝까지 실행
+            async with self._maintenance_lock:
+                await self._db.executescript("PRAGMA incremental_vacuum;")
         except (aiosqlite.DatabaseError, OSError, ValueError) as e:
-            logger.warning("cache_cleanup_error", error=str(e))
+            # 앞선 청크는 이미 커밋되었으므로 실제로 삭제된 수를 돌려준다
+            logger.warning("cache_cleanup_error", deleted=deleted, error=str(e))
             cache_errors.labels(operation="cleanup").inc()
-            return 0
-        if deleted > 0:
-            cache_cleanup_total.inc(deleted)
-            logger.info("cache_cleanup", deleted=deleted)
         return deleted
 
     async def close(self):
+        if self._sweep_task is not None:
+            await self._sweep_task
+        await self._stop_refresh_workers()
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._db and (self._hits or self._misses):
+            # 남은 히트/미스 카운터를 cache_stats에 반영
+            counts = self._take_counts()
+            try:
+                await self._apply_counts(counts)
+                await self._db.commit()
+            except (aiosqlite.DatabaseError, OSError, ValueError) as e:
+                logger.warning("cache_stats_flush_error", error=str(e))
+        for conn in self._readers:
+            await conn.close()
+        self._readers = []
         if self._db:
             await self._db.close()
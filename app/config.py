@@ -7,6 +7,11 @@ from pydantic_settings import BaseSettings
 logger = structlog.get_logger()
 
 _RATE_LIMIT_PATTERN = re.compile(r"^\d+/(second|minute|hour|day)$")
+_SQLITE_SYNCHRONOUS = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+_CACHE_COMPRESSION = frozenset({"none", "zlib", "zstd"})
+_CACHE_BACKENDS = frozenset({"sqlite", "redis"})
+_CACHE_SHARD_MODES = frozenset({"none", "module", "hash"})
+_CACHE_MODULES = frozenset({"geocode", "landcover", "mission", "context", "describe"})
 
 
 class Settings(BaseSettings):
@@ -51,6 +56,51 @@ class Settings(BaseSettings):
     health_timeout: float = 3.0
     cache_cleanup_poll_interval: float = 0.5
     overpass_timeout: int = 10
+    gemini_max_in_flight: int = 8
+    compose_deadline_margin: float = 1.0
+    describer_speculate_after: float = 0.0  # 0 = disabled
+    hedging_enabled: bool = False
+    hedge_budget_ratio: float = 0.1
+    hedge_min_samples: int = 20
+    hedge_default_delay: float = 1.0
+    nominatim_mirror_url: str = ""
+    nominatim_rate_per_second: float = 1.0  # 공개 Nominatim 정책: 1 req/sec
+    nominatim_mirror_rate_per_second: float = 1.0
+    nominatim_burst: int = 1
+    nominatim_queue_size: int = 64
+    geocoder_offline_index: str = ""  # 비어 있으면 Nominatim만 사용
+    geocoder_offline_max_place_km: float = 25.0
+    geocode_bulk_concurrency: int = 4  # 일괄 지오코딩 요청당 동시 Nominatim 조회 셀 수
+    overpass_mirror_url: str = ""
+    stac_mirror_url: str = ""
+    cache_stale_grace_seconds: int = 86400 * 7
+    cache_refresh_workers: int = 2
+    cache_refresh_queue_size: int = 256
+    cache_l1_max_entries: int = 4096  # 0 = disabled
+    cache_l1_max_bytes: int = 32 * 1024 * 1024
+    cache_read_pool_size: int = 2  # 0 = 쓰기 연결로 읽기
+    cache_write_batch_ms: float = 0.0
+    cache_sqlite_synchronous: str = "NORMAL"
+    cache_sqlite_mmap_bytes: int = 64 * 1024 * 1024
+    cache_sqlite_cache_kib: int = 8192
+    cache_max_bytes: int = 256 * 1024 * 1024  # 0 = unlimited
+    cache_max_entries: int = 0  # 0 = unlimited
+    cache_compression: str = "zlib"  # none | zlib | zstd
+    cache_compress_min_bytes: int = 512
+    cache_cleanup_chunk_size: int = 500
+    cache_snapshot_path: str = ""  # 비어 있으면 시작 시 스냅샷을 불러오지 않음
+    cache_backend: str = "sqlite"  # sqlite | redis
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_redis_pool_size: int = 8
+    cache_redis_timeout: float = 1.0
+    cache_redis_key_prefix: str = "cognito:"
+    cache_redis_l1_ttl_seconds: int = 30  # 0 = L1 사용 안 함
+    cache_negative_ttl_seconds: int = 300  # 0 = 실패 결과를 캐시하지 않음
+    cache_geocode_neighbour_m: float = 0.0  # 0 = 정확한 키만 사용
+    cache_landcover_neighbour_m: float = 0.0
+    cache_shard_mode: str = "none"  # none | module | hash
+    cache_shard_modules: str = "geocode,landcover,mission,context,describe"
+    cache_shard_count: int = 4
 
     @field_validator(
         "cache_ttl_seconds",
@@ -77,6 +127,24 @@ class Settings(BaseSettings):
         "health_timeout",
         "cache_cleanup_poll_interval",
         "overpass_timeout",
+        "gemini_max_in_flight",
+        "compose_deadline_margin",
+        "hedge_budget_ratio",
+        "hedge_min_samples",
+        "hedge_default_delay",
+        "cache_refresh_workers",
+        "cache_refresh_queue_size",
+        "cache_sqlite_cache_kib",
+        "cache_cleanup_chunk_size",
+        "cache_redis_pool_size",
+        "cache_redis_timeout",
+        "cache_shard_count",
+        "nominatim_rate_per_second",
+        "nominatim_mirror_rate_per_second",
+        "nominatim_burst",
+        "nominatim_queue_size",
+        "geocoder_offline_max_place_km",
+        "geocode_bulk_concurrency",
     )
     @classmethod
     def _positive_int(cls, v: int | float, info) -> int | float:
@@ -84,6 +152,28 @@ class Settings(BaseSettings):
             raise ValueError(f"{info.field_name} must be positive, got {v}")
         return v
 
+    @field_validator(
+        "describer_speculate_after",
+        "cache_stale_grace_seconds",
+        "cache_l1_max_entries",
+        "cache_l1_max_bytes",
+        "cache_read_pool_size",
+        "cache_write_batch_ms",
+        "cache_sqlite_mmap_bytes",
+        "cache_max_bytes",
+        "cache_max_entries",
+        "cache_compress_min_bytes",
+        "cache_redis_l1_ttl_seconds",
+        "cache_negative_ttl_seconds",
+        "cache_geocode_neighbour_m",
+        "cache_landcover_neighbour_m",
+    )
+    @classmethod
+    def _non_negative(cls, v: float, info) -> float:
+        if v < 0:
+            raise ValueError(f"{info.field_name} must be non-negative, got {v}")
+        return v
+
     @field_validator(
         "rate_limit",
         "rate_limit_describe",
@@ -99,6 +189,55 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator("cache_sqlite_synchronous")
+    @classmethod
+    def _valid_synchronous(cls, v: str) -> str:
+        v = v.upper()
+        if v not in _SQLITE_SYNCHRONOUS:
+            raise ValueError(
+                f"cache_sqlite_synchronous must be one of {sorted(_SQLITE_SYNCHRONOUS)}, got '{v}'"
+            )
+        return v
+
+    @field_validator("cache_compression")
+    @classmethod
+    def _valid_compression(cls, v: str) -> str:
+        v = v.lower()
+        if v not in _CACHE_COMPRESSION:
+            raise ValueError(
+                f"cache_compression must be one of {sorted(_CACHE_COMPRESSION)}, got '{v}'"
+            )
+        return v
+
+    @field_validator("cache_backend")
+    @classmethod
+    def _valid_backend(cls, v: str) -> str:
+        v = v.lower()
+        if v not in _CACHE_BACKENDS:
+            raise ValueError(f"cache_backend must be one of {sorted(_CACHE_BACKENDS)}, got '{v}'")
+        return v
+
+    @field_validator("cache_shard_mode")
+    @classmethod
+    def _valid_shard_mode(cls, v: str) -> str:
+        v = v.lower()
+        if v not in _CACHE_SHARD_MODES:
+            raise ValueError(
+                f"cache_shard_mode must be one of {sorted(_CACHE_SHARD_MODES)}, got '{v}'"
+            )
+        return v
+
+    @field_validator("cache_shard_modules")
+    @classmethod
+    def _valid_shard_modules(cls, v: str) -> str:
+        modules = [m.strip() for m in v.split(",") if m.strip()]
+        unknown = sorted(set(modules) - _CACHE_MODULES)
+        if unknown:
+            raise ValueError(
+                f"cache_shard_modules must be a subset of {sorted(_CACHE_MODULES)}, got {unknown}"
+            )
+        return ",".join(modules)
+
     @field_validator("cors_origins")
     @classmethod
     def _valid_cors_origins(cls, v: str) -> str:
@@ -122,6 +261,10 @@ class Settings(BaseSettings):
                 return "***"
             return value[:4] + "***" + value[-4:]
 
+        def _mask_url(url: str) -> str:
+            # redis://:password@host 형태의 자격 증명 숨김
+            return re.sub(r"//[^@/]*@", "//***@", url)
+
         logger.info(
             "settings_summary",
             supabase_url=self.supabase_url,
@@ -162,6 +305,51 @@ class Settings(BaseSettings):
             health_timeout=self.health_timeout,
             cache_cleanup_poll_interval=self.cache_cleanup_poll_interval,
             overpass_timeout=self.overpass_timeout,
+            gemini_max_in_flight=self.gemini_max_in_flight,
+            compose_deadline_margin=self.compose_deadline_margin,
+            describer_speculate_after=self.describer_speculate_after,
+            hedging_enabled=self.hedging_enabled,
+            hedge_budget_ratio=self.hedge_budget_ratio,
+            hedge_min_samples=self.hedge_min_samples,
+            hedge_default_delay=self.hedge_default_delay,
+            nominatim_mirror_url=self.nominatim_mirror_url,
+            nominatim_rate_per_second=self.nominatim_rate_per_second,
+            nominatim_mirror_rate_per_second=self.nominatim_mirror_rate_per_second,
+            nominatim_burst=self.nominatim_burst,
+            nominatim_queue_size=self.nominatim_queue_size,
+            geocoder_offline_index=self.geocoder_offline_index,
+            geocoder_offline_max_place_km=self.geocoder_offline_max_place_km,
+            geocode_bulk_concurrency=self.geocode_bulk_concurrency,
+            overpass_mirror_url=self.overpass_mirror_url,
+            stac_mirror_url=self.stac_mirror_url,
+            cache_stale_grace_seconds=self.cache_stale_grace_seconds,
+            cache_refresh_workers=self.cache_refresh_workers,
+            cache_refresh_queue_size=self.cache_refresh_queue_size,
+            cache_l1_max_entries=self.cache_l1_max_entries,
+            cache_l1_max_bytes=self.cache_l1_max_bytes,
+            cache_read_pool_size=self.cache_read_pool_size,
+            cache_write_batch_ms=self.cache_write_batch_ms,
+            cache_sqlite_synchronous=self.cache_sqlite_synchronous,
+            cache_sqlite_mmap_bytes=self.cache_sqlite_mmap_bytes,
+            cache_sqlite_cache_kib=self.cache_sqlite_cache_kib,
+            cache_max_bytes=self.cache_max_bytes,
+            cache_max_entries=self.cache_max_entries,
+            cache_compression=self.cache_compression,
+            cache_compress_min_bytes=self.cache_compress_min_bytes,
+            cache_cleanup_chunk_size=self.cache_cleanup_chunk_size,
+            cache_snapshot_path=self.cache_snapshot_path,
+            cache_backend=self.cache_backend,
+            cache_redis_url=_mask_url(self.cache_redis_url),
+            cache_redis_pool_size=self.cache_redis_pool_size,
+            cache_redis_timeout=self.cache_redis_timeout,
+            cache_redis_key_prefix=self.cache_redis_key_prefix,
+            cache_redis_l1_ttl_seconds=self.cache_redis_l1_ttl_seconds,
+            cache_negative_ttl_seconds=self.cache_negative_ttl_seconds,
+            cache_geocode_neighbour_m=self.cache_geocode_neighbour_m,
+            cache_landcover_neighbour_m=self.cache_landcover_neighbour_m,
+            cache_shard_mode=self.cache_shard_mode,
+            cache_shard_modules=self.cache_shard_modules,
+            cache_shard_count=self.cache_shard_count,
         )
 
     model_config = {"env_file": ".env"}
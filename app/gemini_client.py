@@ -0,0 +1,60 @@
+"""Shared async Gemini client with bounded in-flight concurrency."""
+
+import asyncio
+
+from google import genai
+
+from app.config import settings
+from app.utils.metrics import gemini_calls_in_flight, gemini_calls_queued
+
+_client: genai.Client | None = None
+_semaphore: asyncio.Semaphore | None = None
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide genai.Client, creating it lazily if needed.
+
+    Construction is synchronous, so no lock is required in single-threaded asyncio.
+    """
+    global _client
+    if _client is None:
+        _client = genai.Client(api_key=settings.google_ai_api_key)
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.gemini_max_in_flight)
+    return _semaphore
+
+
+async def generate_content(**kwargs):
+    """Call ``aio.models.generate_content`` without blocking the event loop.
+
+    At most ``settings.gemini_max_in_flight`` calls run at once; the rest wait
+    in the semaphore queue and are reported via the ``gemini_calls_queued`` gauge.
+    """
+    queued = True
+    gemini_calls_queued.inc()
+    try:
+        async with _get_semaphore():
+            gemini_calls_queued.dec()
+            queued = False
+            gemini_calls_in_flight.inc()
+            try:
+                return await get_client().aio.models.generate_content(**kwargs)
+            finally:
+                gemini_calls_in_flight.dec()
+    finally:
+        if queued:
+            gemini_calls_queued.dec()
+
+
+async def close_client() -> None:
+    """Close the shared client. Called during app shutdown."""
+    global _client, _semaphore
+    if _client is not None:
+        await _client.aio.aclose()
+        _client = None
+    _semaphore = None
@@ -15,9 +15,12 @@ from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app import gemini_client
 from app.api.routes import router
-from app.cache.store import CacheStore
+from app.cache.backend import CacheBackend, create_cache_backend
+from app.cache.snapshot import restore_on_startup
 from app.config import settings
+from app.modules import offline_geocoder
 from app.utils.errors import (
     DescriptorError,
     descriptor_error_handler,
@@ -45,11 +48,12 @@ def is_shutting_down() -> bool:
     return _shutting_down
 
 
-async def _cache_cleanup_loop(cache: CacheStore):
+async def _cache_cleanup_loop(cache: CacheBackend):
     while True:
         await asyncio.sleep(settings.cache_cleanup_interval_seconds)
         try:
             await cache.cleanup_expired()
+            await cache.evict_to_budget()
         except Exception:
             logger.warning("cache_cleanup_failed", exc_info=True)
 
@@ -65,9 +69,16 @@ async def lifespan(app: FastAPI):
 
     settings.log_settings_summary()
 
-    app.state.cache = CacheStore(settings.cache_db_path)
+    app.state.cache = create_cache_backend()
     await app.state.cache.init()
+    # 공유 백엔드(redis)는 이미 데워져 있으므로 스냅샷은 인스턴스별 SQLite 캐시에만 적용
+    if settings.cache_snapshot_path and settings.cache_backend == "sqlite":
+        # 트래픽을 받기 전에 스냅샷으로 캐시를 채워 콜드 스타트 시 외부 API 호출을 줄인다
+        await restore_on_startup(app.state.cache, settings.cache_snapshot_path)
+    if settings.geocoder_offline_index:
+        await asyncio.to_thread(offline_geocoder.load_index, settings.geocoder_offline_index)
     cleanup_task = asyncio.create_task(_cache_cleanup_loop(app.state.cache))
+    gemini_client.get_client()
 
     loop = asyncio.get_running_loop()
 
@@ -113,6 +124,7 @@ async def lifespan(app: FastAPI):
     from app.http_client import close_client
 
     await close_client()
+    await gemini_client.close_client()
 
 
 try:
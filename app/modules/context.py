@@ -1,16 +1,25 @@
 import json
+from collections.abc import Awaitable
 
 import httpx
 import structlog
 
 from app.api.schemas import Context, Event
-from app.cache.store import CacheStore
+from app.cache.backend import CacheBackend
+from app.cache.keys import versioned_key
+from app.cache.negative import INVALID_JSON, failure_outcome, negative_outcome
 from app.config import settings
 from app.http_client import get_client
 from app.utils.retry import retry_http
+from app.utils.singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
+_flight = SingleFlight("context")
+
+# 캐시 키 버전: 검색어 구성이나 이벤트 추출 방식을 바꾸면 올린다
+CACHE_VERSION = 1
+
 
 @retry_http
 async def _fetch_duckduckgo(query: str) -> httpx.Response:
@@ -24,24 +33,55 @@ async def _fetch_duckduckgo(query: str) -> httpx.Response:
     return resp
 
 
+def _search_terms(
+    place_name: str, captured_at: str, region: str, city: str | None
+) -> tuple[str, str]:
+    # 캐시 키: 지역명 + 월 단위
+    month = captured_at[:7] if captured_at and len(captured_at) >= 7 else (captured_at or "unknown")
+    # 검색에는 region+city 조합 사용 (place_name보다 검색 적합)
+    search_name = " ".join(filter(None, [region, city])) or place_name
+    return search_name, month
+
+
+def cache_key_for(
+    place_name: str, captured_at: str, region: str = "", city: str | None = None
+) -> str:
+    search_name, month = _search_terms(place_name, captured_at, region, city)
+    return versioned_key("context", CACHE_VERSION, search_name, month)
+
+
 async def research_context(
     place_name: str,
     captured_at: str,
-    cache: CacheStore,
+    cache: CacheBackend,
     region: str = "",
     city: str | None = None,
 ) -> Context:
-    # 캐시 키: 지역명 + 월 단위
-    month = captured_at[:7] if captured_at and len(captured_at) >= 7 else (captured_at or "unknown")
-    # 검색에는 region+city 조합 사용 (place_name보다 검색 적합)
-    search_name = " ".join(filter(None, [region, city])) or place_name
-    cache_key = f"context:{search_name}:{month}"
+    search_name, month = _search_terms(place_name, captured_at, region, city)
+    cache_key = cache_key_for(place_name, captured_at, region, city)
 
-    cached = await cache.get(cache_key)
+    def _fetch() -> Awaitable[Context]:
+        return _flight.do(
+            cache_key, lambda: _research_uncached(search_name, month, cache_key, cache)
+        )
+
+    cached = await cache.get(cache_key, refresh=_fetch)
     if cached:
         logger.debug("context cache hit", place=place_name, month=month)
+        if negative_outcome(cached):
+            return _empty_context(search_name, month)
         return Context(**cached)
 
+    return await _fetch()
+
+
+def _empty_context(search_name: str, month: str) -> Context:
+    return Context(events=[], summary=f"{search_name} {month}에 대한 관련 정보를 찾지 못했습니다.")
+
+
+async def _research_uncached(
+    search_name: str, month: str, cache_key: str, cache: CacheBackend
+) -> Context:
     # DuckDuckGo Instant Answer API (MVP)
     query = f"{search_name} {month}"
     events: list[Event] = []
@@ -65,6 +105,11 @@ async def research_context(
                 )
     except (json.JSONDecodeError, httpx.HTTPError, TimeoutError) as e:
         logger.warning("context research failed", error=str(e))
+        failure = INVALID_JSON if isinstance(e, json.JSONDecodeError) else failure_outcome(e)
+        # 반복될 실패만 짧은 TTL로 기억, 일시적 실패(타임아웃·5xx 등)는 다음 요청에서 재시도
+        if failure is not None:
+            await cache.set_negative(cache_key, failure, str(e))
+        return _empty_context(search_name, month)
 
     summary = (
         f"{search_name} {month} 관련 정보 {len(events)}건 발견."
@@ -73,6 +118,11 @@ async def research_context(
     )
 
     result = Context(events=events, summary=summary)
-    await cache.set(cache_key, result.model_dump(), ttl_days=7)
+    await cache.set(
+        cache_key,
+        result.model_dump(),
+        ttl_days=7,
+        stale_grace_seconds=settings.cache_stale_grace_seconds,
+    )
     logger.info("context result", events_count=len(events))
     return result
@@ -1,19 +1,31 @@
+import asyncio
 import base64
 import io
 import ipaddress
 import socket
+from collections.abc import Awaitable
 from urllib.parse import urlparse
 
 import structlog
 from google import genai
+from google.genai.errors import ClientError
 from PIL import Image
 
-from app.cache.store import CacheStore
+from app import gemini_client
+from app.cache.backend import CacheBackend
+from app.cache.keys import versioned_key
+from app.cache.negative import failure_outcome, negative_outcome, replay
 from app.config import settings
 from app.utils.retry import retry_gemini, retry_http
+from app.utils.singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
+_flight = SingleFlight("describe")
+
+# 캐시 키 버전: _make_prompt나 모델·생성 설정을 바꾸면 올린다 (이전 설명은 조회되지 않음)
+CACHE_VERSION = 1
+
 
 def _is_blocked_ip(ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
     """Return True if the IP is private, loopback, link-local, reserved, or multicast."""
@@ -57,8 +69,6 @@ def _resize_for_gemini_sync(image_bytes: bytes, max_size: int) -> bytes:
 
 async def _resize_for_gemini(image_bytes: bytes, max_size: int) -> bytes:
     """Run CPU-bound image resize in a thread pool to avoid blocking the event loop."""
-    import asyncio
-
     return await asyncio.to_thread(_resize_for_gemini_sync, image_bytes, max_size)
 
 
@@ -145,10 +155,27 @@ async def _download_image(url: str) -> bytes:
     raise ValueError(f"Too many redirects (max {max_redirects})")
 
 
+async def _await_image(thumbnail: str, image: Awaitable[bytes] | None) -> bytes:
+    """Bytes of the thumbnail, from the caller's already started preparation if given.
+
+    That preparation belongs to the request that started this (shared) describe flight and
+    is cancelled when that request ends, so other coalesced requests would lose it: in that
+    case the flight prepares the image itself.
+    """
+    if image is None:
+        return await prepare_image(thumbnail)
+    try:
+        return await asyncio.shield(image)
+    except asyncio.CancelledError:
+        if asyncio.current_task().cancelling():
+            raise
+        logger.info("describer_image_restarted")
+        return await prepare_image(thumbnail)
+
+
 @retry_gemini
 async def _call_gemini(image_bytes: bytes, prompt: str) -> str:
-    client = genai.Client(api_key=settings.google_ai_api_key)
-    response = client.models.generate_content(
+    response = await gemini_client.generate_content(
         model="gemini-2.5-flash",
         contents=[
             genai.types.Part.from_bytes(data=image_bytes, mime_type="image/jpeg"),
@@ -162,23 +189,12 @@ async def _call_gemini(image_bytes: bytes, prompt: str) -> str:
     return response.text.strip()
 
 
-async def describe_image(
-    thumbnail: str,
-    place_name: str,
-    captured_at: str,
-    land_cover_summary: str,
-    cache: CacheStore,
-    cog_image_id: str | None = None,
-    bbox: list[float] | None = None,
-) -> tuple[str, bool]:
-    if cog_image_id:
-        cache_key = f"describe:{cog_image_id}"
-        cached = await cache.get(cache_key)
-        if cached:
-            logger.debug("describer cache hit", cog_image_id=cog_image_id)
-            return cached["description"], True
-
-    # 썸네일 데이터 준비
+async def prepare_image(thumbnail: str) -> bytes:
+    """Decode or download the thumbnail and resize it for Gemini.
+
+    Independent of geocoder/landcover results, so the composer starts it as soon as
+    the request arrives.
+    """
     try:
         if thumbnail.startswith("data:image"):
             # data:image/png;base64,xxxx → base64 부분 추출
@@ -196,14 +212,87 @@ async def describe_image(
         raise ValueError(f"Invalid thumbnail data: {e}") from e
 
     # Gemini 토큰 절감을 위해 이미지 리사이즈 (CPU-bound → thread pool)
-    image_bytes = await _resize_for_gemini(image_bytes, settings.thumbnail_max_pixels)
+    return await _resize_for_gemini(image_bytes, settings.thumbnail_max_pixels)
+
+
+def cache_key_for(cog_image_id: str) -> str:
+    return versioned_key("describe", CACHE_VERSION, cog_image_id)
+
+
+async def describe_image(
+    thumbnail: str,
+    place_name: str,
+    captured_at: str,
+    land_cover_summary: str,
+    cache: CacheBackend,
+    cog_image_id: str | None = None,
+    bbox: list[float] | None = None,
+    image: Awaitable[bytes] | None = None,
+    speculative: bool = False,
+) -> tuple[str, bool]:
+    """``image``가 주어지면 (이미 시작된) 썸네일 준비 결과를 캐시 미스일 때만 기다린다.
+
+    ``speculative``는 geocoder/landcover 결과 없이 좌표만으로 만든 설명: 캐시에 저장하지
+    않아 다음 요청이 전체 맥락으로 다시 생성한다.
+    """
+    if not cog_image_id:
+        description = await _describe_uncached(
+            thumbnail, place_name, captured_at, land_cover_summary, cache, None, bbox, image
+        )
+        return description, False
+
+    cache_key = cache_key_for(cog_image_id)
+    cached = await cache.get(cache_key)
+    if cached:
+        if negative_outcome(cached):
+            replay(cached)
+        logger.debug("describer cache hit", cog_image_id=cog_image_id)
+        return cached["description"], True
+
+    # 추측 실행은 전체 맥락 요청과 결과를 공유하지 않도록 별도 키로 병합
+    description = await _flight.do(
+        f"{cache_key}:speculative" if speculative else cache_key,
+        lambda: _describe_uncached(
+            thumbnail,
+            place_name,
+            captured_at,
+            land_cover_summary,
+            cache,
+            cog_image_id,
+            bbox,
+            image,
+            store=not speculative,
+        ),
+    )
+    return description, False
+
+
+async def _describe_uncached(
+    thumbnail: str,
+    place_name: str,
+    captured_at: str,
+    land_cover_summary: str,
+    cache: CacheBackend,
+    cog_image_id: str | None,
+    bbox: list[float] | None,
+    image: Awaitable[bytes] | None = None,
+    store: bool = True,
+) -> str:
+    image_bytes = await _await_image(thumbnail, image)
 
     prompt = _make_prompt(place_name, captured_at, land_cover_summary, bbox)
 
-    description = await _call_gemini(image_bytes, prompt)
+    try:
+        description = await _call_gemini(image_bytes, prompt)
+    except ClientError as e:
+        # Gemini가 거부한 이미지(4xx)는 같은 cog_image_id로 다시 보내도 거부된다
+        outcome = failure_outcome(e)
+        if cog_image_id and outcome is not None:
+            await cache.set_negative(cache_key_for(cog_image_id), outcome, str(e))
+        raise
 
-    if cog_image_id:
-        await cache.set(f"describe:{cog_image_id}", {"description": description})
+    if cog_image_id and store:
+        await cache.set(cache_key_for(cog_image_id), {"description": description})
 
     logger.info("describer result", description_length=len(description))
-    return description, False
+    return description
@@ -1,21 +1,61 @@
 import asyncio
 import json
 import re
+from collections.abc import AsyncIterator, Awaitable, Sequence
 
 import httpx
 import structlog
 
 from app.api.schemas import Location
-from app.cache.store import CacheStore
+from app.cache.backend import CacheBackend
+from app.cache.keys import versioned_key
+from app.cache.negative import (
+    INVALID_JSON,
+    CachedUpstreamError,
+    failure_outcome,
+    negative_outcome,
+    replay,
+)
 from app.config import settings
 from app.http_client import get_client
+from app.modules import offline_geocoder
+from app.utils.hedge import hedged, observe_upstream
+from app.utils.metrics import (
+    cache_spatial_lookups,
+    geocode_bulk_points,
+    geocoder_offline_lookups,
+)
 from app.utils.retry import retry_http
+from app.utils.singleflight import SingleFlight
+from app.utils.token_bucket import RateLimitQueueFullError, TokenBucket
 
 logger = structlog.get_logger()
 
-# Nominatim 사용 정책: 1 req/sec
-_lock = asyncio.Lock()
-_last_request_time = 0.0
+_flight = SingleFlight("geocode")
+
+# 캐시 키 버전: Location 구성 방식(주소 필드 매핑 등)을 바꾸면 올린다
+CACHE_VERSION = 1
+
+# Nominatim 사용 정책: 1 req/sec. 엔드포인트(기본/미러)별 토큰 버킷으로 전송 시점만 제한
+_buckets: dict[str, TokenBucket] = {}
+
+# 일괄 조회에서 해당 지점의 오류로 돌려주는 예외 (나머지 지점은 계속 처리)
+_BULK_ERRORS = (httpx.HTTPError, TimeoutError, CachedUpstreamError, RateLimitQueueFullError)
+
+
+def _bucket_for(base_url: str | None) -> TokenBucket:
+    name = "nominatim_mirror" if base_url else "nominatim"
+    bucket = _buckets.get(name)
+    if bucket is None:
+        rate = (
+            settings.nominatim_mirror_rate_per_second
+            if base_url
+            else settings.nominatim_rate_per_second
+        )
+        bucket = _buckets[name] = TokenBucket(
+            name, rate, settings.nominatim_burst, settings.nominatim_queue_size
+        )
+    return bucket
 
 
 def _round_coords(lon: float, lat: float, decimals: int = 3) -> tuple[float, float]:
@@ -24,10 +64,12 @@ def _round_coords(lon: float, lat: float, decimals: int = 3) -> tuple[float, flo
 
 
 @retry_http
-async def _fetch_nominatim(lon: float, lat: float) -> httpx.Response:
+async def _fetch_nominatim(lon: float, lat: float, base_url: str | None = None) -> httpx.Response:
+    # 재시도마다 새 토큰을 받는다: 재시도도 업스트림에는 별도 요청
+    await _bucket_for(base_url).acquire()
     client = await get_client()
-    resp = await client.get(
-        f"{settings.nominatim_url}/reverse",
+    request = client.get(
+        f"{base_url or settings.nominatim_url}/reverse",
         params={
             "lat": lat,
             "lon": lon,
@@ -38,43 +80,162 @@ async def _fetch_nominatim(lon: float, lat: float) -> httpx.Response:
         headers={"User-Agent": "COGnito/1.2 (image-descriptor)"},
         timeout=settings.timeout_geocoder,
     )
+    resp = await observe_upstream("geocoder", request)
     resp.raise_for_status()
     return resp
 
 
-async def geocode(lon: float, lat: float, cache: CacheStore) -> Location:
+def _unknown_location(lon: float, lat: float) -> Location:
+    return Location(
+        country="Unknown",
+        country_code="",
+        region="",
+        city=None,
+        place_name="",
+        lat=lat,
+        lon=lon,
+    )
+
+
+def cache_key_for(lon: float, lat: float) -> str:
+    rlon, rlat = _round_coords(lon, lat)
+    return versioned_key("geocode", CACHE_VERSION, rlon, rlat)
+
+
+def _offline_lookup(lon: float, lat: float) -> Location | None:
+    offline = offline_geocoder.get_index()
+    if offline is None:
+        return None
+    location = offline.lookup(lon, lat)
+    geocoder_offline_lookups.labels(
+        outcome="resolved" if location is not None else "unresolved"
+    ).inc()
+    return location
+
+
+def _from_cached(cached: dict, lon: float, lat: float) -> Location:
+    outcome = negative_outcome(cached)
+    if outcome == INVALID_JSON:
+        return _unknown_location(lon, lat)
+    if outcome is not None:
+        replay(cached)
+    cache_spatial_lookups.labels(module="geocode", match="exact").inc()
+    return Location(**cached)
+
+
+async def _resolve_miss(lon: float, lat: float, cache_key: str, cache: CacheBackend) -> Location:
+    # 셀 경계 바로 건너편처럼 가까운 캐시 결과가 있으면 재사용 (좌표는 요청값으로)
+    if settings.cache_geocode_neighbour_m > 0:
+        near = await cache.nearest(
+            "geocode", CACHE_VERSION, lon, lat, settings.cache_geocode_neighbour_m
+        )
+        if near is not None:
+            return Location(**{**near, "lon": lon, "lat": lat})
+    return await _flight.do(cache_key, lambda: _geocode_uncached(lon, lat, cache_key, cache))
+
+
+async def geocode(lon: float, lat: float, cache: CacheBackend) -> Location:
+    # 오프라인 인덱스는 캐시 조회보다 빠르므로 먼저 확인하고, 경계 밖일 때만 캐시/Nominatim 사용
+    location = _offline_lookup(lon, lat)
+    if location is not None:
+        return location
+
     rlon, rlat = _round_coords(lon, lat)
-    cache_key = f"geocode:{rlon}:{rlat}"
+    cache_key = cache_key_for(lon, lat)
+
+    def _fetch() -> Awaitable[Location]:
+        return _flight.do(cache_key, lambda: _geocode_uncached(lon, lat, cache_key, cache))
 
-    cached = await cache.get(cache_key)
+    cached = await cache.get(cache_key, refresh=_fetch)
     if cached:
         logger.debug("geocoder cache hit", lon=rlon, lat=rlat)
-        return Location(**cached)
+        return _from_cached(cached, lon, lat)
+
+    return await _resolve_miss(lon, lat, cache_key, cache)
+
+
+async def geocode_many(
+    points: Sequence[tuple[float, float]], cache: CacheBackend
+) -> AsyncIterator[tuple[int, Location | Exception]]:
+    """Geocode ``points``, yielding ``(index, location or error)`` in input order.
+
+    Points that share a cache cell share one lookup. Cells are read from the cache with
+    one bulk ``get_many`` and only the misses go to Nominatim (through the token bucket),
+    ``GEOCODE_BULK_CONCURRENCY`` cells at a time. Each location carries its own point's
+    coordinates. Results are yielded as soon as every earlier point is done.
+    """
+    ready: dict[int, Location] = {}
+    cells: dict[str, list[int]] = {}
+    for i, (lon, lat) in enumerate(points):
+        location = _offline_lookup(lon, lat)
+        if location is not None:
+            ready[i] = location
+        else:
+            cells.setdefault(cache_key_for(lon, lat), []).append(i)
+
+    cached = await cache.get_many(cells)
+    geocode_bulk_points.labels(source="offline").inc(len(ready))
+    geocode_bulk_points.labels(source="cache").inc(sum(len(cells[k]) for k in cached))
+    geocode_bulk_points.labels(source="miss").inc(len(cells) - len(cached))
+    geocode_bulk_points.labels(source="duplicate").inc(
+        sum(len(idx) - 1 for k, idx in cells.items() if k not in cached)
+    )
+    sem = asyncio.Semaphore(settings.geocode_bulk_concurrency)
+
+    async def _resolve(cache_key: str, lon: float, lat: float) -> Location:
+        if cache_key in cached:
+            return _from_cached(cached[cache_key], lon, lat)
+        async with sem:
+            return await _resolve_miss(lon, lat, cache_key, cache)
+
+    tasks = {key: asyncio.create_task(_resolve(key, *points[idx[0]])) for key, idx in cells.items()}
+    cell_of = {i: key for key, idx in cells.items() for i in idx}
+    try:
+        for i, (lon, lat) in enumerate(points):
+            if i in ready:
+                yield i, ready[i]
+                continue
+            try:
+                location = await tasks[cell_of[i]]
+            except _BULK_ERRORS as e:
+                yield i, e
+                continue
+            yield i, location.model_copy(update={"lon": lon, "lat": lat})
+    finally:
+        # 클라이언트가 스트림을 끊으면 남은 조회를 취소
+        for task in tasks.values():
+            task.cancel()
+
 
-    global _last_request_time
-    async with _lock:
-        # 1 req/sec 속도 제한
-        now = asyncio.get_running_loop().time()
-        wait = max(0, 1.0 - (now - _last_request_time))
-        if wait > 0:
-            await asyncio.sleep(wait)
+async def fetch_and_store(lon: float, lat: float, cache: CacheBackend) -> Location:
+    """Query Nominatim and cache the result without reading the cache first (prewarming)."""
+    cache_key = cache_key_for(lon, lat)
+    return await _flight.do(cache_key, lambda: _geocode_uncached(lon, lat, cache_key, cache))
 
-        resp = await _fetch_nominatim(lon, lat)
-        _last_request_time = asyncio.get_running_loop().time()
+
+async def _geocode_uncached(
+    lon: float, lat: float, cache_key: str, cache: CacheBackend
+) -> Location:
+    try:
+        # 공개 Nominatim은 1 req/sec 정책이 있으므로 미러가 설정된 경우에만 hedge
+        mirror = settings.nominatim_mirror_url
+        resp = await hedged(
+            "geocoder",
+            lambda: _fetch_nominatim(lon, lat),
+            (lambda: _fetch_nominatim(lon, lat, mirror)) if mirror else None,
+        )
+    except httpx.HTTPStatusError as e:
+        outcome = failure_outcome(e)
+        if outcome is not None:
+            await cache.set_negative(cache_key, outcome, str(e))
+        raise
 
     try:
         data = resp.json()
     except json.JSONDecodeError:
         logger.warning("geocoder invalid JSON response", lon=lon, lat=lat, body=resp.text[:200])
-        return Location(
-            country="Unknown",
-            country_code="",
-            region="",
-            city=None,
-            place_name="",
-            lat=lat,
-            lon=lon,
-        )
+        await cache.set_negative(cache_key, INVALID_JSON, resp.text[:200])
+        return _unknown_location(lon, lat)
     address = data.get("address", {})
 
     location = Location(
@@ -87,6 +248,13 @@ async def geocode(lon: float, lat: float, cache: CacheStore) -> Location:
         lon=lon,
     )
 
-    await cache.set(cache_key, location.model_dump(), ttl_seconds=settings.cache_ttl_seconds)
+    await cache.set(
+        cache_key,
+        location.model_dump(),
+        ttl_seconds=settings.cache_ttl_seconds,
+        stale_grace_seconds=settings.cache_stale_grace_seconds,
+    )
+    if settings.cache_geocode_neighbour_m > 0:
+        await cache.index_point(cache_key, *_round_coords(lon, lat))
     logger.info("geocoder result", country=location.country, region=location.region)
     return location
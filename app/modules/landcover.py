@@ -1,16 +1,27 @@
 import json
+from collections.abc import Awaitable
 
 import httpx
 import structlog
 
 from app.api.schemas import LandCover, LandCoverClass
-from app.cache.store import CacheStore
+from app.cache.backend import CacheBackend
+from app.cache.keys import versioned_key
+from app.cache.negative import INVALID_JSON, failure_outcome, negative_outcome, replay
 from app.config import settings
 from app.http_client import get_client
+from app.utils.hedge import hedged, observe_upstream
+from app.utils.metrics import cache_spatial_lookups
 from app.utils.retry import retry_http
+from app.utils.singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
+_flight = SingleFlight("landcover")
+
+# 캐시 키 버전: TAG_LABELS나 결과 집계 방식을 바꾸면 올린다 (이전 항목은 조회되지 않음)
+CACHE_VERSION = 1
+
 # OSM landuse/natural/leisure 태그 → 한국어 매핑
 TAG_LABELS: dict[str, str] = {
     "residential": "주거지역",
@@ -51,26 +62,60 @@ def _round_coords(lon: float, lat: float) -> tuple[float, float]:
 
 
 @retry_http
-async def _fetch_overpass(query: str) -> httpx.Response:
+async def _fetch_overpass(query: str, url: str | None = None) -> httpx.Response:
     client = await get_client()
-    resp = await client.post(
-        settings.overpass_url,
+    request = client.post(
+        url or settings.overpass_url,
         data={"data": query},
         timeout=settings.timeout_landcover,
     )
+    resp = await observe_upstream("landcover", request)
     resp.raise_for_status()
     return resp
 
 
-async def get_land_cover(lon: float, lat: float, cache: CacheStore) -> LandCover:
+def cache_key_for(lon: float, lat: float) -> str:
+    rlon, rlat = _round_coords(lon, lat)
+    return versioned_key("landcover", CACHE_VERSION, rlon, rlat)
+
+
+async def get_land_cover(lon: float, lat: float, cache: CacheBackend) -> LandCover:
     rlon, rlat = _round_coords(lon, lat)
-    cache_key = f"landcover:{rlon}:{rlat}"
+    cache_key = cache_key_for(lon, lat)
+
+    def _fetch() -> Awaitable[LandCover]:
+        return _flight.do(cache_key, lambda: _land_cover_uncached(lon, lat, cache_key, cache))
 
-    cached = await cache.get(cache_key)
+    cached = await cache.get(cache_key, refresh=_fetch)
     if cached:
+        outcome = negative_outcome(cached)
+        if outcome == INVALID_JSON:
+            return LandCover(classes=[], summary="정보 없음")
+        if outcome is not None:
+            replay(cached)
         logger.debug("landcover cache hit", lon=rlon, lat=rlat)
+        cache_spatial_lookups.labels(module="landcover", match="exact").inc()
         return LandCover(**cached)
 
+    if settings.cache_landcover_neighbour_m > 0:
+        near = await cache.nearest(
+            "landcover", CACHE_VERSION, lon, lat, settings.cache_landcover_neighbour_m
+        )
+        if near is not None:
+            return LandCover(**near)
+
+    return await _fetch()
+
+
+async def fetch_and_store(lon: float, lat: float, cache: CacheBackend) -> LandCover:
+    """Query Overpass and cache the result without reading the cache first (prewarming)."""
+    cache_key = cache_key_for(lon, lat)
+    return await _flight.do(cache_key, lambda: _land_cover_uncached(lon, lat, cache_key, cache))
+
+
+async def _land_cover_uncached(
+    lon: float, lat: float, cache_key: str, cache: CacheBackend
+) -> LandCover:
     query = f"""
 [out:json][timeout:{settings.overpass_timeout}];
 (
@@ -82,12 +127,25 @@ async def get_land_cover(lon: float, lat: float, cache: CacheStore) -> LandCover
 out tags;
 """
 
-    resp = await _fetch_overpass(query)
+    try:
+        # 공개 Overpass에 같은 요청을 중복 전송하지 않도록 미러가 설정된 경우에만 hedge
+        mirror = settings.overpass_mirror_url
+        resp = await hedged(
+            "landcover",
+            lambda: _fetch_overpass(query),
+            (lambda: _fetch_overpass(query, mirror)) if mirror else None,
+        )
+    except httpx.HTTPStatusError as e:
+        outcome = failure_outcome(e)
+        if outcome is not None:
+            await cache.set_negative(cache_key, outcome, str(e))
+        raise
 
     try:
         elements = resp.json().get("elements", [])
     except json.JSONDecodeError:
         logger.warning("landcover invalid JSON response", lon=lon, lat=lat, body=resp.text[:200])
+        await cache.set_negative(cache_key, INVALID_JSON, resp.text[:200])
         return LandCover(classes=[], summary="정보 없음")
 
     # 태그 카운트 집계
@@ -115,6 +173,13 @@ out tags;
     summary = ", ".join(summary_parts) if summary_parts else "정보 없음"
 
     result = LandCover(classes=classes, summary=summary)
-    await cache.set(cache_key, result.model_dump(), ttl_seconds=settings.cache_ttl_seconds)
+    await cache.set(
+        cache_key,
+        result.model_dump(),
+        ttl_seconds=settings.cache_ttl_seconds,
+        stale_grace_seconds=settings.cache_stale_grace_seconds,
+    )
+    if settings.cache_landcover_neighbour_m > 0:
+        await cache.index_point(cache_key, *_round_coords(lon, lat))
     logger.info("landcover result", classes_count=len(classes), summary=summary)
     return result
@@ -1,16 +1,26 @@
 import json
+from collections.abc import Awaitable
 
 import httpx
 import structlog
 
 from app.api.schemas import Mission
-from app.cache.store import CacheStore
+from app.cache.backend import CacheBackend
+from app.cache.keys import versioned_key
+from app.cache.negative import INVALID_JSON, failure_outcome, negative_outcome, replay
 from app.config import settings
 from app.http_client import get_client
+from app.utils.hedge import hedged, observe_upstream
 from app.utils.retry import retry_http
+from app.utils.singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
+_flight = SingleFlight("mission")
+
+# 캐시 키 버전: _parse_mission 결과 형식을 바꾸면 올린다
+CACHE_VERSION = 1
+
 STAC_BASE_URL = "https://earth-search.aws.element84.com/v1"
 
 _COLLECTION_PROCESSING_LEVEL = {
@@ -21,11 +31,11 @@ _COLLECTION_PROCESSING_LEVEL = {
 
 
 @retry_http
-async def _fetch_stac_item(stac_id: str) -> httpx.Response:
+async def _fetch_stac_item(stac_id: str, base_url: str | None = None) -> httpx.Response:
     collection = _guess_collection(stac_id)
-    url = f"{STAC_BASE_URL}/collections/{collection}/items/{stac_id}"
+    url = f"{base_url or STAC_BASE_URL}/collections/{collection}/items/{stac_id}"
     client = await get_client()
-    resp = await client.get(url, timeout=settings.timeout_mission)
+    resp = await observe_upstream("mission", client.get(url, timeout=settings.timeout_mission))
     resp.raise_for_status()
     return resp
 
@@ -63,24 +73,60 @@ def _parse_mission(data: dict) -> dict:
     }
 
 
-async def get_mission_metadata(stac_id: str | None, cache: CacheStore) -> Mission | None:
+def cache_key_for(stac_id: str) -> str:
+    return versioned_key("mission", CACHE_VERSION, stac_id)
+
+
+async def get_mission_metadata(stac_id: str | None, cache: CacheBackend) -> Mission | None:
     if not stac_id:
         return None
 
-    cache_key = f"mission:{stac_id}"
-    cached = await cache.get(cache_key)
+    cache_key = cache_key_for(stac_id)
+
+    def _fetch() -> Awaitable[Mission | None]:
+        return _flight.do(cache_key, lambda: _mission_uncached(stac_id, cache_key, cache))
+
+    cached = await cache.get(cache_key, refresh=_fetch)
     if cached:
+        outcome = negative_outcome(cached)
+        if outcome == INVALID_JSON:
+            return None
+        if outcome is not None:
+            replay(cached)
         logger.debug("mission cache hit", stac_id=stac_id)
         return Mission(**cached)
 
-    resp = await _fetch_stac_item(stac_id)
+    return await _fetch()
+
+
+async def _mission_uncached(stac_id: str, cache_key: str, cache: CacheBackend) -> Mission | None:
+    try:
+        # 공개 STAC API에 같은 요청을 중복 전송하지 않도록 미러가 설정된 경우에만 hedge
+        mirror = settings.stac_mirror_url
+        resp = await hedged(
+            "mission",
+            lambda: _fetch_stac_item(stac_id),
+            (lambda: _fetch_stac_item(stac_id, mirror)) if mirror else None,
+        )
+    except httpx.HTTPStatusError as e:
+        # 존재하지 않는 stac_id(404) 등은 같은 입력에 대해 반복되므로 짧게 기억
+        outcome = failure_outcome(e)
+        if outcome is not None:
+            await cache.set_negative(cache_key, outcome, str(e))
+        raise
     try:
         data = resp.json()
     except json.JSONDecodeError:
         logger.warning("mission invalid JSON response", stac_id=stac_id, body=resp.text[:200])
+        await cache.set_negative(cache_key, INVALID_JSON, resp.text[:200])
         return None
     mission_dict = _parse_mission(data)
 
-    await cache.set(cache_key, mission_dict, ttl_days=365)
+    await cache.set(
+        cache_key,
+        mission_dict,
+        ttl_days=365,
+        stale_grace_seconds=settings.cache_stale_grace_seconds,
+    )
     logger.info("mission metadata fetched", stac_id=stac_id, platform=mission_dict["platform"])
     return Mission(**mission_dict)
@@ -0,0 +1,298 @@
+"""Offline reverse geocoder: admin boundaries and populated places from a local index.
+
+Nominatim's public policy (1 req/sec) caps cold-cell throughput. With
+``GEOCODER_OFFLINE_INDEX`` set, ``geocoder.geocode`` first answers from this in-memory
+index and only goes to Nominatim when the point is outside every boundary.
+
+The index is built once from GeoJSON files and loaded at startup:
+
+- boundaries (Polygon/MultiPolygon features with country, country code and region
+  properties): a uniform grid maps each cell to the boundaries whose bbox overlaps it,
+  then an even-odd point-in-polygon test picks the smallest containing boundary, so an
+  admin-1 region wins over its country when both are present.
+- populated places (Point features with a name): stored in implicit KD-tree order over
+  unit vectors, so the nearest place (within ``GEOCODER_OFFLINE_MAX_PLACE_KM``) is found
+  in O(log n) and distances are correct across the antimeridian and near the poles.
+
+실행:
+    python -m app.modules.offline_geocoder build \\
+        --boundaries admin1.geojson --places places.geojson -o geocoder.idx.json.gz \\
+        [--country-prop admin --code-prop iso_a2 --region-prop name --place-prop name]
+"""
+
+import argparse
+import gzip
+import json
+import math
+import time
+from pathlib import Path
+
+import structlog
+
+from app.api.schemas import Location
+from app.config import settings
+from app.utils.geo import in_rings, polygon_rings
+
+logger = structlog.get_logger()
+
+INDEX_FORMAT = "cognito-offline-geocoder"
+INDEX_VERSION = 1
+
+_EARTH_RADIUS_KM = 6371.0088
+_GRID_DEGREES = 1.0
+
+
+def _unit_vector(lon: float, lat: float) -> tuple[float, float, float]:
+    rlon, rlat = math.radians(lon), math.radians(lat)
+    cos_lat = math.cos(rlat)
+    return cos_lat * math.cos(rlon), cos_lat * math.sin(rlon), math.sin(rlat)
+
+
+def _chord(km: float) -> float:
+    """Straight-line distance between unit vectors ``km`` apart on the surface."""
+    return 2 * math.sin(min(km / _EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def _cell(lon: float, lat: float) -> str:
+    return f"{math.floor(lon / _GRID_DEGREES)}:{math.floor(lat / _GRID_DEGREES)}"
+
+
+def _kd_order(points: list[tuple], lo: int, hi: int, depth: int, out: list[tuple]) -> None:
+    """Arrange ``points[lo:hi]`` so each subrange's median sits at its middle index."""
+    if lo >= hi:
+        return
+    axis = depth % 3
+    points[lo:hi] = sorted(points[lo:hi], key=lambda p: p[0][axis])
+    mid = (lo + hi) // 2
+    out[mid] = points[mid]
+    _kd_order(points, lo, mid, depth + 1, out)
+    _kd_order(points, mid + 1, hi, depth + 1, out)
+
+
+def build_index(
+    boundaries: dict,
+    places: dict | None = None,
+    *,
+    country_prop: str = "country",
+    code_prop: str = "country_code",
+    region_prop: str = "region",
+    place_prop: str = "name",
+) -> dict:
+    """Build the serializable index from boundary and place GeoJSON FeatureCollections."""
+    regions = []
+    grid: dict[str, list[int]] = {}
+    for feature in boundaries.get("features", []):
+        rings = polygon_rings(feature.get("geometry") or {"type": None})
+        if not rings:
+            continue
+        props = feature.get("properties") or {}
+        xs = [v for ring in rings for v in ring[0::2]]
+        ys = [v for ring in rings for v in ring[1::2]]
+        bbox = [min(xs), min(ys), max(xs), max(ys)]
+        region_id = len(regions)
+        regions.append(
+            {
+                "country": props.get(country_prop) or "",
+                "country_code": (props.get(code_prop) or "").lower(),
+                "region": props.get(region_prop) or "",
+                "bbox": bbox,
+                "rings": rings,
+            }
+        )
+        x0, y0 = math.floor(bbox[0] / _GRID_DEGREES), math.floor(bbox[1] / _GRID_DEGREES)
+        x1, y1 = math.floor(bbox[2] / _GRID_DEGREES), math.floor(bbox[3] / _GRID_DEGREES)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                grid.setdefault(f"{cx}:{cy}", []).append(region_id)
+
+    points = []
+    for feature in (places or {}).get("features", []):
+        geometry = feature.get("geometry") or {}
+        name = (feature.get("properties") or {}).get(place_prop)
+        if geometry.get("type") != "Point" or not name:
+            continue
+        lon, lat = geometry["coordinates"][:2]
+        points.append((_unit_vector(lon, lat), lon, lat, name))
+    ordered: list[tuple] = [()] * len(points)
+    _kd_order(points, 0, len(points), 0, ordered)
+
+    return {
+        "format": INDEX_FORMAT,
+        "version": INDEX_VERSION,
+        "created_at": time.time(),
+        "grid_degrees": _GRID_DEGREES,
+        "regions": regions,
+        "grid": grid,
+        "places": {
+            "lon": [p[1] for p in ordered],
+            "lat": [p[2] for p in ordered],
+            "name": [p[3] for p in ordered],
+        },
+    }
+
+
+def _open(path: str | Path, mode: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def save_index(index: dict, path: str | Path) -> None:
+    with _open(path, "w") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+
+class OfflineGeocoder:
+    """Point lookups against a built index (see ``build_index``)."""
+
+    def __init__(self, index: dict, max_place_km: float | None = None):
+        if index.get("format") != INDEX_FORMAT:
+            raise ValueError("not an offline geocoder index")
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported offline geocoder index version {index.get('version')}")
+        if index.get("grid_degrees") != _GRID_DEGREES:
+            raise ValueError(f"unsupported grid size {index.get('grid_degrees')}")
+        self._regions = index["regions"]
+        self._grid = index["grid"]
+        places = index["places"]
+        self._names = places["name"]
+        self._vectors = [
+            _unit_vector(lon, lat) for lon, lat in zip(places["lon"], places["lat"], strict=True)
+        ]
+        max_km = settings.geocoder_offline_max_place_km if max_place_km is None else max_place_km
+        self._max_chord = _chord(max_km)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OfflineGeocoder":
+        """Read an index file; raises ``ValueError`` for a file that is not an index."""
+        with _open(path, "r") as f:
+            try:
+                index = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError, EOFError) as e:
+                raise ValueError(f"corrupt offline geocoder index: {e}") from e
+        if not isinstance(index, dict):
+            raise ValueError("not an offline geocoder index")
+        return cls(index)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """``(boundaries, places)`` in the index."""
+        return len(self._regions), len(self._names)
+
+    def region_at(self, lon: float, lat: float) -> dict | None:
+        """Smallest boundary containing the point, or None."""
+        best, best_area = None, math.inf
+        for region_id in self._grid.get(_cell(lon, lat), ()):
+            region = self._regions[region_id]
+            minx, miny, maxx, maxy = region["bbox"]
+            if not (minx <= lon <= maxx and miny <= lat <= maxy):
+                continue
+            area = (maxx - minx) * (maxy - miny)
+            if area < best_area and in_rings(lon, lat, region["rings"]):
+                best, best_area = region, area
+        return best
+
+    def nearest_place(self, lon: float, lat: float) -> str | None:
+        """Name of the closest populated place within the configured radius."""
+        if not self._vectors:
+            return None
+        target = _unit_vector(lon, lat)
+        best = [self._max_chord**2, -1]
+        self._search(target, 0, len(self._vectors), 0, best)
+        return self._names[best[1]] if best[1] >= 0 else None
+
+    def _search(self, target: tuple, lo: int, hi: int, depth: int, best: list) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        point = self._vectors[mid]
+        dist = sum((a - b) ** 2 for a, b in zip(point, target, strict=True))
+        if dist < best[0]:
+            best[0], best[1] = dist, mid
+        axis = depth % 3
+        diff = target[axis] - point[axis]
+        near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+        self._search(target, *near, depth + 1, best)
+        if diff * diff < best[0]:
+            self._search(target, *far, depth + 1, best)
+
+    def lookup(self, lon: float, lat: float) -> Location | None:
+        """Resolve a point, or None when it is outside every boundary."""
+        region = self.region_at(lon, lat)
+        if region is None:
+            return None
+        city = self.nearest_place(lon, lat)
+        parts = (city, region["region"], region["country"])
+        return Location(
+            country=region["country"] or "Unknown",
+            country_code=region["country_code"],
+            region=region["region"],
+            city=city,
+            place_name=", ".join(dict.fromkeys(p for p in parts if p)),
+            lat=lat,
+            lon=lon,
+        )
+
+
+_index: OfflineGeocoder | None = None
+
+
+def get_index() -> OfflineGeocoder | None:
+    return _index
+
+
+def load_index(path: str) -> OfflineGeocoder | None:
+    """Load the process-wide index; a missing or invalid file leaves Nominatim only."""
+    global _index
+    started = time.perf_counter()
+    try:
+        _index = OfflineGeocoder.load(path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("offline_geocoder_load_error", path=path, error=str(e))
+        _index = None
+        return None
+    boundaries, places = _index.size
+    logger.info(
+        "offline_geocoder_loaded",
+        path=path,
+        boundaries=boundaries,
+        places=places,
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    return _index
+
+
+def _read_geojson(path: str | None) -> dict | None:
+    if path is None:
+        return None
+    with _open(path, "r") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 역지오코딩 인덱스 생성")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="GeoJSON에서 인덱스 파일 생성")
+    build.add_argument("--boundaries", required=True, help="행정구역 경계 GeoJSON")
+    build.add_argument("--places", help="인구 밀집지(Point) GeoJSON")
+    build.add_argument("-o", "--output", required=True, help="인덱스 파일 (.gz면 gzip)")
+    build.add_argument("--country-prop", default="country")
+    build.add_argument("--code-prop", default="country_code")
+    build.add_argument("--region-prop", default="region")
+    build.add_argument("--place-prop", default="name")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    built = build_index(
+        _read_geojson(args.boundaries),
+        _read_geojson(args.places),
+        country_prop=args.country_prop,
+        code_prop=args.code_prop,
+        region_prop=args.region_prop,
+        place_prop=args.place_prop,
+    )
+    save_index(built, args.output)
+    print(
+        f"build: boundaries={len(built['regions'])} places={len(built['places']['name'])}"
+        f" seconds={time.perf_counter() - started:.2f}"
+    )
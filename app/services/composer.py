@@ -1,21 +1,32 @@
 import asyncio
+import hashlib
 import time
-from collections.abc import Awaitable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
 import structlog
 
-from app.api.schemas import DescribeRequest, DescribeResponse, Warning
-from app.cache.store import CacheStore
+from app.api.schemas import DescribeRequest, DescribeResponse, Location, Warning
+from app.cache.backend import CacheBackend
+from app.cache.negative import CachedUpstreamError, negative_outcome
+from app.config import settings
 from app.modules import context, describer, geocoder, landcover, mission
 from app.utils.circuit_breaker import CircuitBreaker
 from app.utils.metrics import (
+    describer_starts,
     description_requests_total,
     external_api_duration,
     external_api_requests,
 )
+from app.utils.singleflight import SingleFlight
+from app.utils.token_bucket import RateLimitQueueFullError
 
 logger = structlog.get_logger()
 
+# 동일 DescribeRequest 동시 요청은 하나의 파이프라인 실행을 공유
+_flight = SingleFlight("compose")
+
 # Circuit breakers per external service (5 failures → 30s cooldown)
 _breakers = {
     "geocoder": CircuitBreaker("geocoder"),
@@ -26,6 +37,16 @@ _breakers = {
 }
 
 
+# 스트리밍 모드에서 모듈 이름 → SSE 이벤트 이름 매핑
+STREAM_EVENTS = {
+    "geocoder": "location",
+    "landcover": "land_cover",
+    "mission": "mission",
+    "context": "context",
+    "describer": "description",
+}
+
+
 async def get_breaker_statuses() -> list[dict]:
     return [await cb.get_status() for cb in _breakers.values()]
 
@@ -42,6 +63,11 @@ async def _safe_call(name: str, coro: Awaitable, warnings: list[Warning]):
         external_api_requests.labels(service=name, status="success").inc()
         external_api_duration.labels(service=name).observe(time.monotonic() - t0)
         return result
+    except (CachedUpstreamError, RateLimitQueueFullError) as e:
+        # 부정 캐시에서 재현된 실패·속도 제한 대기열 초과: 업스트림을 호출하지 않았으므로
+        # breaker에 집계하지 않음
+        warnings.append(Warning(module=name, error=str(e)))
+        return None
     except Exception as e:
         await cb.record_failure()
         external_api_requests.labels(service=name, status="error").inc()
@@ -51,64 +77,223 @@ async def _safe_call(name: str, coro: Awaitable, warnings: list[Warning]):
         return None
 
 
-async def compose_description(request: DescribeRequest, cache: CacheStore) -> DescribeResponse:
-    warnings: list[Warning] = []
-    lon, lat = request.coordinates
-    t_start = time.monotonic()
-    status = "error"
-    try:
-        # Phase 1: Geocoder + LandCover 병렬 실행 (Describer의 입력이 됨)
-        t_phase1 = time.monotonic()
-        geo_task = asyncio.create_task(
-            _safe_call("geocoder", geocoder.geocode(lon, lat, cache), warnings)
-        )
-        lc_task = asyncio.create_task(
-            _safe_call("landcover", landcover.get_land_cover(lon, lat, cache), warnings)
-        )
-        mission_task = asyncio.create_task(
-            _safe_call("mission", mission.get_mission_metadata(request.stac_id, cache), warnings)
-        )
-        location, land_cover_result, mission_result = await asyncio.gather(
-            geo_task,
-            lc_task,
-            mission_task,
+def _request_key(request: DescribeRequest) -> str:
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+async def prefetch_batch(requests: list[DescribeRequest], cache: CacheBackend) -> int:
+    """Warm the cache's L1 with every module key the batch will look up.
+
+    One bulk read covers geocode/landcover/mission/describe keys; context keys depend on
+    the cached location, so they follow in a second bulk read. The per-request pipeline
+    then hits L1 instead of issuing one lookup per module per item. Returns the number of
+    keys found.
+    """
+    keys = []
+    for request in requests:
+        lon, lat = request.coordinates
+        keys += [geocoder.cache_key_for(lon, lat), landcover.cache_key_for(lon, lat)]
+        if request.stac_id:
+            keys.append(mission.cache_key_for(request.stac_id))
+        if request.cog_image_id:
+            keys.append(describer.cache_key_for(request.cog_image_id))
+    found = await cache.prefetch(keys)
+
+    context_keys = []
+    for request in requests:
+        lon, lat = request.coordinates
+        cached = found.get(geocoder.cache_key_for(lon, lat))
+        location = Location(**cached) if cached and not negative_outcome(cached) else None
+        context_keys.append(
+            context.cache_key_for(
+                location.place_name if location else f"{lat}, {lon}",
+                request.captured_at,
+                region=location.region if location else "",
+                city=location.city if location else None,
+            )
         )
-        logger.info("phase1_complete", duration_ms=round((time.monotonic() - t_phase1) * 1000))
+    found_context = await cache.prefetch(context_keys)
+    return len(found) + len(found_context)
+
+
+async def compose_description(request: DescribeRequest, cache: CacheBackend) -> DescribeResponse:
+    result = await _flight.do(_request_key(request), lambda: _compose(request, cache))
+    # 호출자마다 warnings/saved를 수정하므로 공유 결과의 사본을 반환
+    return result.model_copy(deep=True)
+
+
+async def stream_description(
+    request: DescribeRequest, cache: CacheBackend
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ``(module, result)`` as each module resolves, then ``("summary", response)``.
+
+    스트리밍 호출자는 모듈별 이벤트가 필요하므로 요청 단위 single-flight는 적용하지 않는다.
+    """
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    task = asyncio.create_task(
+        _compose(request, cache, on_result=lambda name, value: queue.put_nowait((name, value)))
+    )
+    task.add_done_callback(lambda _t: queue.put_nowait(("summary", None)))
+    try:
+        while True:
+            name, value = await queue.get()
+            if name == "summary":
+                yield name, task.result()
+                return
+            yield name, value
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@dataclass(frozen=True)
+class _Stage:
+    """DAG 노드: deps가 모두 끝나면 시작하고, 자신의 timeout과 요청 잔여 예산 중 짧은 쪽이 마감."""
 
-        # Phase 2: Describer + Context 병렬 실행 (Phase 1 결과 활용)
-        place_name = location.place_name if location else f"{lat}, {lon}"
+    deps: tuple[str, ...]
+    timeout_setting: str
+    call: Callable[[dict[str, Any]], Awaitable]
+    # 설정값(초)이 0보다 크면 deps를 그 시간까지만 기다리고 준비된 입력만으로 시작
+    speculate_setting: str | None = None
+
+
+def _build_stages(
+    request: DescribeRequest, cache: CacheBackend, image: Awaitable[bytes] | None
+) -> dict[str, _Stage]:
+    lon, lat = request.coordinates
+
+    def _place_name(r: dict[str, Any]) -> str:
+        location = r.get("geocoder")
+        return location.place_name if location else f"{lat}, {lon}"
+
+    def _describe(r: dict[str, Any]) -> Awaitable:
+        land_cover_result = r.get("landcover")
         lc_summary = land_cover_result.summary if land_cover_result else "정보 없음"
+        return describer.describe_image(
+            request.thumbnail,
+            _place_name(r),
+            request.captured_at,
+            lc_summary,
+            cache,
+            request.cog_image_id,
+            request.bbox,
+            image=image,
+            # 추측 시작: deps 결과가 results에 아직 없음
+            speculative=not {"geocoder", "landcover"} <= r.keys(),
+        )
 
-        t_phase2 = time.monotonic()
-        desc_task = asyncio.create_task(
-            _safe_call(
-                "describer",
-                describer.describe_image(
-                    request.thumbnail,
-                    place_name,
-                    request.captured_at,
-                    lc_summary,
-                    cache,
-                    request.cog_image_id,
-                    request.bbox,
-                ),
-                warnings,
-            )
+    def _context(r: dict[str, Any]) -> Awaitable:
+        location = r.get("geocoder")
+        return context.research_context(
+            _place_name(r),
+            request.captured_at,
+            cache,
+            region=location.region if location else "",
+            city=location.city if location else None,
         )
-        region = location.region if location else ""
-        city = location.city if location else None
-        ctx_task = asyncio.create_task(
-            _safe_call(
-                "context",
-                context.research_context(
-                    place_name, request.captured_at, cache, region=region, city=city
-                ),
-                warnings,
+
+    # dict 순서 = 위상 정렬 순서 (의존 대상이 먼저 정의되어야 함)
+    return {
+        "geocoder": _Stage((), "timeout_geocoder", lambda r: geocoder.geocode(lon, lat, cache)),
+        "landcover": _Stage(
+            (), "timeout_landcover", lambda r: landcover.get_land_cover(lon, lat, cache)
+        ),
+        "mission": _Stage(
+            (), "timeout_mission", lambda r: mission.get_mission_metadata(request.stac_id, cache)
+        ),
+        "describer": _Stage(
+            ("geocoder", "landcover"),
+            "timeout_describer",
+            _describe,
+            speculate_setting="describer_speculate_after",
+        ),
+        "context": _Stage(("geocoder",), "timeout_context", _context),
+    }
+
+
+def _request_budget() -> float:
+    """Composer 전체 예산: 저장/직렬화 여유분을 남겨 apply_timeout(504)보다 먼저 끝나도록 함."""
+    budget = settings.request_timeout - settings.compose_deadline_margin
+    return budget if budget > 0 else settings.request_timeout
+
+
+async def _prepare_image(thumbnail: str) -> bytes:
+    return await describer.prepare_image(thumbnail)
+
+
+async def _description_cached(request: DescribeRequest, cache: CacheBackend) -> bool:
+    """Whether the describer will answer from cache (including a cached failure).
+
+    Uses ``prefetch``: the describer's own lookup then hits L1 and is counted there.
+    """
+    if not request.cog_image_id:
+        return False
+    key = describer.cache_key_for(request.cog_image_id)
+    return bool(await cache.prefetch([key]))
+
+
+async def _with_deadline(coro: Awaitable, deadline: float):
+    budget = deadline - asyncio.get_running_loop().time()
+    try:
+        async with asyncio.timeout_at(deadline):
+            return await coro
+    except TimeoutError:
+        raise TimeoutError(f"Deadline exceeded ({max(0.0, budget):.1f}s budget)") from None
+
+
+async def _compose(
+    request: DescribeRequest,
+    cache: CacheBackend,
+    on_result: Callable[[str, Any], None] | None = None,
+) -> DescribeResponse:
+    warnings: list[Warning] = []
+    results: dict[str, Any] = {}
+    loop = asyncio.get_running_loop()
+    request_deadline = loop.time() + _request_budget()
+    # 썸네일 다운로드/디코드/리사이즈는 phase 1 결과와 무관하므로 요청 도착 즉시 시작.
+    # 설명이 이미 캐시되어 있으면 쓰지 않을 이미지이므로 준비하지 않음
+    image_task = None
+    if not await _description_cached(request, cache):
+        image_task = asyncio.create_task(_prepare_image(request.thumbnail))
+    stages = _build_stages(request, cache, image_task)
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def _run(name: str, stage: _Stage):
+        if stage.deps:
+            speculate_after = None
+            if stage.speculate_setting:
+                speculate_after = getattr(settings, stage.speculate_setting) or None
+            # gather 대신 wait: 하위 노드 취소가 공유 상위 태스크로 전파되지 않도록
+            _, pending = await asyncio.wait(
+                [tasks[dep] for dep in stage.deps], timeout=speculate_after
             )
-        )
-        desc_result, context_result = await asyncio.gather(desc_task, ctx_task)
-        logger.info("phase2_complete", duration_ms=round((time.monotonic() - t_phase2) * 1000))
+            if pending:
+                describer_starts.labels(mode="speculative").inc()
+                logger.info(
+                    "speculative_start",
+                    module=name,
+                    pending=[dep for dep in stage.deps if tasks[dep] in pending],
+                )
+            elif stage.speculate_setting:
+                describer_starts.labels(mode="full").inc()
+        t0 = loop.time()
+        deadline = min(request_deadline, t0 + getattr(settings, stage.timeout_setting))
+        result = await _safe_call(name, _with_deadline(stage.call(results), deadline), warnings)
+        results[name] = result
+        logger.info("module_complete", module=name, duration_ms=round((loop.time() - t0) * 1000))
+        if on_result is not None:
+            on_result(name, result)
+        return result
+
+    t_start = time.monotonic()
+    status = "error"
+    try:
+        for name, stage in stages.items():
+            tasks[name] = asyncio.create_task(_run(name, stage))
+        await asyncio.wait(tasks.values())
 
+        # 취소 등으로 결과를 기록하지 못한 단계는 None으로 취급
+        desc_result = results.get("describer")
         if desc_result is not None:
             description, cached = desc_result
         else:
@@ -120,12 +305,19 @@ async def compose_description(request: DescribeRequest, cache: CacheStore) -> De
 
         return DescribeResponse(
             description=description,
-            location=location,
-            land_cover=land_cover_result,
-            context=context_result,
-            mission=mission_result,
+            location=results.get("geocoder"),
+            land_cover=results.get("landcover"),
+            context=results.get("context"),
+            mission=results.get("mission"),
             warnings=warnings,
             cached=cached,
         )
     finally:
+        for task in tasks.values():
+            task.cancel()
+        if image_task is not None:
+            image_task.cancel()
+            # describer 실패 등으로 아무도 기다리지 않은 준비 실패를 소비
+            if image_task.done() and not image_task.cancelled():
+                image_task.exception()
         description_requests_total.labels(status=status).inc()
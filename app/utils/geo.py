@@ -0,0 +1,33 @@
+"""GeoJSON polygon helpers shared by the offline geocoder and cache prewarming.
+
+Rings are flat ``[x0, y0, x1, y1, ...]`` coordinate lists (lon/lat), which keeps large
+boundary sets compact in memory and in the serialized offline index.
+"""
+
+
+def polygon_rings(geometry: dict) -> list[list[float]]:
+    """Flat rings (outer rings and holes) of a Polygon/MultiPolygon; [] for other types."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [
+        [coord for point in ring for coord in point[:2]] for polygon in polygons for ring in polygon
+    ]
+
+
+def in_rings(x: float, y: float, rings: list[list[float]]) -> bool:
+    """Even-odd rule over every ring (outer rings and holes) of a boundary."""
+    inside = False
+    for ring in rings:
+        n = len(ring) // 2
+        j = n - 1
+        for i in range(n):
+            xi, yi = ring[2 * i], ring[2 * i + 1]
+            xj, yj = ring[2 * j], ring[2 * j + 1]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
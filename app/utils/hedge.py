@@ -0,0 +1,136 @@
+"""Hedged requests: fire a backup request when the primary is slower than the observed p95."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import structlog
+
+from app.config import settings
+from app.utils.metrics import hedged_requests, upstream_request_duration
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class HedgeBudget:
+    """서비스별 hedge 예산: primary 요청마다 ratio만큼 토큰이 쌓이고 hedge 1회에 1토큰 소모.
+
+    장기적으로 hedge 요청 수가 primary 요청 수의 ratio 배를 넘지 않아 업스트림 부하가 제한된다.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+_budgets: dict[str, HedgeBudget] = {}
+
+
+def _get_budget(service: str) -> HedgeBudget:
+    budget = _budgets.get(service)
+    if budget is None:
+        budget = _budgets[service] = HedgeBudget(settings.hedge_budget_ratio)
+    return budget
+
+
+async def observe_upstream(service: str, request: Awaitable[T]) -> T:
+    """Await one upstream HTTP request and record its duration for ``hedge_delay``.
+
+    Wrap only the request itself: cache hits and rate-limiter waits would pull the p95
+    down and make every miss hedge almost immediately. Cancelled requests (a losing
+    hedge) are not recorded.
+    """
+    started = time.monotonic()
+    try:
+        result = await request
+    except Exception:
+        upstream_request_duration.labels(service=service).observe(time.monotonic() - started)
+        raise
+    upstream_request_duration.labels(service=service).observe(time.monotonic() - started)
+    return result
+
+
+def observed_p95(service: str) -> float | None:
+    """Return the p95 upper bucket bound of ``upstream_request_duration`` for a service.
+
+    Returns None until ``settings.hedge_min_samples`` observations have been recorded.
+    """
+    buckets: list[tuple[float, float]] = []
+    for metric in upstream_request_duration.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_bucket") and sample.labels.get("service") == service:
+                buckets.append((float(sample.labels["le"]), sample.value))
+    if not buckets:
+        return None
+    buckets.sort()
+    total = buckets[-1][1]
+    if total < settings.hedge_min_samples:
+        return None
+    for upper, cumulative in buckets:
+        if cumulative >= total * 0.95:
+            return upper if upper != float("inf") else None
+    return None
+
+
+def hedge_delay(service: str) -> float:
+    p95 = observed_p95(service)
+    return p95 if p95 is not None else settings.hedge_default_delay
+
+
+async def hedged(
+    service: str,
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]] | None = None,
+) -> T:
+    """Run ``primary``; if it is still pending after the p95 delay, also run ``hedge``.
+
+    The first successful result wins and the other request is cancelled. If one request
+    fails the other is still awaited; only when both fail is the primary's error raised.
+    Hedging is skipped when disabled, when no ``hedge`` is given, or when the service's
+    hedge budget is exhausted.
+    """
+    if not settings.hedging_enabled or hedge is None:
+        return await primary()
+
+    budget = _get_budget(service)
+    budget.deposit()
+    first = asyncio.ensure_future(primary())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay(service))
+        if done:
+            return first.result()
+        if not budget.withdraw():
+            hedged_requests.labels(service=service, outcome="budget_exhausted").inc()
+            return await first
+
+        hedged_requests.labels(service=service, outcome="sent").inc()
+        logger.info("hedge_request_sent", service=service)
+        second = asyncio.ensure_future(hedge())
+        tasks.append(second)
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        hedged_requests.labels(service=service, outcome="won").inc()
+                    return task.result()
+        return first.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
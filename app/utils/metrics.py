@@ -9,6 +9,12 @@ description_requests_total = Counter(
     ["status"],
 )
 
+describer_starts = Counter(
+    "describer_starts_total",
+    "Describer starts (full=all inputs ready, speculative=started before geocode/landcover)",
+    ["mode"],
+)
+
 # External API call metrics
 external_api_requests = Counter(
     "external_api_requests_total",
@@ -22,6 +28,52 @@ external_api_duration = Histogram(
     ["service"],
 )
 
+upstream_request_duration = Histogram(
+    "upstream_request_duration_seconds",
+    "Single upstream HTTP request duration (no cache hits, retry backoff or rate-limit waits)",
+    ["service"],
+)
+
+hedged_requests = Counter(
+    "hedged_requests_total",
+    "Hedged upstream requests (sent, won by the hedge, skipped for exhausted budget)",
+    ["service", "outcome"],
+)
+
+# Upstream rate limiter metrics (token bucket per endpoint)
+rate_limiter_queue_depth = Gauge(
+    "rate_limiter_queue_depth",
+    "Callers waiting for an upstream send slot",
+    ["limiter"],
+)
+
+rate_limiter_wait = Histogram(
+    "rate_limiter_wait_seconds",
+    "Time spent waiting for an upstream send slot",
+    ["limiter"],
+    buckets=(0.005, 0.05, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0),
+)
+
+rate_limiter_rejected = Counter(
+    "rate_limiter_rejected_total",
+    "Upstream requests rejected because the limiter's wait queue was full",
+    ["limiter"],
+)
+
+# Offline geocoder metrics
+geocoder_offline_lookups = Counter(
+    "geocoder_offline_lookups_total",
+    "Offline reverse geocoder lookups (resolved locally, or unresolved and sent to Nominatim)",
+    ["outcome"],
+)
+
+geocode_bulk_points = Counter(
+    "geocode_bulk_points_total",
+    "Points in bulk geocode requests by where their result came from "
+    "(offline, cache, miss = first point of an uncached cell, duplicate = shared a cell)",
+    ["source"],
+)
+
 # Cache metrics
 cache_hits = Counter(
     "cache_hits_total",
@@ -29,12 +81,66 @@ cache_hits = Counter(
     ["module"],
 )
 
+cache_l1_hits = Counter(
+    "cache_l1_hits_total",
+    "Cache hits served from the in-memory L1 tier (subset of cache_hits_total)",
+    ["module"],
+)
+
 cache_misses = Counter(
     "cache_misses_total",
     "Total cache misses",
     ["module"],
 )
 
+cache_stale_hits = Counter(
+    "cache_stale_hits_total",
+    "Cache hits served past the soft TTL (subset of cache_hits_total)",
+    ["module"],
+)
+
+cache_negative_hits = Counter(
+    "cache_negative_hits_total",
+    "Cache hits on negative entries for failed lookups (subset of cache_hits_total)",
+    ["module", "outcome"],
+)
+
+cache_refreshes = Counter(
+    "cache_refreshes_total",
+    "Background stale-while-revalidate refreshes",
+    ["module", "outcome"],
+)
+
+cache_write_batch_size = Histogram(
+    "cache_write_batch_size",
+    "Number of cache writes committed per group-commit transaction",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+cache_bytes = Gauge(
+    "cache_bytes",
+    "Approximate cache database size by module (key + value bytes)",
+    ["module"],
+)
+
+cache_evictions = Counter(
+    "cache_evictions_total",
+    "Cache rows evicted to stay within CACHE_MAX_BYTES / CACHE_MAX_ENTRIES",
+    ["module"],
+)
+
+cache_spatial_lookups = Counter(
+    "cache_spatial_lookups_total",
+    "Point-keyed cache lookups by match (exact key, nearest neighbour within radius, miss)",
+    ["module", "match"],
+)
+
+cache_invalidations = Counter(
+    "cache_invalidations_total",
+    "Cache entries deleted by prefix invalidation",
+    ["module"],
+)
+
 cache_cleanup_total = Counter(
     "cache_cleanup_total",
     "Total expired cache entries removed",
@@ -46,6 +152,13 @@ cache_errors = Counter(
     ["operation"],
 )
 
+# Single-flight metrics
+singleflight_coalesced = Counter(
+    "singleflight_coalesced_total",
+    "Callers that joined an identical in-flight call instead of running their own",
+    ["scope"],
+)
+
 # Circuit breaker metrics (0=closed, 1=open, 2=half-open)
 circuit_breaker_state = Gauge(
     "circuit_breaker_state",
@@ -53,6 +166,17 @@ circuit_breaker_state = Gauge(
     ["name"],
 )
 
+# Gemini client metrics
+gemini_calls_in_flight = Gauge(
+    "gemini_calls_in_flight",
+    "Number of Gemini API calls currently in flight",
+)
+
+gemini_calls_queued = Gauge(
+    "gemini_calls_queued",
+    "Number of Gemini API calls waiting for a concurrency slot",
+)
+
 # Batch job metrics
 active_batch_jobs = Gauge(
     "active_batch_jobs",
@@ -0,0 +1,41 @@
+"""In-process single-flight: concurrent callers with the same key share one execution."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.utils.metrics import singleflight_coalesced
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """동일 key에 대한 동시 호출을 하나의 in-flight 태스크로 합친다.
+
+    결과(또는 예외)는 대기 중인 모든 호출자에게 전달된다. 한 호출자가 취소되어도
+    공유 태스크는 shield로 보호되어 나머지 호출자와 캐시 기록을 위해 계속 실행된다.
+    """
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            singleflight_coalesced.labels(scope=self.scope).inc()
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 호출자가 취소된 경우에도 "exception was never retrieved" 경고를 막는다
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,61 @@
+"""Token-bucket rate limiter for upstream send slots, with a bounded FIFO wait queue."""
+
+import asyncio
+
+from app.utils.metrics import rate_limiter_queue_depth, rate_limiter_rejected, rate_limiter_wait
+
+
+class RateLimitQueueFullError(Exception):
+    """Too many callers are already waiting for a send slot of this limiter."""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} rate limiter queue is full")
+        self.name = name
+
+
+class TokenBucket:
+    """``rate`` tokens per second, up to ``burst`` saved; one token per upstream request.
+
+    ``acquire`` only reserves the send slot: callers hold nothing while the request and
+    its retries run, so a slow response does not delay the next send. Waiters are served
+    in arrival order (``asyncio.Lock`` is FIFO); once ``max_waiters`` are queued, further
+    callers get ``RateLimitQueueFullError`` instead of an unbounded wait.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = 1, max_waiters: int = 64):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_waiters = max_waiters
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+        self._waiters = 0
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting."""
+        if self._waiters >= self.max_waiters:
+            rate_limiter_rejected.labels(limiter=self.name).inc()
+            raise RateLimitQueueFullError(self.name)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self._waiters += 1
+        rate_limiter_queue_depth.labels(limiter=self.name).set(self._waiters)
+        try:
+            async with self._lock:
+                self._refill(loop.time())
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill(loop.time())
+                self._tokens -= 1
+        finally:
+            self._waiters -= 1
+            rate_limiter_queue_depth.labels(limiter=self.name).set(self._waiters)
+        waited = loop.time() - started
+        rate_limiter_wait.labels(limiter=self.name).observe(waited)
+        return waited
@@ -0,0 +1,110 @@
+"""캐시 값 인코딩 마이크로 벤치마크: 기존 JSON TEXT vs 코덱 바이트 + (orjson) + 압축.
+
+실행:
+    python -m benchmarks.cache_codec [--iterations 20000]
+
+모듈별 실제 응답 형태를 본뜬 샘플로 인코드/디코드 비용(µs)과 저장 크기를 비교한다.
+"""
+
+import argparse
+import json
+import time
+
+from app.cache import codec
+from app.config import settings
+
+_SAMPLES = {
+    "geocode": {
+        "country": "대한민국",
+        "country_code": "kr",
+        "region": "서울특별시",
+        "city": "중구",
+        "place_name": "태평로1가, 중구, 서울특별시, 대한민국",
+        "lat": 37.566,
+        "lon": 126.978,
+    },
+    "landcover": {
+        "classes": [
+            {"type": t, "label": label, "percentage": p}
+            for t, label, p in [
+                ("residential", "주거지역", 38.5),
+                ("commercial", "상업지역", 21.2),
+                ("park", "공원", 12.8),
+                ("forest", "산림", 10.4),
+                ("grass", "초지", 7.1),
+                ("industrial", "공업지역", 5.6),
+                ("water", "수역", 4.4),
+            ]
+        ],
+        "summary": "주거지역 38.5%, 상업지역 21.2%, 공원 12.8%, 산림 10.4%, 초지 7.1%",
+    },
+    "context": {
+        "events": [
+            {
+                "title": f"서울특별시 중구 {topic} 관련 소식 - 도심 일대 행사 및 교통 통제 안내",
+                "date": "2024-05",
+                "source_url": f"https://duckduckgo.com/c/{topic}",
+                "relevance": "low",
+            }
+            for topic in ("축제", "재개발", "교통", "관광", "문화재")
+        ],
+        "summary": "서울특별시 중구 2024-05 관련 정보 5건 발견.",
+    },
+    "describe": {
+        "description": (
+            "서울 도심부를 촬영한 Sentinel-2 위성영상으로, 중앙에 고밀도 주거지와 상업지역이 "
+            "격자형 도로망을 따라 분포한다. 북쪽에는 산림으로 덮인 구릉지가 있고 남쪽으로 "
+            "한강이 동서 방향으로 흐르며, 강변을 따라 공원과 녹지가 길게 이어진다. "
+        )
+        * 3
+    },
+}
+
+
+def _legacy_encode(value: dict) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _legacy_decode(stored: str) -> dict:
+    return json.loads(stored)
+
+
+def _new_encode(value: dict) -> bytes:
+    return codec.pack(codec.dumps(value))
+
+
+def _new_decode(stored: bytes) -> dict:
+    return codec.loads(codec.unpack(stored))
+
+
+def _time_us(fn, arg, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def _bench(name: str, encode, decode, iterations: int) -> None:
+    for module, value in _SAMPLES.items():
+        stored = encode(value)
+        size = len(stored.encode()) if isinstance(stored, str) else len(stored)
+        enc = _time_us(encode, value, iterations)
+        dec = _time_us(decode, stored, iterations)
+        print(f"{name:8}{module:11}{size:8d}{enc:10.2f}{dec:10.2f}")
+
+
+def main(iterations: int) -> None:
+    print(f"serializer={'orjson' if codec.orjson else 'json'} iterations={iterations}")
+    print(f"{'codec':8}{'module':11}{'bytes':>8}{'enc µs':>10}{'dec µs':>10}")
+    _bench("legacy", _legacy_encode, _legacy_decode, iterations)
+    for mode in ("none", "zlib", "zstd"):
+        if mode == "zstd" and codec.zstandard is None:
+            continue
+        settings.cache_compression = mode
+        _bench(mode, _new_encode, _new_decode, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,107 @@
+"""캐시 샤딩 벤치마크: 단일 DB vs 모듈별 샤드 vs 해시 샤드, 읽기/쓰기가 섞인 동시 부하.
+
+실행:
+    python -m benchmarks.cache_sharding [--ops 20000] [--concurrency 64] [--shards 4]
+
+부하 구성(운영 트래픽 비율을 단순화): 자주 조회되는 geocode 키 읽기 70%, 자주 쓰는 context
+쓰기 20%, 큰 값(약 20KB)을 쓰는 describe 10%. 쓰기가 같은 쓰기 연결·커밋을 공유하는 단일
+DB에서 geocode 읽기 지연이 얼마나 늘어나는지 보려는 것이므로 L1 메모리 캐시는 끈다.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.cache.sharded import ShardedCacheStore
+from app.cache.store import CacheStore
+from app.config import settings
+
+_GEOCODE = {
+    "country": "대한민국",
+    "country_code": "kr",
+    "region": "서울특별시",
+    "city": "중구",
+    "place_name": "서울특별시 중구 태평로1가",
+    "lat": 37.566,
+    "lon": 126.978,
+}
+_CONTEXT = {"summary": "서울 도심의 계절 변화와 최근 개발 현황 " * 10, "sources": []}
+_DESCRIBE = {"description": "위성 영상 설명 " * 2000}
+_HOT_KEYS = 2000
+
+
+def _operations(ops: int, seed: int = 7) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    plan = []
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.7:
+            plan.append(("read", f"geocode:{rng.randrange(_HOT_KEYS)}:0"))
+        elif roll < 0.9:
+            plan.append(("context", f"context:{i}:2025-01"))
+        else:
+            plan.append(("describe", f"describe:cog-{i}"))
+    return plan
+
+
+async def _run(store, plan: list[tuple[str, str]], concurrency: int) -> tuple[float, float, float]:
+    await store.set_many({f"geocode:{i}:0": _GEOCODE for i in range(_HOT_KEYS)})
+    sem = asyncio.Semaphore(concurrency)
+    read_latencies: list[float] = []
+
+    async def _one(kind: str, key: str) -> None:
+        async with sem:
+            if kind == "read":
+                t0 = time.perf_counter()
+                await store.get(key)
+                read_latencies.append(time.perf_counter() - t0)
+            elif kind == "context":
+                await store.set(key, _CONTEXT, ttl_days=7)
+            else:
+                await store.set(key, _DESCRIBE, ttl_days=30)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_one(kind, key) for kind, key in plan))
+    rate = len(plan) / (time.perf_counter() - t0)
+    p50 = statistics.median(read_latencies) * 1000
+    p95 = statistics.quantiles(read_latencies, n=20)[-1] * 1000
+    return rate, p50, p95
+
+
+async def main(ops: int, concurrency: int, shards: int) -> None:
+    settings.cache_l1_max_entries = 0
+    plan = _operations(ops)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        layouts = {
+            "none": lambda d: CacheStore(str(d / "cache.db")),
+            "module": lambda d: ShardedCacheStore(str(d / "cache.db"), "module"),
+            "hash": lambda d: ShardedCacheStore(str(d / "cache.db"), "hash", count=shards),
+        }
+        for name, build in layouts.items():
+            directory = Path(tmp) / name
+            directory.mkdir()
+            store = build(directory)
+            await store.init()
+            try:
+                results[name] = await _run(store, plan, concurrency)
+            finally:
+                await store.close()
+
+    print(f"ops={ops} concurrency={concurrency} hash_shards={shards}")
+    print(f"{'':8}{'ops/s':>10}{'read p50 ms':>14}{'read p95 ms':>14}")
+    for name, (rate, p50, p95) in results.items():
+        print(f"{name:8}{rate:10.0f}{p50:14.2f}{p95:14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--shards", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.concurrency, args.shards))
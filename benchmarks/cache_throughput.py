@@ -0,0 +1,117 @@
+"""CacheStore get/set 처리량 벤치마크: 기존 단일 연결 방식 vs WAL + 읽기 풀 + group commit.
+
+실행:
+    python -m benchmarks.cache_throughput [--ops 10000] [--concurrency 32]
+
+기준선(legacy)은 변경 전 CacheStore와 동일하게 단일 aiosqlite 연결, 기본 rollback 저널,
+쓰기마다 commit 하는 방식을 재현한다. L1 메모리 캐시는 SQLite 경로만 측정하도록 끈다.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from app.cache.store import CacheStore
+from app.config import settings
+
+_SAMPLE = {
+    "country": "대한민국",
+    "country_code": "kr",
+    "region": "서울특별시",
+    "city": "중구",
+    "place_name": "서울특별시 중구 태평로1가",
+    "lat": 37.566,
+    "lon": 126.978,
+}
+
+
+class _LegacyStore:
+    """변경 전 CacheStore의 get/set 경로 재현 (단일 연결, 쓰기마다 commit)."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._db: aiosqlite.Connection | None = None
+
+    async def init(self) -> None:
+        self._db = await aiosqlite.connect(self._path)
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL)"
+        )
+        await self._db.commit()
+
+    async def get(self, key: str) -> dict | None:
+        async with self._db.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def set(self, key: str, value: dict) -> None:
+        await self._db.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), time.time() + 3600),
+        )
+        await self._db.commit()
+
+    async def close(self) -> None:
+        await self._db.close()
+
+
+async def _run(store, ops: int, concurrency: int) -> tuple[float, float, float]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(coro):
+        async with sem:
+            await coro
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_bounded(store.set(f"geocode:{i}:0", _SAMPLE)) for i in range(ops)))
+    set_rate = ops / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_bounded(store.get(f"geocode:{i % ops}:0")) for i in range(ops)))
+    get_rate = ops / (time.perf_counter() - t0)
+
+    # 읽기와 쓰기가 섞인 부하: 읽기가 쓰기 commit 뒤에 줄서는지 확인
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _bounded(store.set(f"geocode:{i}:1", _SAMPLE) if i % 2 else store.get(f"geocode:{i}:0"))
+            for i in range(ops)
+        )
+    )
+    mixed_rate = ops / (time.perf_counter() - t0)
+    return set_rate, get_rate, mixed_rate
+
+
+async def main(ops: int, concurrency: int) -> None:
+    settings.cache_l1_max_entries = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = _LegacyStore(str(Path(tmp) / "legacy.db"))
+        await legacy.init()
+        legacy_rates = await _run(legacy, ops, concurrency)
+        await legacy.close()
+
+        store = CacheStore(str(Path(tmp) / "wal.db"))
+        await store.init()
+        new_rates = await _run(store, ops, concurrency)
+        await store.close()
+
+    print(f"ops={ops} concurrency={concurrency}")
+    print(f"{'':8}{'set ops/s':>12}{'get ops/s':>12}{'mixed ops/s':>14}")
+    for name, (set_rate, get_rate, mixed_rate) in (("legacy", legacy_rates), ("wal", new_rates)):
+        print(f"{name:8}{set_rate:12.0f}{get_rate:12.0f}{mixed_rate:14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.concurrency))
@@ -0,0 +1,130 @@
+"""오프라인 역지오코딩 벤치마크: 인덱스 생성·로드 시간과 조회 지연(µs).
+
+실행:
+    python -m benchmarks.offline_geocoder [--places 100000] [--lookups 20000]
+
+합성 데이터: 위도 -60~70도 범위를 2도 격자로 나눈 경계(경계마다 꼭짓점 64개, 실제 행정구역
+경계처럼 조회 시 점-다각형 판정 비용이 들도록)와 무작위 인구 밀집지. 비교 기준은 인덱스 없이
+모든 경계와 장소를 순회하는 선형 탐색이다(조회 수를 줄여 측정).
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.modules.offline_geocoder import (
+    OfflineGeocoder,
+    _unit_vector,
+    build_index,
+    save_index,
+)
+from app.utils.geo import in_rings
+
+_VERTICES = 64
+
+
+def _boundary(x: float, y: float, size: float) -> dict:
+    # 정사각형 둘레를 따라 꼭짓점을 촘촘히 배치
+    ring = []
+    for i in range(_VERTICES):
+        t = 4 * i / _VERTICES
+        side, frac = int(t), t - int(t)
+        if side == 0:
+            ring.append([x + frac * size, y])
+        elif side == 1:
+            ring.append([x + size, y + frac * size])
+        elif side == 2:
+            ring.append([x + size - frac * size, y + size])
+        else:
+            ring.append([x, y + size - frac * size])
+    ring.append(ring[0])
+    return {
+        "type": "Feature",
+        "properties": {"country": f"C{int(x)}", "country_code": "xx", "region": f"R{int(y)}"},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+def _dataset(places: int, rng: random.Random) -> tuple[dict, dict]:
+    boundaries = [_boundary(x, y, 2.0) for x in range(-180, 180, 2) for y in range(-60, 70, 2)]
+    points = [
+        {
+            "type": "Feature",
+            "properties": {"name": f"P{i}"},
+            "geometry": {
+                "type": "Point",
+                "coordinates": [rng.uniform(-180, 180), rng.uniform(-60, 70)],
+            },
+        }
+        for i in range(places)
+    ]
+    return {"features": boundaries}, {"features": points}
+
+
+def _linear_lookup(regions: list[dict], vectors: list[tuple], lon: float, lat: float) -> tuple:
+    region = next((r for r in regions if in_rings(lon, lat, r["rings"])), None)
+    target = _unit_vector(lon, lat)
+    nearest = min(
+        range(len(vectors)),
+        key=lambda i: sum((a - b) ** 2 for a, b in zip(vectors[i], target, strict=True)),
+    )
+    return region, nearest
+
+
+def _timed(fn, queries) -> list[float]:
+    latencies = []
+    for lon, lat in queries:
+        t0 = time.perf_counter()
+        fn(lon, lat)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+    return latencies
+
+
+def main(places: int, lookups: int) -> None:
+    rng = random.Random(42)
+    boundaries, points = _dataset(places, rng)
+
+    t0 = time.perf_counter()
+    index = build_index(boundaries, points)
+    build_s = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "geocoder.idx.json.gz"
+        save_index(index, path)
+        size_mb = path.stat().st_size / 1e6
+        t0 = time.perf_counter()
+        geocoder = OfflineGeocoder.load(path)
+        load_s = time.perf_counter() - t0
+
+    queries = [(rng.uniform(-180, 180), rng.uniform(-60, 70)) for _ in range(lookups)]
+    indexed = _timed(geocoder.lookup, queries)
+    vectors = [
+        _unit_vector(lon, lat)
+        for lon, lat in zip(index["places"]["lon"], index["places"]["lat"], strict=True)
+    ]
+    linear = _timed(
+        lambda lon, lat: _linear_lookup(index["regions"], vectors, lon, lat),
+        queries[: max(2, lookups // 200)],
+    )
+
+    print(
+        f"boundaries={len(index['regions'])} places={places} file={size_mb:.1f}MB"
+        f" build={build_s:.1f}s load={load_s:.1f}s"
+    )
+    print(f"{'':8}{'lookups':>10}{'p50 µs':>10}{'p95 µs':>10}{'lookups/s':>12}")
+    for name, latencies in (("indexed", indexed), ("linear", linear)):
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else p50
+        rate = len(latencies) / (sum(latencies) / 1e6)
+        print(f"{name:8}{len(latencies):10}{p50:10.0f}{p95:10.0f}{rate:12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.places, args.lookups)
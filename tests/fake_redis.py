@@ -0,0 +1,186 @@
+"""In-process stand-in Redis server for tests (RESP2, or RESP3 after HELLO 3, on localhost).
+
+Implements the commands the cache backend uses, with key expiry, and records every
+command so tests can assert on round trips and pipelining.
+"""
+
+import asyncio
+import fnmatch
+import itertools
+import time
+
+
+class FakeRedisServer:
+    def __init__(self, password: str | None = None):
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.hashes: dict[bytes, dict[bytes, int]] = {}
+        # SCAN 커서: 키마다 처음 저장된 순서 번호 (삭제되어도 다른 키의 번호는 그대로)
+        self._seq: dict[bytes, int] = {}
+        self._counter = itertools.count(1)
+        self.commands: list[list[bytes]] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def command_names(self) -> list[str]:
+        return [c[0].decode().upper() for c in self.commands]
+
+    def _live(self, key: bytes) -> bytes | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and time.time() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        authed = self.password is None
+        resp3 = False
+        try:
+            while True:
+                cmd = await _read_command(reader)
+                if cmd is None:
+                    break
+                self.commands.append(cmd)
+                name = cmd[0].decode().upper()
+                if name == "AUTH":
+                    authed = cmd[-1].decode() == self.password
+                    reply = b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n"
+                elif name == "HELLO":
+                    if "AUTH" in (a.decode().upper() for a in cmd):
+                        authed = cmd[-1].decode() == self.password
+                    resp3 = len(cmd) > 1 and cmd[1] == b"3"
+                    if not authed:
+                        reply = b"-WRONGPASS invalid password\r\n"
+                    else:
+                        fields = {b"server": b"redis", b"proto": 3 if resp3 else 2}
+                        reply = _hash(fields, resp3)
+                elif not authed:
+                    reply = b"-NOAUTH Authentication required.\r\n"
+                else:
+                    reply = self._execute(name, cmd[1:], resp3)
+                writer.write(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _execute(self, name: str, args: list[bytes], resp3: bool) -> bytes:
+        def bulk(value: bytes | None) -> bytes:
+            if value is None:
+                return b"_\r\n" if resp3 else b"$-1\r\n"
+            return _bulk(value)
+
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name == "SELECT":
+            return b"+OK\r\n"
+        if name == "GET":
+            return bulk(self._live(args[0]))
+        if name == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(bulk(self._live(k)) for k in args)
+        if name == "SET":
+            expires_at = None
+            if len(args) >= 4 and args[2].upper() == b"PX":
+                expires_at = time.time() + int(args[3]) / 1000
+            self.data[args[0]] = (args[1], expires_at)
+            if args[0] not in self._seq:
+                self._seq[args[0]] = next(self._counter)
+            return b"+OK\r\n"
+        if name == "PTTL":
+            if self._live(args[0]) is None:
+                return b":-2\r\n"
+            expires_at = self.data[args[0]][1]
+            if expires_at is None:
+                return b":-1\r\n"
+            return b":%d\r\n" % int((expires_at - time.time()) * 1000)
+        if name == "SCAN":
+            # 커서 이후 순서 번호의 키를 최대 COUNT개씩, 남은 키가 없으면 커서 0
+            start = int(args[0])
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            count = int(args[args.index(b"COUNT") + 1]) if b"COUNT" in args else 10
+            for k in self.data:
+                self._seq.setdefault(k, next(self._counter))
+            live = sorted(
+                (k for k in list(self.data) if self._live(k) is not None and self._seq[k] >= start),
+                key=self._seq.__getitem__,
+            )
+            matched = [k for k in live if fnmatch.fnmatchcase(k.decode(), _unescape(pattern))]
+            batch = matched[:count]
+            cursor = b"%d" % (self._seq[batch[-1]] + 1) if len(matched) > count else b"0"
+            return b"*2\r\n" + _bulk(cursor) + b"*%d\r\n" % len(batch) + b"".join(map(_bulk, batch))
+        if name == "MEMORY" and args[0].upper() == b"USAGE":
+            value = self._live(args[1])
+            return bulk(None) if value is None else b":%d\r\n" % (len(args[1]) + len(value))
+        if name in ("DEL", "UNLINK"):
+            removed = sum(1 for k in args if self._live(k) is not None and self.data.pop(k))
+            return b":%d\r\n" % removed
+        if name == "HINCRBY":
+            fields = self.hashes.setdefault(args[0], {})
+            fields[args[1]] = fields.get(args[1], 0) + int(args[2])
+            return b":%d\r\n" % fields[args[1]]
+        if name == "HGETALL":
+            fields = self.hashes.get(args[0], {})
+            return _hash({f: str(v).encode() for f, v in fields.items()}, resp3)
+        if name == "FLUSHDB":
+            self.data.clear()
+            self.hashes.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+
+def _unescape(pattern: str) -> str:
+    # Redis glob 이스케이프(\x)를 fnmatch 문자 클래스([x])로 변환
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(f"[{pattern[i + 1]}]")
+            i += 2
+        else:
+            out.append(pattern[i])
+            i += 1
+    return "".join(out)
+
+
+def _hash(fields: dict[bytes, bytes | int], resp3: bool) -> bytes:
+    # RESP3는 맵(%), RESP2는 필드/값을 번갈아 담은 배열
+    parts = [b"%%%d\r\n" % len(fields) if resp3 else b"*%d\r\n" % (2 * len(fields))]
+    for field, value in fields.items():
+        parts.append(_bulk(field))
+        parts.append(b":%d\r\n" % value if isinstance(value, int) else _bulk(value))
+    return b"".join(parts)
+
+
+def _bulk(value: bytes) -> bytes:
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    count = int(line[1:-2])
+    args = []
+    for _ in range(count):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
@@ -157,6 +157,7 @@ async def test_cache_stats_endpoint(client_with_cache):
     assert "modules" in data
     assert data["entry_count"] == 0
     assert data["modules"] == {}
+    assert data["l1"]["entries"] == 0
 
 
 async def test_cache_stats_after_hit_miss(client_with_cache):
@@ -142,3 +142,40 @@ async def test_individual_failure_does_not_affect_others(batch_client, monkeypat
     assert data["total"] == 5
     assert data["succeeded"] == 4
     assert data["failed"] == 1
+
+
+async def test_batch_items_run_concurrently_and_keep_order(batch_client, monkeypatch):
+    """Items run in parallel up to the limit; results stay in input order."""
+    import app.api.routes as routes_mod
+    import app.db.supabase as db_mod
+    from app.api.schemas import DescribeResponse
+
+    max_concurrent = 0
+    current = 0
+
+    async def _slow_compose(item, cache):
+        nonlocal max_concurrent, current
+        current += 1
+        max_concurrent = max(max_concurrent, current)
+        # 앞 항목일수록 늦게 끝나도록 하여 완료 순서와 입력 순서를 다르게 함
+        await asyncio.sleep(0.05 * (4 - item.coordinates[0] + 127.0))
+        current -= 1
+        return DescribeResponse(description=f"item-{item.coordinates[0]}")
+
+    async def _noop_save(**kwargs):
+        return True
+
+    monkeypatch.setattr(routes_mod, "compose_description", _slow_compose)
+    monkeypatch.setattr(db_mod, "save_description", _noop_save)
+
+    items = [{"coordinates": [127.0 + i, 37.0], "thumbnail": "dGVzdA=="} for i in range(4)]
+
+    resp = await batch_client.post("/api/v1/describe/batch", json={"items": items})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["succeeded"] == 4
+    assert max_concurrent == 2
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+    assert [r["result"]["description"] for r in data["results"]] == [
+        f"item-{127.0 + i}" for i in range(4)
+    ]
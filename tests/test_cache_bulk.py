@@ -0,0 +1,172 @@
+"""Tests for bulk cache reads/writes and batch prefetching."""
+
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes import limiter as routes_limiter
+from app.api.schemas import DescribeRequest, DescribeResponse
+from app.cache.store import CacheStore
+from app.main import app
+from app.modules import context, geocoder, landcover, mission
+from app.services.composer import prefetch_batch
+
+SEOUL = {
+    "country": "대한민국",
+    "country_code": "kr",
+    "region": "서울특별시",
+    "city": "중구",
+    "place_name": "서울특별시 중구",
+    "lat": 37.566,
+    "lon": 126.978,
+}
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "cache.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def _traced(cache, coro):
+    statements = []
+    connections = [cache._db, *cache._readers]
+    for conn in connections:
+        await conn.set_trace_callback(statements.append)
+    try:
+        result = await coro
+    finally:
+        for conn in connections:
+            await conn.set_trace_callback(None)
+    return result, [sql for sql in statements if "FROM cache " in sql]
+
+
+class TestGetMany:
+    async def test_one_query_with_per_module_accounting(self, cache):
+        await cache.set_many({f"geocode:{i}:0": {"i": i} for i in range(3)})
+        await cache.set("landcover:0:0", {"v": 1})
+        cache._l1.clear()
+
+        keys = [f"geocode:{i}:0" for i in range(5)] + ["landcover:0:0", "landcover:9:9"]
+        found, queries = await _traced(cache, cache.get_many(keys))
+
+        assert found == {
+            **{f"geocode:{i}:0": {"i": i} for i in range(3)},
+            "landcover:0:0": {"v": 1},
+        }
+        assert len(queries) == 1
+        stats = (await cache.stats())["modules"]
+        assert (stats["geocode"]["hits"], stats["geocode"]["misses"]) == (3, 2)
+        assert (stats["landcover"]["hits"], stats["landcover"]["misses"]) == (1, 1)
+
+    async def test_l1_entries_skip_the_database(self, cache):
+        await cache.set("geocode:1:1", {"x": 1})
+        found, queries = await _traced(cache, cache.get_many(["geocode:1:1"]))
+        assert found == {"geocode:1:1": {"x": 1}}
+        assert queries == []
+        assert (await cache.stats())["modules"]["geocode"]["l1_hits"] == 1
+
+    async def test_expired_rows_are_misses(self, cache):
+        await cache.set("geocode:1:1", {"x": 1}, ttl_seconds=60)
+        await cache._db.execute("UPDATE cache SET expires_at = ?", (time.time() - 1,))
+        await cache._db.commit()
+        cache._l1.clear()
+        assert await cache.get_many(["geocode:1:1"]) == {}
+        assert (await cache.stats())["modules"]["geocode"]["misses"] == 1
+
+    async def test_large_key_lists_are_chunked(self, cache):
+        keys = [f"geocode:{i}:0" for i in range(1200)]
+        await cache.set_many({key: {"k": key} for key in keys})
+        cache._l1.clear()
+        found, queries = await _traced(cache, cache.get_many(keys))
+        assert len(found) == 1200
+        assert len(queries) == 3
+
+
+class TestSetMany:
+    async def test_single_commit(self, cache):
+        with patch.object(cache._db, "commit", wraps=cache._db.commit) as commit:
+            await cache.set_many({f"context:{i}:2024-01": {"i": i} for i in range(50)})
+        assert commit.await_count == 1
+        cache._l1.clear()
+        assert len(await cache.get_many([f"context:{i}:2024-01" for i in range(50)])) == 50
+        assert (await cache.stats())["modules"]["context"]["entries"] == 50
+
+
+class TestPrefetch:
+    async def test_fills_l1_without_accounting(self, cache):
+        await cache.set("mission:S2A", {"name": "S2A"})
+        cache._l1.clear()
+
+        found = await cache.prefetch(["mission:S2A", "mission:missing"])
+        assert found == {"mission:S2A": {"name": "S2A"}}
+        mission_stats = (await cache.stats())["modules"].get("mission", {})
+        assert mission_stats.get("hits", 0) == mission_stats.get("misses", 0) == 0
+
+        _, queries = await _traced(cache, cache.get("mission:S2A"))
+        assert queries == []
+        assert (await cache.stats())["modules"]["mission"]["l1_hits"] == 1
+
+    async def test_prefetch_batch_warms_every_module_key(self, cache):
+        lon, lat = SEOUL["lon"], SEOUL["lat"]
+        request = DescribeRequest(
+            thumbnail="https://example.com/a.png",
+            coordinates=[lon, lat],
+            captured_at="2025-01-15",
+            stac_id="S2A_1",
+        )
+        context_key = context.cache_key_for(
+            SEOUL["place_name"], "2025-01-15", region=SEOUL["region"], city=SEOUL["city"]
+        )
+        await cache.set_many(
+            {
+                geocoder.cache_key_for(lon, lat): SEOUL,
+                landcover.cache_key_for(lon, lat): {"classes": []},
+                mission.cache_key_for("S2A_1"): {"name": "Sentinel-2A"},
+                context_key: {"summary": "x"},
+            }
+        )
+        cache._l1.clear()
+
+        assert await prefetch_batch([request], cache) == 4
+        for key in (geocoder.cache_key_for(lon, lat), context_key):
+            assert cache._l1.get(key, time.time()) is not None
+
+
+async def test_batch_endpoint_prefetches_valid_items(tmp_path):
+    store = CacheStore(str(tmp_path / "batch.db"))
+    await store.init()
+    app.state.cache = store
+    routes_limiter.reset()
+    item = {
+        "thumbnail": "https://example.com/img.jpg",
+        "coordinates": [126.978, 37.566],
+        "captured_at": "2025-01-15",
+    }
+    try:
+        with (
+            patch("app.api.routes.prefetch_batch", new_callable=AsyncMock) as prefetch,
+            patch(
+                "app.api.routes.compose_description",
+                new_callable=AsyncMock,
+                return_value=DescribeResponse(description="ok"),
+            ),
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test",
+                headers={"X-API-Key": os.environ["API_KEY"]},
+            ) as client:
+                resp = await client.post("/api/v1/describe/batch", json={"items": [item, item]})
+    finally:
+        routes_limiter.reset()
+        await store.close()
+    assert resp.status_code == 200
+    requests, cache = prefetch.await_args.args
+    assert len(requests) == 2
+    assert cache is store
@@ -1,8 +1,11 @@
+import asyncio
 import time
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.cache.store import CacheStore
+from app.config import settings
 
 
 @pytest.fixture
@@ -51,3 +54,86 @@ class TestCleanupExpired:
 
         deleted = await cache.cleanup_expired()
         assert deleted == 5
+
+
+async def _expire_all(cache: CacheStore) -> None:
+    await cache._db.execute("UPDATE cache SET expires_at = ?", (time.time() - 100,))
+    await cache._db.commit()
+
+
+class TestIncrementalCleanup:
+    async def test_expiry_and_module_indexes_exist(self, cache):
+        rows = await cache._db.execute_fetchall(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'cache'"
+        )
+        names = {row[0] for row in rows}
+        assert {"idx_cache_expires_at", "idx_cache_module"} <= names
+
+        plan = await cache._db.execute_fetchall(
+            "EXPLAIN QUERY PLAN SELECT key FROM cache"
+            " WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        )
+        assert any("idx_cache_expires_at" in row[-1] for row in plan)
+
+    async def test_deletes_in_chunks(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 3)
+        for i in range(10):
+            await cache.set(f"geocode:{i}:0", {"v": i}, ttl_seconds=60)
+        await _expire_all(cache)
+
+        commit = AsyncMock(wraps=cache._db.commit)
+        with patch.object(cache._db, "commit", commit):
+            assert await cache.cleanup_expired() == 10
+        assert commit.await_count == 4  # 3 + 3 + 3 + 1
+
+    async def test_writes_commit_between_chunks(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 3)
+        monkeypatch.setattr(settings, "cache_write_batch_ms", 0)
+        for i in range(10):
+            await cache.set(f"geocode:{i}:0", {"v": i}, ttl_seconds=60)
+        await _expire_all(cache)
+        order = []
+        real_commit = cache._db.commit
+
+        async def _commit():
+            # 정리 청크와 group commit 모두 maintenance 잠금 안에서 커밋
+            assert cache._maintenance_lock.locked()
+            await real_commit()
+            order.append("commit")
+
+        async def _write():
+            await cache.set("geocode:new:0", {"v": 1})
+            order.append("set")
+
+        with patch.object(cache._db, "commit", _commit):
+            task = asyncio.create_task(_write())
+            assert await cache.cleanup_expired() == 10
+            await task
+        # 정리가 끝나기 전에 쓰기가 커밋됨
+        assert order.index("set") < len(order) - 1
+
+    async def test_incremental_vacuum_releases_pages(self, cache):
+        rows = await cache._db.execute_fetchall("PRAGMA auto_vacuum")
+        assert rows[0][0] == 2  # INCREMENTAL
+
+        for i in range(200):
+            await cache.set(f"context:{i}:0", {"text": str(i) * 500}, ttl_seconds=60)
+        await _expire_all(cache)
+        await cache.cleanup_expired()
+        rows = await cache._db.execute_fetchall("PRAGMA freelist_count")
+        assert rows[0][0] == 0
+
+    async def test_read_path_hands_expired_rows_to_sweeper(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 2)
+        for i in range(2):
+            await cache.set(f"geocode:{i}:0", {"v": i}, ttl_seconds=60)
+        await _expire_all(cache)
+        cache._l1.clear()
+
+        for i in range(2):
+            assert await cache.get(f"geocode:{i}:0") is None
+        assert cache._sweep_task is not None
+        await cache._sweep_task
+        rows = await cache._db.execute_fetchall("SELECT COUNT(*) FROM cache")
+        assert rows[0][0] == 0
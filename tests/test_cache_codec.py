@@ -0,0 +1,110 @@
+"""Tests for the cache value codec (codec byte + JSON, optional compression)."""
+
+import os
+import zlib
+
+import pytest
+
+from app.cache import codec
+from app.cache.store import CacheStore
+from app.config import settings
+
+_CONTEXT = {
+    "events": [
+        {
+            "title": f"서울특별시 중구 관련 행사 {i}: 도심 재개발 및 교통 통제 안내",
+            "date": "2024-05",
+            "source_url": f"https://example.com/events/{i}",
+            "relevance": "low",
+        }
+        for i in range(5)
+    ],
+    "summary": "서울특별시 중구 2024-05 관련 정보 5건 발견.",
+}
+
+
+@pytest.fixture(autouse=True)
+def _zlib(monkeypatch):
+    monkeypatch.setattr(settings, "cache_compression", "zlib")
+    monkeypatch.setattr(settings, "cache_compress_min_bytes", 512)
+
+
+def test_small_value_stored_raw():
+    blob = codec.pack(codec.dumps({"x": 1}))
+    assert blob[0] == codec.CODEC_RAW
+    assert codec.loads(codec.unpack(blob)) == {"x": 1}
+
+
+def test_large_repetitive_value_is_compressed():
+    raw = codec.dumps(_CONTEXT)
+    blob = codec.pack(raw)
+    assert blob[0] == codec.CODEC_ZLIB
+    assert len(blob) < len(raw) / 2
+    assert codec.loads(codec.unpack(blob)) == _CONTEXT
+
+
+def test_incompressible_value_stays_raw():
+    raw = os.urandom(1024)
+    assert codec.pack(raw)[0] == codec.CODEC_RAW
+
+
+def test_compression_none(monkeypatch):
+    monkeypatch.setattr(settings, "cache_compression", "none")
+    assert codec.pack(codec.dumps(_CONTEXT))[0] == codec.CODEC_RAW
+
+
+def test_zstd_falls_back_to_zlib_when_unavailable(monkeypatch):
+    monkeypatch.setattr(settings, "cache_compression", "zstd")
+    monkeypatch.setattr(codec, "zstandard", None)
+    assert codec.pack(codec.dumps(_CONTEXT))[0] == codec.CODEC_ZLIB
+
+
+def test_legacy_text_value_decodes():
+    assert codec.loads(codec.unpack('{"place": "서울"}')) == {"place": "서울"}
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [b"", bytes((9,)) + b"{}", bytes((codec.CODEC_ZLIB,)) + b"not zlib"],
+)
+def test_undecodable_values_raise_codec_error(stored):
+    with pytest.raises(codec.CodecError):
+        codec.unpack(stored)
+
+
+class TestCacheStoreBlobs:
+    @pytest.fixture
+    async def cache(self, tmp_path):
+        store = CacheStore(str(tmp_path / "cache.db"))
+        await store.init()
+        yield store
+        await store.close()
+
+    async def test_values_stored_as_compressed_blobs(self, cache):
+        await cache.set("context:서울:2024-05", _CONTEXT)
+        rows = await cache._db.execute_fetchall(
+            "SELECT typeof(value), value, size FROM cache WHERE key = ?",
+            ("context:서울:2024-05",),
+        )
+        kind, value, size = rows[0]
+        assert kind == "blob"
+        assert value[0] == codec.CODEC_ZLIB
+        assert size == len("context:서울:2024-05") + len(value)
+        cache._l1.clear()
+        assert await cache.get("context:서울:2024-05") == _CONTEXT
+
+    async def test_legacy_text_rows_are_read(self, cache):
+        await cache._db.execute(
+            "INSERT INTO cache (key, value) VALUES (?, ?)",
+            ("geocode:1:1", '{"country": "대한민국"}'),
+        )
+        await cache._db.commit()
+        assert await cache.get("geocode:1:1") == {"country": "대한민국"}
+
+    async def test_corrupt_blob_is_a_miss(self, cache):
+        await cache._db.execute(
+            "INSERT INTO cache (key, value) VALUES (?, ?)",
+            ("geocode:2:2", bytes((codec.CODEC_ZLIB,)) + zlib.compress(b"{broken")),
+        )
+        await cache._db.commit()
+        assert await cache.get("geocode:2:2") is None
@@ -1,15 +1,19 @@
 """Tests for cache error handling — SQLite failures should not propagate."""
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import aiosqlite
 import pytest
 
 from app.cache.store import CacheStore
+from app.config import settings
+from app.utils.metrics import cache_cleanup_total
 
 
 @pytest.fixture
-async def cache(tmp_path):
+async def cache(tmp_path, monkeypatch):
+    # 읽기 풀 없이 모든 쿼리가 _db를 거치도록 하여 실패 주입을 단순화
+    monkeypatch.setattr(settings, "cache_read_pool_size", 0)
     store = CacheStore(str(tmp_path / "cache.db"))
     await store.init()
     yield store
@@ -30,26 +34,79 @@ def _make_failing_execute(exc):
 
 class TestCacheErrorHandling:
     async def test_get_returns_none_on_sqlite_error(self, cache):
-        cache._db.execute = _make_failing_execute(aiosqlite.DatabaseError("disk I/O error"))
+        cache._db.execute_fetchall = AsyncMock(side_effect=aiosqlite.DatabaseError("disk I/O"))
         result = await cache.get("geocode:1:2")
         assert result is None
 
     async def test_set_does_not_raise_on_sqlite_error(self, cache):
-        cache._db.execute = AsyncMock(side_effect=aiosqlite.DatabaseError("disk full"))
+        cache._db.executemany = AsyncMock(side_effect=aiosqlite.DatabaseError("disk full"))
         await cache.set("geocode:1:2", {"data": "test"})
 
+    async def test_failed_batch_is_rolled_back(self, cache):
+        real_apply_counts = cache._apply_counts
+        # 행 업서트 뒤 같은 트랜잭션의 다음 단계에서 실패
+        cache._apply_counts = AsyncMock(side_effect=aiosqlite.DatabaseError("disk full"))
+        await cache.set("geocode:1:2", {"data": "failed"})
+
+        cache._apply_counts = real_apply_counts
+        await cache.set("geocode:3:4", {"data": "ok"})
+
+        rows = await cache._db.execute_fetchall("SELECT key FROM cache")
+        assert rows == [("geocode:3:4",)]
+
     async def test_cleanup_returns_zero_on_sqlite_error(self, cache):
-        cache._db.execute = _make_failing_execute(aiosqlite.DatabaseError("locked"))
+        cache._db.execute_fetchall = AsyncMock(side_effect=aiosqlite.DatabaseError("locked"))
         result = await cache.cleanup_expired()
         assert result == 0
 
+    async def test_failed_delete_is_rolled_back(self, cache):
+        await cache.set("geocode:1:2", {"data": "kept"})
+        # DELETE는 실행된 뒤 커밋에서 실패
+        with patch.object(
+            cache._db, "commit", AsyncMock(side_effect=aiosqlite.DatabaseError("disk full"))
+        ):
+            assert await cache.delete("geocode:1:2") is False
+
+        # 다음 group commit에 실패한 삭제가 섞여 들어가지 않아야 한다
+        await cache.set("geocode:3:4", {"data": "ok"})
+        rows = await cache._db.execute_fetchall("SELECT key FROM cache ORDER BY key")
+        assert rows == [("geocode:1:2",), ("geocode:3:4",)]
+        assert cache._approx_entries == 2
+
+    async def test_failed_cleanup_chunk_keeps_committed_count(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 2)
+        await cache.set_many({f"geocode:{i}:0": {"i": i} for i in range(5)}, ttl_seconds=60)
+        await cache._db.execute("UPDATE cache SET expires_at = 1")
+        await cache._db.commit()
+        real_commit = cache._db.commit
+        commits = 0
+
+        async def _commit():
+            nonlocal commits
+            commits += 1
+            if commits == 2:
+                raise aiosqlite.DatabaseError("disk full")
+            await real_commit()
+
+        before = cache_cleanup_total._value.get()
+        bytes_before = cache._approx_bytes
+        with patch.object(cache._db, "commit", _commit):
+            assert await cache.cleanup_expired() == 2
+
+        assert cache_cleanup_total._value.get() - before == 2
+        assert cache._approx_entries == 3
+        assert 0 < cache._approx_bytes < bytes_before
+        await cache.set("geocode:9:9", {"data": "ok"})
+        rows = await cache._db.execute_fetchall("SELECT COUNT(*) FROM cache WHERE expires_at = 1")
+        assert rows == [(3,)]
+
     async def test_get_returns_none_on_os_error(self, cache):
-        cache._db.execute = _make_failing_execute(OSError("permission denied"))
+        cache._db.execute_fetchall = AsyncMock(side_effect=OSError("permission denied"))
         result = await cache.get("geocode:1:2")
         assert result is None
 
     async def test_set_does_not_raise_on_os_error(self, cache):
-        cache._db.execute = AsyncMock(side_effect=OSError("read-only filesystem"))
+        cache._db.executemany = AsyncMock(side_effect=OSError("read-only filesystem"))
         await cache.set("geocode:1:2", {"data": "test"})
 
     async def test_get_returns_none_on_json_decode_error(self, cache):
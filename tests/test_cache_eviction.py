@@ -0,0 +1,102 @@
+"""Tests for size-bounded GDSF eviction of the cache database."""
+
+import aiosqlite
+import pytest
+
+from app.cache.migrator import run_migrations
+from app.cache.store import CacheStore
+from app.config import settings
+from app.utils.metrics import cache_bytes, cache_evictions
+
+
+@pytest.fixture
+async def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_max_bytes", 0)
+    monkeypatch.setattr(settings, "cache_max_entries", 0)
+    store = CacheStore(str(tmp_path / "cache.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def _keys(cache: CacheStore) -> set[str]:
+    rows = await cache._db.execute_fetchall("SELECT key FROM cache")
+    return {row[0] for row in rows}
+
+
+_PAYLOAD = {"text": "x" * 200}
+
+
+async def test_no_eviction_when_unlimited(cache):
+    for i in range(20):
+        await cache.set(f"geocode:{i}:0", _PAYLOAD)
+    assert await cache.evict_to_budget() == 0
+    assert len(await _keys(cache)) == 20
+
+
+async def test_cheap_geocode_rows_evicted_before_describe(cache, monkeypatch):
+    for i in range(5):
+        await cache.set(f"describe:img{i}", _PAYLOAD)
+        await cache.set(f"geocode:{i}:0", _PAYLOAD)
+
+    before = cache_evictions.labels(module="geocode")._value.get()
+    monkeypatch.setattr(settings, "cache_max_entries", 6)
+    evicted = await cache.evict_to_budget()
+
+    keys = await _keys(cache)
+    assert evicted == len({f"geocode:{i}:0" for i in range(5)} - keys)
+    assert {f"describe:img{i}" for i in range(5)} <= keys
+    assert len(keys) <= 6 * 0.9
+    assert cache_evictions.labels(module="geocode")._value.get() - before == evicted
+
+
+async def test_frequently_accessed_rows_survive(cache, monkeypatch):
+    for i in range(4):
+        await cache.set(f"geocode:{i}:0", _PAYLOAD)
+    for _ in range(5):
+        await cache.get("geocode:3:0")
+    await cache.set("geocode:9:9", _PAYLOAD)  # 접근 기록을 DB에 반영
+
+    monkeypatch.setattr(settings, "cache_max_entries", 2)
+    await cache.evict_to_budget()
+    assert "geocode:3:0" in await _keys(cache)
+
+
+async def test_byte_budget_enforced_on_write(cache, monkeypatch):
+    monkeypatch.setattr(settings, "cache_max_bytes", 2000)
+    for i in range(30):
+        await cache.set(f"landcover:{i}:0", _PAYLOAD)
+
+    rows = await cache._db.execute_fetchall("SELECT SUM(size) FROM cache")
+    assert rows[0][0] <= 2000
+    # 게이지는 예산 점검 시점에 갱신된다
+    await cache.evict_to_budget()
+    assert cache_bytes.labels(module="landcover")._value.get() == rows[0][0]
+
+
+async def test_evicted_rows_leave_l1_and_raise_inflation(cache, monkeypatch):
+    await cache.set("geocode:1:0", _PAYLOAD)
+    await cache.set("describe:img", _PAYLOAD)
+    monkeypatch.setattr(settings, "cache_max_entries", 1)
+
+    await cache.evict_to_budget()
+    assert cache._inflation > 0
+    assert await cache.get("geocode:1:0") is None
+    assert await cache.get("describe:img") == _PAYLOAD
+
+
+async def test_migration_backfills_existing_rows(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = await aiosqlite.connect(path)
+    await db.executescript(
+        "CREATE TABLE schema_version (version INTEGER PRIMARY KEY, name TEXT NOT NULL,"
+        " applied_at TEXT NOT NULL DEFAULT (datetime('now')));"
+        "CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL);"
+        "INSERT INTO schema_version (version, name) VALUES (1, '001_initial');"
+        "INSERT INTO cache VALUES ('context:서울:2024-01', '{\"a\": 1}', NULL);"
+    )
+    await db.commit()
+    await run_migrations(db)
+    rows = await db.execute_fetchall("SELECT module, size FROM cache")
+    await db.close()
+    assert rows == [("context", len("context:서울:2024-01") + len('{"a": 1}'))]
@@ -0,0 +1,166 @@
+"""Tests for versioned cache keys and prefix invalidation."""
+
+import importlib.util
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes import limiter as routes_limiter
+from app.auth import authenticate
+from app.cache.invalidate import _main as invalidate_main
+from app.cache.keys import key_version, versioned_key
+from app.cache.redis_store import RedisCacheStore
+from app.cache.store import CacheStore
+from app.config import settings
+from app.main import app
+from app.modules import describer, geocoder, mission
+from app.utils.metrics import cache_invalidations
+from tests.fake_redis import FakeRedisServer
+
+SAMPLE_STAC_RESPONSE = {
+    "collection": "sentinel-2-c1-l2a",
+    "properties": {"platform": "sentinel-2c", "instruments": ["msi"]},
+}
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "cache.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+class TestVersionedKeys:
+    def test_version_one_keeps_the_original_layout(self):
+        assert versioned_key("geocode", 1, 126.978, 37.566) == "geocode:126.978:37.566"
+        assert geocoder.cache_key_for(126.978, 37.566) == "geocode:126.978:37.566"
+
+    def test_later_versions_add_a_segment(self):
+        assert versioned_key("describe", 3, "cog-1") == "describe:v3:cog-1"
+
+    def test_key_version(self):
+        assert key_version(versioned_key("geocode", 1, 126.978, 37.566)) == 1
+        assert key_version(versioned_key("describe", 3, "cog-1")) == 3
+        assert key_version("describe:version-id") == 1
+
+    def test_bumping_a_version_makes_old_entries_unreachable(self, monkeypatch):
+        monkeypatch.setattr(describer, "CACHE_VERSION", 2)
+        assert describer.cache_key_for("cog-1") == "describe:v2:cog-1"
+
+    async def test_bumped_module_refetches(self, cache, httpx_mock, monkeypatch):
+        httpx_mock.add_response(json=SAMPLE_STAC_RESPONSE)
+        httpx_mock.add_response(json=SAMPLE_STAC_RESPONSE)
+        await mission.get_mission_metadata("S2C_X_L2A", cache)
+        await mission.get_mission_metadata("S2C_X_L2A", cache)
+        assert len(httpx_mock.get_requests()) == 1
+
+        monkeypatch.setattr(mission, "CACHE_VERSION", 2)
+        await mission.get_mission_metadata("S2C_X_L2A", cache)
+        assert len(httpx_mock.get_requests()) == 2
+
+
+class TestSqliteInvalidate:
+    async def test_deletes_only_the_prefix_in_chunks(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 3)
+        await cache.set_many({f"describe:cog-{i}": {"i": i} for i in range(10)})
+        await cache.set_many({"describe;other": {"x": 1}, "geocode:1:1": {"x": 2}})
+        before = cache_invalidations.labels(module="describe")._value.get()
+
+        with patch.object(cache._db, "commit", wraps=cache._db.commit) as commit:
+            assert await cache.invalidate_prefix("describe:") == 10
+        assert commit.await_count == 4  # 3 + 3 + 3 + 1
+
+        assert await cache.get("describe:cog-0") is None
+        assert await cache.get("describe;other") == {"x": 1}
+        assert await cache.get("geocode:1:1") == {"x": 2}
+        assert (await cache.stats())["modules"]["describe"]["entries"] == 0
+        assert cache_invalidations.labels(module="describe")._value.get() - before == 10
+
+    async def test_clears_l1(self, cache):
+        await cache.set("landcover:1:1", {"x": 1})
+        assert cache._l1.get("landcover:1:1", time.time()) is not None
+        await cache.invalidate_prefix("landcover:")
+        assert cache._l1.get("landcover:1:1", time.time()) is None
+
+    async def test_narrow_prefix(self, cache):
+        await cache.set_many({"landcover:v2:1:1": {"new": True}, "landcover:1:1": {"old": 1}})
+        assert await cache.invalidate_prefix("landcover:v2:") == 1
+        assert await cache.get("landcover:1:1") == {"old": 1}
+
+    async def test_cli(self, tmp_path, capsys):
+        path = str(tmp_path / "cli.db")
+        store = CacheStore(path)
+        await store.init()
+        await store.set_many({"context:a:2024-01": {"x": 1}, "mission:S2A": {"x": 2}})
+        await store.close()
+
+        await invalidate_main("context:", path)
+        assert "deleted=1" in capsys.readouterr().out
+
+        reopened = CacheStore(path)
+        await reopened.init()
+        try:
+            assert await reopened.get("context:a:2024-01") is None
+            assert await reopened.get("mission:S2A") == {"x": 2}
+        finally:
+            await reopened.close()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("redis") is None, reason="redis extra not installed")
+async def test_redis_invalidate_scans_in_chunks(monkeypatch):
+    server = FakeRedisServer()
+    await server.start()
+    monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 4)
+    store = RedisCacheStore(server.url)
+    await store.init()
+    try:
+        await store.set_many({f"describe:cog-{i}": {"i": i} for i in range(10)})
+        await store.set_many({"describe:*": {"glob": 1}, "geocode:1:1": {"x": 1}})
+        assert await store.invalidate_prefix("describe:cog-") == 10
+        assert server.command_names().count("SCAN") == 3
+        assert await store.get("describe:*") == {"glob": 1}
+        assert await store.get("geocode:1:1") == {"x": 1}
+    finally:
+        await store.close()
+        await server.stop()
+
+
+class TestInvalidateEndpoint:
+    @pytest.fixture
+    async def client(self, cache):
+        app.state.cache = cache
+        routes_limiter.reset()
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+            headers={"X-API-Key": os.environ["API_KEY"]},
+        ) as c:
+            yield c
+        routes_limiter.reset()
+        app.dependency_overrides.clear()
+
+    async def test_invalidates_prefix(self, client, cache):
+        await cache.set_many({"geocode:1:1": {"x": 1}, "geocode:2:2": {"x": 2}})
+        resp = await client.post("/api/v1/cache/invalidate", json={"prefix": "geocode:"})
+        assert resp.status_code == 200
+        assert resp.json() == {"prefix": "geocode:", "deleted": 2}
+
+    @pytest.mark.parametrize("prefix", ["", "geocode", "unknown:", "*"])
+    async def test_rejects_non_module_prefix(self, client, prefix):
+        resp = await client.post("/api/v1/cache/invalidate", json={"prefix": prefix})
+        assert resp.status_code == 422
+
+    async def test_requires_api_key(self, client):
+        app.dependency_overrides[authenticate] = lambda: {"type": "jwt", "sub": "user-1"}
+        resp = await client.post("/api/v1/cache/invalidate", json={"prefix": "geocode:"})
+        assert resp.status_code == 403
+
+    async def test_rejects_anonymous(self, client):
+        resp = await client.post(
+            "/api/v1/cache/invalidate", json={"prefix": "geocode:"}, headers={"X-API-Key": ""}
+        )
+        assert resp.status_code == 401
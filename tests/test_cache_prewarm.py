@@ -0,0 +1,149 @@
+"""Tests for cache prewarming over an area of interest."""
+
+import httpx
+import pytest
+
+from app.cache.prewarm import Area, AreaError, ModuleProgress, prewarm
+from app.cache.store import CacheStore
+from app.config import settings
+from app.modules import context, geocoder, landcover
+
+# geocode 격자 3×3, landcover 격자 1칸
+BBOX = "126.978,37.566,126.98,37.568"
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "test.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+@pytest.fixture(autouse=True)
+def _fast_nominatim(monkeypatch):
+    monkeypatch.setattr(settings, "nominatim_rate_per_second", 1000.0)
+    monkeypatch.setattr(geocoder, "_buckets", {})
+
+
+@pytest.fixture
+def upstreams(httpx_mock):
+    calls = {"nominatim": 0, "overpass": 0, "duckduckgo": 0}
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        if "duckduckgo" in request.url.host:
+            calls["duckduckgo"] += 1
+            return httpx.Response(200, json={"RelatedTopics": []})
+        if request.method == "POST":
+            calls["overpass"] += 1
+            return httpx.Response(200, json={"elements": []})
+        calls["nominatim"] += 1
+        # 경도 126.980 셀만 다른 구
+        city = "종로구" if request.url.params["lon"] == "126.98" else "중구"
+        return httpx.Response(
+            200,
+            json={
+                "display_name": f"{city}, 서울특별시, 대한민국",
+                "address": {"country": "대한민국", "state": "서울특별시", "city": city},
+            },
+        )
+
+    httpx_mock.add_callback(_respond, is_reusable=True, is_optional=True)
+    return calls
+
+
+class TestArea:
+    def test_cells_follow_module_rounding(self):
+        area = Area.from_bbox(BBOX)
+        assert len(area.cells(3)) == 9
+        assert area.cells(2) == [(126.98, 37.57)]
+        assert area.cells(3, stride=2) == [
+            (126.978, 37.566),
+            (126.98, 37.566),
+            (126.978, 37.568),
+            (126.98, 37.568),
+        ]
+
+    def test_polygon_filters_cells(self):
+        triangle = [
+            [126.9775, 37.5655],
+            [126.981, 37.5655],
+            [126.9775, 37.569],
+            [126.9775, 37.5655],
+        ]
+        area = Area.from_geojson(
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [triangle]}}
+        )
+        assert sorted(area.cells(3)) == [
+            (126.978, 37.566),
+            (126.978, 37.567),
+            (126.978, 37.568),
+            (126.979, 37.566),
+            (126.979, 37.567),
+            (126.98, 37.566),
+        ]
+
+    @pytest.mark.parametrize("text", ["1,2,3", "10,0,0,10", "a,b,c,d", "0,-91,1,1"])
+    def test_invalid_bbox(self, text):
+        with pytest.raises(AreaError):
+            Area.from_bbox(text)
+
+    def test_geojson_without_polygons(self):
+        with pytest.raises(AreaError, match="no Polygon"):
+            Area.from_geojson({"type": "Point", "coordinates": [0, 0]})
+
+    def test_cell_limit(self):
+        with pytest.raises(AreaError, match="more than 100 cells"):
+            Area.from_bbox("0,0,10,10").cells(3, limit=100)
+
+
+class TestPrewarm:
+    async def test_fills_geocode_and_landcover(self, cache, upstreams):
+        result = await prewarm(cache, Area.from_bbox(BBOX))
+
+        assert (result["geocode"].filled, result["landcover"].filled) == (9, 1)
+        assert upstreams == {"nominatim": 9, "overpass": 1, "duckduckgo": 0}
+        assert await cache.get(geocoder.cache_key_for(126.979, 37.567)) is not None
+        assert await cache.get(landcover.cache_key_for(126.98, 37.57)) is not None
+
+    async def test_rerun_skips_cached_cells(self, cache, upstreams):
+        area = Area.from_bbox(BBOX)
+        await cache.set(geocoder.cache_key_for(126.978, 37.566), {"partial": True})
+        await prewarm(cache, area, ["geocode"])
+        assert upstreams["nominatim"] == 8
+
+        result = await prewarm(cache, area, ["geocode"])
+        assert (result["geocode"].cached, result["geocode"].filled) == (9, 0)
+        assert upstreams["nominatim"] == 8
+
+    async def test_failures_are_counted(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=400, is_reusable=True)
+        result = await prewarm(cache, Area.from_bbox(BBOX), ["geocode"], concurrency=2)
+        assert (result["geocode"].filled, result["geocode"].failed) == (0, 9)
+
+    async def test_context_runs_once_per_place(self, cache, upstreams):
+        result = await prewarm(cache, Area.from_bbox(BBOX), ["geocode", "context"], month="2026-10")
+
+        # 중구·종로구 두 곳만 조회
+        assert result["context"].total == 2
+        assert upstreams["duckduckgo"] == 2
+        key = context.cache_key_for("", "2026-10", "서울특별시", "중구")
+        assert await cache.get(key) is not None
+
+    async def test_context_needs_a_month(self, cache):
+        with pytest.raises(ValueError, match="month"):
+            await prewarm(cache, Area.from_bbox(BBOX), ["context"])
+
+    async def test_progress_reports(self, cache, upstreams):
+        lines = []
+        await prewarm(
+            cache, Area.from_bbox(BBOX), ["landcover"], report=lambda p: lines.append(p.line())
+        )
+        assert lines[0].startswith("landcover: 0/1 (0.0%) cached=0")
+        assert lines[-1].startswith("landcover: 1/1 (100.0%)")
+
+
+def test_progress_eta():
+    progress = ModuleProgress("geocode", total=3700, cached=100, filled=100)
+    progress.started -= 100
+    assert progress.line().endswith("1.00/s ETA 0:58:20")
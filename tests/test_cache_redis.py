@@ -0,0 +1,243 @@
+"""Tests for the Redis cache backend and backend selection."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+pytest.importorskip("redis")
+
+from app.cache import codec  # noqa: E402
+from app.cache.backend import create_cache_backend  # noqa: E402
+from app.cache.redis_store import RedisCacheStore  # noqa: E402
+from app.cache.store import CacheStore  # noqa: E402
+from app.config import Settings, settings  # noqa: E402
+from app.utils.metrics import cache_errors  # noqa: E402
+from tests.fake_redis import FakeRedisServer  # noqa: E402
+
+
+@pytest.fixture
+async def server():
+    srv = FakeRedisServer()
+    await srv.start()
+    yield srv
+    await srv.stop()
+
+
+@pytest.fixture
+async def cache(server, monkeypatch):
+    monkeypatch.setattr(settings, "cache_redis_l1_ttl_seconds", 0)
+    store = RedisCacheStore(server.url)
+    await store.init()
+    yield store
+    await store.close()
+
+
+def _pipelines(store: RedisCacheStore):
+    """Spy on the store's pipelines (one call = one round trip)."""
+    calls = []
+    original = store._pipeline
+
+    async def _spy(commands):
+        calls.append(commands)
+        return await original(commands)
+
+    return calls, patch.object(store, "_pipeline", _spy)
+
+
+class TestRedisConnection:
+    async def test_pipeline_returns_replies_in_order(self, cache):
+        replies = await cache._pipeline(
+            [("SET", "a", b"1"), ("GET", "a"), ("GET", "missing"), ("NOPE",)]
+        )
+        assert replies[:3] == [True, b"1", None]
+        assert isinstance(replies[3], Exception)
+
+    async def test_connections_are_pooled_and_bounded(self, server, monkeypatch):
+        monkeypatch.setattr(settings, "cache_redis_pool_size", 2)
+        store = RedisCacheStore(server.url)
+        try:
+            await asyncio.gather(*(store.ping() for _ in range(20)))
+            assert await store.ping() is True
+        finally:
+            await store.close()
+        assert server.connections <= 2
+
+    async def test_auth_with_password(self):
+        srv = FakeRedisServer(password="s3cret")
+        await srv.start()
+        store = RedisCacheStore(srv.url)
+        try:
+            assert await store.ping() is True
+        finally:
+            await store.close()
+            await srv.stop()
+
+    def test_tls_url_is_supported(self):
+        from redis.asyncio.connection import SSLConnection
+
+        store = RedisCacheStore("rediss://cache.example.com:6380/0")
+        assert store._client.connection_pool.connection_class is SSLConnection
+
+    def test_rejects_non_redis_url(self):
+        with pytest.raises(ValueError):
+            RedisCacheStore("http://localhost:6379")
+
+    def test_non_integer_pttl_is_ignored(self, cache):
+        payload = b"\0" * 8 + codec.pack(b'{"x":1}')
+        entry = cache._decode("geocode:1:1", payload, RuntimeError("ERR"), time.time())
+        assert entry is not None and entry.value == {"x": 1}
+
+
+class TestRedisCacheStore:
+    async def test_set_get_delete(self, cache, server):
+        await cache.set("geocode:1:1", {"place": "서울"}, ttl_seconds=60)
+        assert await cache.get("geocode:1:1") == {"place": "서울"}
+        assert b"cognito:k:geocode:1:1" in server.data
+        assert await cache.delete("geocode:1:1") is True
+        assert await cache.get("geocode:1:1") is None
+        assert await cache.delete("geocode:1:1") is False
+
+    async def test_ttl_is_the_hard_expiry(self, cache, server):
+        await cache.set("geocode:2:2", {"x": 2}, ttl_seconds=60, stale_grace_seconds=60)
+        _, expires_at = server.data[b"cognito:k:geocode:2:2"]
+        assert 110 < expires_at - time.time() <= 120
+
+    async def test_stale_entry_is_served_and_refreshed(self, cache, server):
+        await cache.set("landcover:1:1", {"v": "old"}, ttl_seconds=60, stale_grace_seconds=60)
+        with patch("app.cache.redis_store.time") as mock_time:
+            mock_time.time.return_value = time.time() + 90
+
+            async def _refresh():
+                await cache.set("landcover:1:1", {"v": "new"}, ttl_seconds=60)
+
+            assert await cache.get("landcover:1:1", refresh=_refresh) == {"v": "old"}
+        await cache.wait_refreshes()
+        assert await cache.get("landcover:1:1") == {"v": "new"}
+
+    async def test_get_many_is_one_round_trip(self, cache):
+        await cache.set_many({f"geocode:{i}:0": {"i": i} for i in range(5)}, ttl_seconds=60)
+        calls, spy = _pipelines(cache)
+        with spy:
+            found = await cache.get_many([f"geocode:{i}:0" for i in range(8)])
+        assert found == {f"geocode:{i}:0": {"i": i} for i in range(5)}
+        assert len(calls) == 1
+        geocode = (await cache.stats())["modules"]["geocode"]
+        assert (geocode["hits"], geocode["misses"]) == (5, 3)
+
+    async def test_set_many_is_one_round_trip(self, cache, server):
+        calls, spy = _pipelines(cache)
+        with spy:
+            await cache.set_many({f"context:{i}:2024-01": {"i": i} for i in range(10)})
+        assert len(calls) == 1
+        assert sum(1 for name in server.command_names() if name == "SET") == 10
+
+    async def test_counters_are_shared_between_instances(self, cache, server):
+        other = RedisCacheStore(server.url)
+        await other.init()
+        await cache.set("mission:S2A", {"name": "S2A"})
+        await cache.get("mission:S2A")
+        await other.get("mission:S2A")
+        await other.get("mission:missing")
+        await other.close()  # 남은 카운터를 Redis에 반영
+
+        stats = await cache.stats()
+        mission = stats["modules"]["mission"]
+        assert (mission["hits"], mission["misses"]) == (2, 1)
+        assert stats["entry_count"] == 1
+        assert stats["total_bytes"] > 0
+
+    async def test_stats_count_only_this_cache_prefix(self, cache, server, monkeypatch):
+        monkeypatch.setattr(settings, "cache_cleanup_chunk_size", 2)
+        await cache.set_many({f"geocode:{i}:0": {"i": i} for i in range(5)})
+        await cache.set("mission:S2A", {"name": "S2A"})
+        server.data[b"other-app:session"] = (b"x" * 1000, None)
+
+        stats = await cache.stats()
+        assert stats["entry_count"] == 6
+        assert stats["modules"]["geocode"]["entries"] == 5
+        assert stats["modules"]["mission"]["entries"] == 1
+        assert stats["total_bytes"] == sum(
+            len(k) + len(v) for k, (v, _) in server.data.items() if k.startswith(b"cognito:k:")
+        )
+        geocode = await cache.stats(module="geocode")
+        assert (geocode["entry_count"], list(geocode["modules"])) == (5, ["geocode"])
+
+    async def test_module_filter(self, cache):
+        await cache.get("geocode:x")
+        await cache.get("mission:y")
+        stats = await cache.stats(module="mission")
+        assert list(stats["modules"]) == ["mission"]
+
+    async def test_unreachable_server_degrades_to_miss(self, monkeypatch):
+        monkeypatch.setattr(settings, "cache_redis_timeout", 0.2)
+        store = RedisCacheStore("redis://127.0.0.1:1/0")
+        await store.init()
+        before = cache_errors.labels(operation="get")._value.get()
+        try:
+            assert await store.ping() is False
+            assert await store.get("geocode:1:1") is None
+            await store.set("geocode:1:1", {"x": 1})
+            assert (await store.stats())["entry_count"] == 0
+        finally:
+            await store.close()
+        assert cache_errors.labels(operation="get")._value.get() - before == 1
+
+    async def test_memory_tier_is_optional(self, server, monkeypatch):
+        monkeypatch.setattr(settings, "cache_redis_l1_ttl_seconds", 30)
+        store = RedisCacheStore(server.url)
+        await store.init()
+        try:
+            await store.set("geocode:3:3", {"x": 3})
+            calls, spy = _pipelines(store)
+            with spy:
+                assert await store.get("geocode:3:3") == {"x": 3}
+            assert calls == []
+            assert (await store.stats())["modules"]["geocode"]["l1_hits"] == 1
+        finally:
+            await store.close()
+
+    async def test_memory_tier_expires_after_l1_ttl(self, server, monkeypatch):
+        monkeypatch.setattr(settings, "cache_redis_l1_ttl_seconds", 5)
+        store = RedisCacheStore(server.url)
+        await store.init()
+        try:
+            await store.set("geocode:4:4", {"v": 1})
+            with patch("app.cache.redis_store.time") as mock_time:
+                mock_time.time.return_value = time.time() + 10
+                calls, spy = _pipelines(store)
+                with spy:
+                    await store.get("geocode:4:4")
+            assert len(calls) == 1
+        finally:
+            await store.close()
+
+
+async def test_geocode_module_uses_shared_backend(cache, httpx_mock):
+    from app.modules.geocoder import geocode
+
+    httpx_mock.add_response(
+        json={
+            "display_name": "서울",
+            "address": {"country": "대한민국", "country_code": "kr", "state": "서울특별시"},
+        }
+    )
+    first = await geocode(126.978, 37.566, cache)
+    second = await geocode(126.978, 37.566, cache)
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setattr(settings, "cache_backend", "redis")
+    assert isinstance(create_cache_backend(), RedisCacheStore)
+    monkeypatch.setattr(settings, "cache_backend", "sqlite")
+    assert isinstance(create_cache_backend(), CacheStore)
+
+
+def test_invalid_backend_rejected(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memcached")
+    with pytest.raises(ValidationError, match="cache_backend"):
+        Settings()
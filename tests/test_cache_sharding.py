@@ -0,0 +1,185 @@
+"""Tests for the sharded SQLite cache backend."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from app.cache.backend import create_cache_backend
+from app.cache.sharded import ShardedCacheStore, shard_path
+from app.cache.snapshot import export_snapshot, import_snapshot
+from app.cache.store import CacheStore
+from app.config import Settings, settings
+from tests.test_config import _make_env
+
+
+@pytest.fixture
+async def by_module(tmp_path):
+    store = ShardedCacheStore(str(tmp_path / "cache.db"), "module", ["describe", "context"])
+    await store.init()
+    yield store
+    await store.close()
+
+
+@pytest.fixture
+async def by_hash(tmp_path):
+    store = ShardedCacheStore(str(tmp_path / "cache.db"), "hash", count=3)
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def _keys_in(store: CacheStore) -> set[str]:
+    rows = await store._db.execute_fetchall("SELECT key FROM cache")
+    return {row[0] for row in rows}
+
+
+def test_shard_path():
+    assert shard_path("/tmp/cache.db", "describe") == "/tmp/cache.describe.db"
+    assert shard_path(":memory:", "0") == ":memory:"
+
+
+class TestModuleLayout:
+    async def test_routes_modules_to_their_own_files(self, by_module, tmp_path):
+        await by_module.set("describe:cog-1", {"d": 1})
+        await by_module.set("context:a:2024-01", {"c": 1})
+        await by_module.set("geocode:1:1", {"g": 1})
+
+        assert {p.name for p in tmp_path.glob("*.db")} == {
+            "cache.db",
+            "cache.describe.db",
+            "cache.context.db",
+        }
+        describe, context, default = by_module._stores
+        assert await _keys_in(describe) == {"describe:cog-1"}
+        assert await _keys_in(context) == {"context:a:2024-01"}
+        assert await _keys_in(default) == {"geocode:1:1"}
+
+    async def test_invalidate_touches_only_the_module_shard(self, by_module):
+        await by_module.set_many({"describe:a": {"x": 1}, "geocode:1:1": {"x": 2}})
+        describe, _, default = by_module._stores
+        with patch.object(default, "_delete_prefix", wraps=default._delete_prefix) as other:
+            assert await by_module.invalidate_prefix("describe:") == 1
+        other.assert_not_called()
+        assert await by_module.get("describe:a") is None
+        assert describe._l1.get("describe:a", 0) is None
+        assert await by_module.get("geocode:1:1") == {"x": 2}
+
+
+class TestHashLayout:
+    async def test_spreads_keys_and_reads_them_back(self, by_hash):
+        items = {f"geocode:{i}:0": {"i": i} for i in range(60)}
+        await by_hash.set_many(items)
+        per_shard = [len(await _keys_in(store)) for store in by_hash._stores]
+        assert sum(per_shard) == 60
+        assert all(count > 0 for count in per_shard)
+
+        for store in by_hash._stores:
+            store._l1.clear()
+        assert await by_hash.get_many(items) == items
+        assert await by_hash.get("geocode:7:0") == {"i": 7}
+        assert await by_hash.delete("geocode:7:0")
+        assert await by_hash.get("geocode:7:0") is None
+
+    async def test_invalidate_covers_every_shard(self, by_hash):
+        await by_hash.set_many({f"context:{i}:2024-01": {"i": i} for i in range(30)})
+        await by_hash.set("mission:S2A", {"x": 1})
+        assert await by_hash.invalidate_prefix("context:") == 30
+        assert (await by_hash.stats())["entry_count"] == 1
+
+
+class TestAggregation:
+    async def test_stats_sum_over_shards(self, by_hash):
+        await by_hash.set_many({f"geocode:{i}:0": {"i": i} for i in range(10)})
+        await by_hash.set("describe:a", {"d": "x" * 100})
+        for store in by_hash._stores:
+            store._l1.clear()
+        await by_hash.get_many([f"geocode:{i}:0" for i in range(12)])
+
+        stats = await by_hash.stats()
+        assert stats["entry_count"] == 11
+        geocode = stats["modules"]["geocode"]
+        assert (geocode["entries"], geocode["hits"], geocode["misses"]) == (10, 10, 2)
+        assert stats["total_bytes"] == sum(m["bytes"] for m in stats["modules"].values())
+        assert stats["l1"]["entries"] == 10
+        assert (await by_hash.stats("describe"))["entry_count"] == 1
+
+    async def test_budgets_are_split_between_shards(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "cache_max_entries", 40)
+        monkeypatch.setattr(settings, "cache_max_bytes", 0)
+        store = ShardedCacheStore(str(tmp_path / "cache.db"), "hash", count=2)
+        await store.init()
+        try:
+            assert store._stores[0]._l1.max_entries == settings.cache_l1_max_entries // 2
+            await store.set_many({f"geocode:{i}:0": {"i": i} for i in range(100)})
+            await store.evict_to_budget()
+            assert (await store.stats())["entry_count"] <= 40
+        finally:
+            await store.close()
+
+    async def test_size_budget_is_global(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "cache_max_entries", 40)
+        monkeypatch.setattr(settings, "cache_max_bytes", 0)
+        store = ShardedCacheStore(str(tmp_path / "cache.db"), "module", modules=["describe"])
+        await store.init()
+        try:
+            # 한 샤드만 쓰여도 전체 예산을 사용
+            await store.set_many({f"geocode:{i}:0": {"i": i} for i in range(38)})
+            assert (await store.stats())["entry_count"] == 38
+
+            # 예산을 넘으면 샤드를 가로질러 우선순위가 가장 낮은 geocode 행부터 제거
+            await store.set_many({f"describe:{i}": {"d": i} for i in range(10)})
+            await store.evict_to_budget()
+            stats = await store.stats()
+            assert stats["modules"]["describe"]["entries"] == 10
+            assert stats["modules"]["geocode"]["entries"] == 26  # 한도의 90%까지
+            inflations = {shard._inflation for shard in store._stores}
+            assert len(inflations) == 1 and inflations.pop() > 0
+        finally:
+            await store.close()
+
+
+async def test_snapshot_moves_entries_into_a_new_layout(tmp_path, by_hash):
+    single = CacheStore(str(tmp_path / "single.db"))
+    await single.init()
+    try:
+        await single.set_many({f"landcover:{i}:0": {"i": i} for i in range(20)})
+        await export_snapshot(single, tmp_path / "snap.ndjson.gz")
+    finally:
+        await single.close()
+
+    result = await import_snapshot(by_hash, tmp_path / "snap.ndjson.gz")
+    assert result.rows == 20
+    assert await by_hash.get("landcover:3:0") == {"i": 3}
+
+    await export_snapshot(by_hash, tmp_path / "again.ndjson.gz")
+    reloaded = CacheStore(str(tmp_path / "reloaded.db"))
+    await reloaded.init()
+    try:
+        assert (await import_snapshot(reloaded, tmp_path / "again.ndjson.gz")).rows == 20
+    finally:
+        await reloaded.close()
+
+
+def test_create_cache_backend_selects_sharding(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "cache_shard_mode", "hash")
+    monkeypatch.setattr(settings, "cache_shard_count", 2)
+    monkeypatch.setattr(settings, "cache_db_path", str(tmp_path / "cache.db"))
+    backend = create_cache_backend()
+    assert isinstance(backend, ShardedCacheStore)
+    assert [Path(s._db_path).name for s in backend._stores] == ["cache.0.db", "cache.1.db"]
+
+
+@pytest.mark.parametrize(
+    "env",
+    [
+        {"CACHE_SHARD_MODE": "random"},
+        {"CACHE_SHARD_MODULES": "describe,weather"},
+        {"CACHE_SHARD_COUNT": "0"},
+    ],
+)
+def test_invalid_shard_settings(env):
+    with patch.dict(os.environ, _make_env(**env), clear=True), pytest.raises(ValidationError):
+        Settings()
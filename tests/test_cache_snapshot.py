@@ -0,0 +1,125 @@
+"""Tests for cache snapshot export/import and the startup restore."""
+
+import gzip
+import json
+import time
+
+import pytest
+
+import app.cache.snapshot as snapshot_mod
+import app.main as main_mod
+from app.cache.snapshot import (
+    SnapshotError,
+    export_snapshot,
+    import_snapshot,
+    restore_on_startup,
+)
+from app.cache.store import CacheStore
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "source.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+@pytest.fixture
+async def target(tmp_path):
+    store = CacheStore(str(tmp_path / "target.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def test_round_trip_skips_expired_rows(cache, target, tmp_path):
+    await cache.set("geocode:1:1", {"place": "서울"}, ttl_seconds=3600, stale_grace_seconds=60)
+    await cache.set("describe:abc", {"description": "설명 " * 200})
+    await cache.set("context:old:2024-01", {"x": 1}, ttl_seconds=60)
+    await cache._db.execute(
+        "UPDATE cache SET expires_at = ? WHERE key = 'context:old:2024-01'", (time.time() - 1,)
+    )
+    await cache._db.commit()
+
+    path = tmp_path / "snap.ndjson.gz"
+    exported = await export_snapshot(cache, path)
+    assert exported.rows == 2
+    assert not path.with_name(path.name + ".tmp").exists()
+
+    imported = await import_snapshot(target, path)
+    assert (imported.rows, imported.skipped) == (2, 0)
+    assert await target.get("geocode:1:1") == {"place": "서울"}
+    assert await target.get("describe:abc") == {"description": "설명 " * 200}
+    assert await target.get("context:old:2024-01") is None
+
+    rows = await target._db.execute_fetchall(
+        "SELECT stale_at IS NOT NULL FROM cache WHERE key = 'geocode:1:1'"
+    )
+    assert rows[0][0] == 1
+    assert (await target.stats())["entry_count"] == 2
+
+
+async def test_import_keeps_existing_rows(cache, target, tmp_path):
+    await cache.set("geocode:1:1", {"v": "snapshot"})
+    await target.set("geocode:1:1", {"v": "local"})
+    path = tmp_path / "snap.ndjson.gz"
+    await export_snapshot(cache, path)
+
+    result = await import_snapshot(target, path)
+    assert (result.rows, result.skipped) == (0, 1)
+    assert await target.get("geocode:1:1") == {"v": "local"}
+
+
+async def test_import_is_chunked(cache, target, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_mod, "_CHUNK_ROWS", 4)
+    for i in range(10):
+        await cache.set(f"geocode:{i}:0", {"i": i})
+    path = tmp_path / "snap.ndjson.gz"
+    await export_snapshot(cache, path)
+
+    chunk_sizes = []
+    load_rows = target.load_rows
+
+    async def _spy(rows):
+        chunk_sizes.append(len(rows))
+        return await load_rows(rows)
+
+    monkeypatch.setattr(target, "load_rows", _spy)
+    result = await import_snapshot(target, path)
+    assert result.rows == 10
+    assert chunk_sizes == [4, 4, 2]
+
+
+async def test_import_rejects_non_snapshot(target, tmp_path):
+    path = tmp_path / "other.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps({"format": "something-else"}) + "\n")
+    with pytest.raises(SnapshotError):
+        await import_snapshot(target, path)
+
+    plain = tmp_path / "plain.txt"
+    plain.write_text("not gzip")
+    with pytest.raises(SnapshotError):
+        await import_snapshot(target, plain)
+
+
+async def test_restore_on_startup_tolerates_missing_and_corrupt_files(target, tmp_path):
+    assert await restore_on_startup(target, str(tmp_path / "missing.gz")) is None
+    corrupt = tmp_path / "corrupt.gz"
+    corrupt.write_bytes(b"\x1f\x8bgarbage")
+    assert await restore_on_startup(target, str(corrupt)) is None
+
+
+async def test_lifespan_loads_snapshot_before_serving(cache, tmp_path, monkeypatch):
+    from fastapi import FastAPI
+
+    await cache.set("mission:S2A", {"name": "Sentinel-2A"})
+    path = tmp_path / "snap.ndjson.gz"
+    await export_snapshot(cache, path)
+    monkeypatch.setattr(main_mod.settings, "cache_db_path", str(tmp_path / "fresh.db"))
+    monkeypatch.setattr(main_mod.settings, "cache_snapshot_path", str(path))
+
+    test_app = FastAPI(lifespan=main_mod.lifespan)
+    async with main_mod.lifespan(test_app):
+        assert await test_app.state.cache.get("mission:S2A") == {"name": "Sentinel-2A"}
@@ -4,6 +4,7 @@ from unittest.mock import patch
 import pytest
 
 from app.cache.store import CacheStore
+from app.config import settings
 
 
 @pytest.fixture
@@ -123,6 +124,72 @@ class TestCacheStats:
             assert module in stats["modules"]
 
 
+class TestIncrementalStats:
+    async def _scanned(self, cache) -> tuple[int, int]:
+        rows = await cache._db.execute_fetchall(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        )
+        return rows[0]
+
+    async def test_totals_follow_overwrite_expiry_and_eviction(self, cache, monkeypatch):
+        await cache.set("geocode:a", {"x": 1})
+        await cache.set("geocode:a", {"x": "훨씬 더 긴 값" * 10})
+        await cache.set("context:b", {"x": 2}, ttl_seconds=60)
+        await cache.set("landcover:c", {"x": 3})
+        stats = await cache.stats()
+        assert (stats["entry_count"], stats["total_bytes"]) == await self._scanned(cache)
+        assert stats["modules"]["geocode"]["entries"] == 1
+
+        await cache._db.execute("UPDATE cache SET expires_at = ?", (time.time() - 1,))
+        await cache._db.commit()
+        await cache.cleanup_expired()
+        monkeypatch.setattr(settings, "cache_max_entries", 1)
+        await cache.set("describe:d", {"x": 4})
+        await cache.evict_to_budget()
+
+        stats = await cache.stats()
+        assert (stats["entry_count"], stats["total_bytes"]) == await self._scanned(cache)
+
+    async def test_stats_do_not_scan_cache_table(self, cache):
+        await cache.set("geocode:a", {"x": 1})
+        statements = []
+        connections = [cache._db, *cache._readers]
+        for conn in connections:
+            await conn.set_trace_callback(statements.append)
+        await cache.stats()
+        for conn in connections:
+            await conn.set_trace_callback(None)
+        assert any("cache_stats" in sql for sql in statements)
+        assert not any("FROM cache " in sql or sql.endswith("FROM cache") for sql in statements)
+
+    async def test_module_filter(self, cache):
+        await cache.set("geocode:a", {"x": 1})
+        await cache.set("landcover:b", {"x": 2})
+        await cache.get("geocode:a")
+        stats = await cache.stats(module="geocode")
+        assert list(stats["modules"]) == ["geocode"]
+        assert stats["entry_count"] == 1
+        assert stats["total_bytes"] == stats["modules"]["geocode"]["bytes"]
+        assert stats["modules"]["geocode"]["hits"] == 1
+
+    async def test_counters_persist_across_restart(self, tmp_path):
+        path = str(tmp_path / "persist.db")
+        store = CacheStore(path)
+        await store.init()
+        await store.set("geocode:a", {"x": 1})
+        await store.get("geocode:a")
+        await store.get("geocode:missing")
+        await store.close()
+
+        reopened = CacheStore(path)
+        await reopened.init()
+        try:
+            geocode = (await reopened.stats())["modules"]["geocode"]
+        finally:
+            await reopened.close()
+        assert (geocode["entries"], geocode["hits"], geocode["misses"]) == (1, 1, 1)
+
+
 class TestCacheStatsEndpoint:
     @pytest.fixture
     async def client(self, tmp_path):
@@ -150,3 +217,74 @@ class TestCacheStatsEndpoint:
         assert "entry_count" in data
         assert "total_bytes" in data
         assert "modules" in data
+
+    async def test_endpoint_module_filter(self, client):
+        store = client._transport.app.state.cache
+        await store.set("geocode:a", {"x": 1})
+        await store.set("mission:S2A", {"x": 2})
+        resp = await client.get("/api/v1/cache/stats", params={"module": "mission"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert list(data["modules"]) == ["mission"]
+        assert data["entry_count"] == 1
+
+    async def test_endpoint_rejects_unknown_module(self, client):
+        resp = await client.get("/api/v1/cache/stats", params={"module": "nope"})
+        assert resp.status_code == 422
+
+
+class TestL1Cache:
+    async def test_set_populates_l1_and_skips_json_decode(self, cache):
+        await cache.set("geocode:1:2", {"place": "Seoul"})
+        with patch("app.cache.store.codec.loads") as mock_loads:
+            assert await cache.get("geocode:1:2") == {"place": "Seoul"}
+        mock_loads.assert_not_called()
+
+    async def test_l2_hit_is_promoted_to_l1(self, cache):
+        await cache.set("geocode:1:2", {"place": "Seoul"})
+        cache._l1.clear()
+        await cache.get("geocode:1:2")  # L2 hit
+        await cache.get("geocode:1:2")  # L1 hit
+        await cache.get("geocode:0:0")  # miss
+
+        geocode = (await cache.stats())["modules"]["geocode"]
+        assert geocode["hits"] == 2
+        assert geocode["l1_hits"] == 1
+        assert geocode["l2_hits"] == 1
+        assert geocode["l1_hit_rate"] == round(1 / 3, 4)
+        assert geocode["l2_hit_rate"] == 0.5
+
+    async def test_lru_eviction_by_entry_count(self, cache):
+        cache._l1.max_entries = 2
+        await cache.set("geocode:a", {"x": 1})
+        await cache.set("geocode:b", {"x": 2})
+        await cache.get("geocode:a")  # a가 최근 사용
+        await cache.set("geocode:c", {"x": 3})
+        assert cache._l1.get("geocode:b", time.time()) is None
+        assert cache._l1.get("geocode:a", time.time()) is not None
+        # L1에서 밀려나도 L2에는 남아 있음
+        assert await cache.get("geocode:b") == {"x": 2}
+
+    async def test_eviction_by_bytes(self, cache):
+        cache._l1.max_bytes = 200
+        await cache.set("context:a", {"text": "가" * 40})
+        await cache.set("context:b", {"text": "나" * 40})
+        assert len(cache._l1) == 1
+        assert cache._l1.bytes <= 200
+        stats = await cache.stats()
+        assert stats["l1"]["entries"] == 1
+        assert stats["l1"]["bytes"] == cache._l1.bytes
+
+    async def test_expired_l1_entry_is_a_miss(self, cache):
+        await cache.set("geocode:5:5", {"x": 5}, ttl_seconds=60)
+        with patch("app.cache.store.time") as mock_time:
+            mock_time.time.return_value = time.time() + 120
+            assert await cache.get("geocode:5:5") is None
+        assert len(cache._l1) == 0
+
+    async def test_zero_max_entries_disables_l1(self, cache):
+        cache._l1.max_entries = 0
+        await cache.set("geocode:6:6", {"x": 6})
+        assert await cache.get("geocode:6:6") == {"x": 6}
+        assert len(cache._l1) == 0
+        assert (await cache.stats())["modules"]["geocode"]["l1_hits"] == 0
@@ -0,0 +1,183 @@
+"""Tests for stale-while-revalidate (soft/hard TTL) in CacheStore and the modules."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.store import CacheStore
+from app.config import settings
+from app.utils.metrics import cache_refreshes, cache_stale_hits
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "cache.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def _make_stale(cache: CacheStore, key: str) -> None:
+    await cache._db.execute("UPDATE cache SET stale_at = ? WHERE key = ?", (time.time() - 10, key))
+    await cache._db.commit()
+    cache._l1.clear()
+
+
+def _refreshes(module: str, outcome: str) -> float:
+    return cache_refreshes.labels(module=module, outcome=outcome)._value.get()
+
+
+class TestSoftHardTtl:
+    async def test_grace_extends_hard_ttl(self, cache):
+        await cache.set("geocode:1:1", {"x": 1}, ttl_seconds=3600, stale_grace_seconds=3600)
+        with patch("app.cache.store.time") as mock_time:
+            mock_time.time.return_value = time.time() + 5400
+            assert await cache.get("geocode:1:1") == {"x": 1}
+            mock_time.time.return_value = time.time() + 7300
+            assert await cache.get("geocode:1:1") is None
+
+    async def test_without_grace_ttl_is_hard(self, cache):
+        await cache.set("geocode:2:2", {"x": 2}, ttl_seconds=3600)
+        with patch("app.cache.store.time") as mock_time:
+            mock_time.time.return_value = time.time() + 3700
+            assert await cache.get("geocode:2:2") is None
+
+    async def test_expired_row_not_deleted_on_read(self, cache):
+        await cache.set("geocode:3:3", {"x": 3}, ttl_seconds=1)
+        with patch("app.cache.store.time") as mock_time:
+            mock_time.time.return_value = time.time() + 10
+            assert await cache.get("geocode:3:3") is None
+        async with cache._db.execute("SELECT COUNT(*) FROM cache") as cur:
+            assert (await cur.fetchone())[0] == 1
+
+
+class TestBackgroundRefresh:
+    async def test_stale_hit_returns_value_and_refreshes(self, cache):
+        await cache.set("landcover:1:1", {"v": "old"}, ttl_seconds=3600, stale_grace_seconds=60)
+        await _make_stale(cache, "landcover:1:1")
+
+        async def _refresh():
+            await cache.set("landcover:1:1", {"v": "new"}, ttl_seconds=3600)
+
+        stale_before = cache_stale_hits.labels(module="landcover")._value.get()
+        assert await cache.get("landcover:1:1", refresh=_refresh) == {"v": "old"}
+        assert cache_stale_hits.labels(module="landcover")._value.get() - stale_before == 1
+        await cache.wait_refreshes()
+        assert await cache.get("landcover:1:1") == {"v": "new"}
+
+    async def test_fresh_hit_does_not_refresh(self, cache):
+        await cache.set("mission:S2A", {"v": 1}, ttl_seconds=3600, stale_grace_seconds=60)
+        calls = 0
+
+        async def _refresh():
+            nonlocal calls
+            calls += 1
+
+        await cache.get("mission:S2A", refresh=_refresh)
+        await cache.wait_refreshes()
+        assert calls == 0
+
+    async def test_refresh_is_deduplicated_per_key(self, cache):
+        await cache.set("context:seoul:2024-01", {"v": 1}, ttl_seconds=60, stale_grace_seconds=60)
+        await _make_stale(cache, "context:seoul:2024-01")
+        release = asyncio.Event()
+        calls = 0
+
+        async def _refresh():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        for _ in range(3):
+            await cache.get("context:seoul:2024-01", refresh=_refresh)
+        await asyncio.sleep(0)
+        release.set()
+        await cache.wait_refreshes()
+        assert calls == 1
+
+    async def test_refresh_error_is_counted_and_released(self, cache):
+        await cache.set("geocode:5:5", {"v": 1}, ttl_seconds=60, stale_grace_seconds=60)
+        await _make_stale(cache, "geocode:5:5")
+
+        async def _fail():
+            raise ConnectionError("upstream down")
+
+        before = _refreshes("geocode", "error")
+        assert await cache.get("geocode:5:5", refresh=_fail) == {"v": 1}
+        await cache.wait_refreshes()
+        assert _refreshes("geocode", "error") - before == 1
+        assert cache._refresh_pending == set()
+
+    async def test_full_queue_drops_refresh(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_refresh_queue_size", 1)
+        monkeypatch.setattr(settings, "cache_refresh_workers", 1)
+        release = asyncio.Event()
+
+        async def _block():
+            await release.wait()
+
+        for i in range(3):
+            await cache.set(f"geocode:{i}:9", {"v": i}, ttl_seconds=60, stale_grace_seconds=60)
+            await _make_stale(cache, f"geocode:{i}:9")
+
+        before = _refreshes("geocode", "dropped")
+        await cache.get("geocode:0:9", refresh=_block)
+        await asyncio.sleep(0)  # 워커가 첫 항목을 꺼내 큐가 비도록
+        await cache.get("geocode:1:9", refresh=_block)
+        await cache.get("geocode:2:9", refresh=_block)
+        assert _refreshes("geocode", "dropped") - before == 1
+        release.set()
+        await cache.wait_refreshes()
+
+
+async def test_geocode_serves_stale_and_refreshes(cache, httpx_mock):
+    from app.modules.geocoder import geocode
+
+    await cache.set(
+        "geocode:126.978:37.566",
+        {
+            "country": "대한민국",
+            "country_code": "kr",
+            "region": "옛 지명",
+            "city": None,
+            "place_name": "옛 지명",
+            "lat": 37.566,
+            "lon": 126.978,
+        },
+        ttl_seconds=60,
+        stale_grace_seconds=60,
+    )
+    await _make_stale(cache, "geocode:126.978:37.566")
+    httpx_mock.add_response(
+        json={
+            "display_name": "서울",
+            "address": {"country": "대한민국", "country_code": "kr", "state": "서울특별시"},
+        }
+    )
+
+    stale = await geocode(126.978, 37.566, cache)
+    assert stale.region == "옛 지명"
+    await cache.wait_refreshes()
+    fresh = await geocode(126.978, 37.566, cache)
+    assert fresh.region == "서울특별시"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_failed_refresh_keeps_the_stale_value(cache, httpx_mock):
+    from app.modules.context import cache_key_for, research_context
+
+    key = cache_key_for("서울", "2025-06-15")
+    stored = {"events": [], "summary": "기존 맥락"}
+    await cache.set(key, stored, ttl_seconds=60, stale_grace_seconds=60)
+    await _make_stale(cache, key)
+    httpx_mock.add_response(status_code=400)
+
+    assert (await research_context("서울", "2025-06-15", cache)).summary == "기존 맥락"
+    await cache.wait_refreshes()
+
+    # 갱신 중 4xx는 부정 항목으로 저장되지 않음
+    cache._l1.clear()
+    assert await cache.get(key) == stored
+    assert len(httpx_mock.get_requests()) == 1
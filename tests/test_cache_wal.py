@@ -0,0 +1,93 @@
+"""Tests for WAL mode, the read connection pool and group-committed writes."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import aiosqlite
+import pytest
+from pydantic import ValidationError
+
+from app.cache.store import CacheStore
+from app.config import Settings, settings
+from app.utils.metrics import cache_errors
+
+
+@pytest.fixture
+async def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_read_pool_size", 2)
+    monkeypatch.setattr(settings, "cache_l1_max_entries", 0)
+    store = CacheStore(str(tmp_path / "cache.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+async def test_database_uses_wal(cache):
+    async with cache._db.execute("PRAGMA journal_mode") as cur:
+        assert (await cur.fetchone())[0] == "wal"
+    async with cache._db.execute("PRAGMA synchronous") as cur:
+        assert (await cur.fetchone())[0] == 1  # NORMAL
+
+
+async def test_read_connections_are_read_only(cache):
+    assert len(cache._readers) == 2
+    with pytest.raises(aiosqlite.OperationalError):
+        await cache._readers[0].execute("DELETE FROM cache")
+
+
+async def test_reads_see_committed_writes(cache):
+    await cache.set("geocode:1:1", {"place": "Seoul"})
+    assert await cache.get("geocode:1:1") == {"place": "Seoul"}
+    assert (await cache.stats())["entry_count"] == 1
+
+
+async def test_concurrent_sets_share_one_commit(cache):
+    commit = AsyncMock(wraps=cache._db.commit)
+    with patch.object(cache._db, "commit", commit):
+        await asyncio.gather(*(cache.set(f"geocode:{i}:0", {"i": i}) for i in range(20)))
+    assert commit.await_count == 1
+    assert (await cache.stats())["entry_count"] == 20
+
+
+async def test_failed_batch_does_not_raise_or_populate_l1(cache, monkeypatch):
+    cache._l1.max_entries = 10
+    cache._db.executemany = AsyncMock(side_effect=aiosqlite.DatabaseError("disk full"))
+    before = cache_errors.labels(operation="set")._value.get()
+    await asyncio.gather(cache.set("geocode:a", {"x": 1}), cache.set("geocode:b", {"x": 2}))
+    assert cache_errors.labels(operation="set")._value.get() - before == 1
+    assert len(cache._l1) == 0
+
+
+async def test_close_flushes_pending_writes(tmp_path):
+    path = str(tmp_path / "flush.db")
+    store = CacheStore(path)
+    await store.init()
+    task = asyncio.create_task(store.set("geocode:9:9", {"x": 9}))
+    await asyncio.sleep(0)
+    await store.close()
+    await task
+
+    reopened = CacheStore(path)
+    await reopened.init()
+    try:
+        assert await reopened.get("geocode:9:9") == {"x": 9}
+    finally:
+        await reopened.close()
+
+
+async def test_memory_database_skips_read_pool():
+    store = CacheStore(":memory:")
+    await store.init()
+    try:
+        assert store._readers == []
+        await store.set("geocode:1:1", {"x": 1})
+        store._l1.clear()
+        assert await store.get("geocode:1:1") == {"x": 1}
+    finally:
+        await store.close()
+
+
+def test_invalid_synchronous_rejected(monkeypatch):
+    monkeypatch.setenv("CACHE_SQLITE_SYNCHRONOUS", "sometimes")
+    with pytest.raises(ValidationError, match="cache_sqlite_synchronous"):
+        Settings()
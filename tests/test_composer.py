@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -411,7 +412,7 @@ async def test_compose_describer_fail_context_ok(mock_geo, mock_lc, mock_desc, m
 @patch("app.services.composer.landcover")
 @patch("app.services.composer.geocoder")
 async def test_compose_timing_logs_emitted(mock_geo, mock_lc, mock_desc, mock_ctx, cache):
-    """Phase 타이밍 로그(phase1_complete, phase2_complete, compose_complete)가 출력되는지 검증."""
+    """모듈별 타이밍 로그(module_complete)와 compose_complete가 출력되는지 검증."""
     mock_geo.geocode = AsyncMock(
         return_value=Location(
             country="대한민국",
@@ -431,8 +432,15 @@ async def test_compose_timing_logs_emitted(mock_geo, mock_lc, mock_desc, mock_ct
         await compose_description(_make_request(), cache)
 
     event_names = [log["event"] for log in logs]
-    assert "phase1_complete" in event_names
-    assert "phase2_complete" in event_names
+    module_logs = [entry for entry in logs if entry["event"] == "module_complete"]
+    assert {entry["module"] for entry in module_logs} == {
+        "geocoder",
+        "landcover",
+        "mission",
+        "describer",
+        "context",
+    }
+    assert all(isinstance(entry["duration_ms"], int) for entry in module_logs)
     assert "compose_complete" in event_names
 
     compose_log = next(entry for entry in logs if entry["event"] == "compose_complete")
@@ -462,3 +470,256 @@ async def test_safe_call_logs_external_call_failed_event(
     assert len(error_logs) == 1
     assert error_logs[0]["service"] == "geocoder"
     assert "network error" in error_logs[0]["error"]
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_context_does_not_wait_for_landcover(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache
+):
+    """context는 geocoder에만 의존하므로 느린 landcover를 기다리지 않는다."""
+    landcover_done = asyncio.Event()
+    context_started_before_landcover = None
+
+    async def _slow_landcover(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        landcover_done.set()
+        return LandCover(classes=[], summary="정보 없음")
+
+    async def _context(*args, **kwargs):
+        nonlocal context_started_before_landcover
+        context_started_before_landcover = not landcover_done.is_set()
+        return Context(events=[], summary="없음")
+
+    mock_geo.geocode = AsyncMock(return_value=None)
+    mock_lc.get_land_cover = AsyncMock(side_effect=_slow_landcover)
+    mock_desc.describe_image = AsyncMock(return_value=("설명", False))
+    mock_ctx.research_context = AsyncMock(side_effect=_context)
+
+    result = await compose_description(_make_request(), cache)
+
+    assert context_started_before_landcover is True
+    assert result.description == "설명"
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_module_deadline_returns_partial_result(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache, monkeypatch
+):
+    """모듈이 자신의 마감을 넘기면 취소되고 나머지 결과는 경고와 함께 반환된다."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "timeout_landcover", 0.05)
+    cancelled = False
+
+    async def _hanging_landcover(*args, **kwargs):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    mock_geo.geocode = AsyncMock(return_value=None)
+    mock_lc.get_land_cover = AsyncMock(side_effect=_hanging_landcover)
+    mock_desc.describe_image = AsyncMock(return_value=("설명", False))
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="없음"))
+    _breakers["landcover"]._failure_count = 0
+
+    result = await asyncio.wait_for(compose_description(_make_request(), cache), timeout=2)
+
+    assert cancelled is True
+    assert result.land_cover is None
+    assert result.description == "설명"
+    assert any(w.module == "landcover" and "Deadline exceeded" in w.error for w in result.warnings)
+    # describer는 landcover 실패 시 기본 요약으로 실행됨
+    assert mock_desc.describe_image.call_args.args[3] == "정보 없음"
+    await _breakers["landcover"].record_success()
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_request_budget_caps_module_deadlines(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache, monkeypatch
+):
+    """요청 전체 예산이 모듈 timeout보다 짧으면 예산 소진 시점에 부분 결과를 반환한다."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "request_timeout", 1.1)
+    monkeypatch.setattr(settings, "compose_deadline_margin", 1.0)
+
+    async def _hanging_describe(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_geo.geocode = AsyncMock(return_value=None)
+    mock_lc.get_land_cover = AsyncMock(return_value=LandCover(classes=[], summary="정보 없음"))
+    mock_desc.describe_image = AsyncMock(side_effect=_hanging_describe)
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="없음"))
+
+    result = await asyncio.wait_for(compose_description(_make_request(), cache), timeout=2)
+
+    assert result.description is None
+    assert result.land_cover is not None
+    assert result.context is not None
+    assert [w.module for w in result.warnings] == ["describer"]
+    await _breakers["describer"].record_success()
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_prepares_image_in_parallel_with_phase1(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache
+):
+    """썸네일 준비는 geocoder 완료를 기다리지 않고 요청 시작과 함께 실행된다."""
+    geocode_done = asyncio.Event()
+    prepared_before_geocode = None
+
+    async def _slow_geocode(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        geocode_done.set()
+
+    async def _prepare(thumbnail):
+        nonlocal prepared_before_geocode
+        prepared_before_geocode = not geocode_done.is_set()
+        return b"resized"
+
+    async def _describe(*args, image=None, **kwargs):
+        assert await image == b"resized"
+        return "설명", False
+
+    mock_geo.geocode = AsyncMock(side_effect=_slow_geocode)
+    mock_lc.get_land_cover = AsyncMock(return_value=None)
+    mock_desc.prepare_image = AsyncMock(side_effect=_prepare)
+    mock_desc.describe_image = AsyncMock(side_effect=_describe)
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="없음"))
+
+    result = await compose_description(_make_request(), cache)
+
+    assert prepared_before_geocode is True
+    mock_desc.prepare_image.assert_awaited_once_with("dGVzdA==")
+    assert result.description == "설명"
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_speculative_describer_start(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache, monkeypatch
+):
+    """phase 1이 예산 내에 끝나지 않으면 좌표만으로 describer를 먼저 시작한다."""
+    from app.config import settings
+    from app.utils.metrics import describer_starts
+
+    monkeypatch.setattr(settings, "describer_speculate_after", 0.01)
+    geocode_done = asyncio.Event()
+    describer_started_before_geocode = None
+
+    async def _slow_geocode(*args, **kwargs):
+        await asyncio.sleep(0.1)
+        geocode_done.set()
+        return Location(
+            country="대한민국",
+            country_code="kr",
+            region="서울",
+            city="중구",
+            place_name="서울특별시",
+            lat=37.566,
+            lon=126.978,
+        )
+
+    async def _describe(*args, **kwargs):
+        nonlocal describer_started_before_geocode
+        describer_started_before_geocode = not geocode_done.is_set()
+        return "설명", False
+
+    mock_geo.geocode = AsyncMock(side_effect=_slow_geocode)
+    mock_lc.get_land_cover = AsyncMock(return_value=LandCover(classes=[], summary="산림 80%"))
+    mock_desc.describe_image = AsyncMock(side_effect=_describe)
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="없음"))
+    before = describer_starts.labels(mode="speculative")._value.get()
+
+    result = await compose_description(_make_request(), cache)
+
+    assert describer_started_before_geocode is True
+    # 미완료 입력은 좌표 기반 대체값, 완료된 landcover는 그대로 사용
+    args = mock_desc.describe_image.call_args.args
+    assert args[1] == "37.566, 126.978"
+    assert args[3] == "산림 80%"
+    assert describer_starts.labels(mode="speculative")._value.get() - before == 1
+    assert mock_desc.describe_image.call_args.kwargs["speculative"] is True
+    # 응답에는 나중에 끝난 geocoder 결과도 포함됨
+    assert result.location.place_name == "서울특별시"
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_skips_image_prep_when_description_cached(
+    mock_geo, mock_lc, mock_desc, mock_ctx, cache
+):
+    """설명이 캐시되어 있으면 썸네일을 준비하지 않는다."""
+    from app.modules.describer import cache_key_for
+
+    await cache.set(cache_key_for("cog-1"), {"description": "캐시된 설명"})
+    mock_geo.geocode = AsyncMock(return_value=None)
+    mock_lc.get_land_cover = AsyncMock(return_value=None)
+    mock_desc.cache_key_for = cache_key_for
+    mock_desc.prepare_image = AsyncMock(return_value=b"resized")
+    mock_desc.describe_image = AsyncMock(return_value=("캐시된 설명", True))
+    mock_ctx.research_context = AsyncMock(return_value=None)
+    request = _make_request().model_copy(update={"cog_image_id": "cog-1"})
+
+    result = await compose_description(request, cache)
+
+    assert result.description == "캐시된 설명"
+    mock_desc.prepare_image.assert_not_called()
+    assert mock_desc.describe_image.call_args.kwargs["image"] is None
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_compose_coalesced_describer_survives_first_request_cancel(
+    mock_geo, mock_lc, mock_ctx, cache, monkeypatch
+):
+    """먼저 시작한 요청이 끝나며 이미지 준비를 취소해도 합류한 요청의 describe는 끝난다."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "timeout_describer", 0.1)
+    mock_geo.geocode = AsyncMock(return_value=None)
+    mock_lc.get_land_cover = AsyncMock(return_value=None)
+    mock_ctx.research_context = AsyncMock(return_value=None)
+    calls = 0
+
+    async def _prepare(thumbnail):
+        nonlocal calls
+        calls += 1
+        if calls == 1:  # 첫 요청의 준비만 마감을 넘김
+            await asyncio.sleep(1)
+        return b"resized"
+
+    first = _make_request().model_copy(update={"cog_image_id": "cog-shared"})
+    second = first.model_copy(update={"coordinates": [127.0, 37.5]})
+    with (
+        patch("app.modules.describer.prepare_image", side_effect=_prepare),
+        patch("app.modules.describer._call_gemini", new=AsyncMock(return_value="공유 설명")),
+    ):
+        task_a = asyncio.create_task(compose_description(first, cache))
+        await asyncio.sleep(0.05)
+        result_b = await compose_description(second, cache)
+        result_a = await task_a
+
+    assert result_a.description is None  # 첫 요청은 describer 마감 초과
+    assert result_b.description == "공유 설명"
+    assert calls == 3  # 두 요청의 준비 + 공유 실행의 재준비
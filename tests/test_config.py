@@ -190,6 +190,7 @@ class TestPositiveIntValidation:
             "HEALTH_TIMEOUT",
             "CACHE_CLEANUP_POLL_INTERVAL",
             "OVERPASS_TIMEOUT",
+            "GEMINI_MAX_IN_FLIGHT",
         ],
     )
     def test_zero_rejected(self, field):
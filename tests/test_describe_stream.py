@@ -0,0 +1,152 @@
+"""Tests for the SSE streaming variant of /describe."""
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes import limiter as routes_limiter
+from app.api.schemas import Context, LandCover, LandCoverClass, Location
+from app.cache.store import CacheStore
+from app.main import app
+
+
+@pytest.fixture
+async def client(tmp_path):
+    cache = CacheStore(str(tmp_path / "test.db"))
+    await cache.init()
+    app.state.cache = cache
+    routes_limiter.reset()
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"X-API-Key": os.environ["API_KEY"]},
+    ) as c:
+        yield c
+    routes_limiter.reset()
+    await cache.close()
+
+
+def _parse_sse(text: str) -> list[tuple[str, object]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _location():
+    return Location(
+        country="대한민국",
+        country_code="kr",
+        region="서울",
+        city="중구",
+        place_name="서울특별시",
+        lat=37.566,
+        lon=126.978,
+    )
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_stream_emits_module_events_then_summary(
+    mock_geo, mock_lc, mock_desc, mock_ctx, client
+):
+    async def _slow_describe(*args, **kwargs):
+        await asyncio.sleep(0.02)
+        return "위성영상 설명입니다.", False
+
+    mock_geo.geocode = AsyncMock(return_value=_location())
+    mock_lc.get_land_cover = AsyncMock(
+        return_value=LandCover(
+            classes=[LandCoverClass(type="residential", label="주거지역", percentage=60)],
+            summary="주거지역 60%",
+        )
+    )
+    mock_desc.describe_image = AsyncMock(side_effect=_slow_describe)
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="요약"))
+
+    resp = await client.post(
+        "/api/v1/describe/stream",
+        json={"thumbnail": "dGVzdA==", "coordinates": [126.978, 37.566]},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(resp.text)
+    names = [name for name, _ in events]
+    assert set(names) == {"location", "land_cover", "mission", "context", "description", "summary"}
+    assert names[-1] == "summary"
+    # describer는 phase 1 이후에 완료되므로 location/land_cover보다 뒤에 온다
+    assert names.index("description") > names.index("location")
+    assert names.index("description") > names.index("land_cover")
+
+    payloads = dict(events)
+    assert payloads["location"]["country"] == "대한민국"
+    assert payloads["land_cover"]["summary"] == "주거지역 60%"
+    assert payloads["mission"] is None
+    assert payloads["description"] == {"description": "위성영상 설명입니다.", "cached": False}
+    assert payloads["summary"]["description"] == "위성영상 설명입니다."
+    assert payloads["summary"]["location"]["region"] == "서울"
+
+
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_stream_failed_module_sends_null_and_warning(
+    mock_geo, mock_lc, mock_desc, mock_ctx, client
+):
+    mock_geo.geocode = AsyncMock(side_effect=Exception("Nominatim timeout"))
+    mock_lc.get_land_cover = AsyncMock(return_value=LandCover(classes=[], summary="정보 없음"))
+    mock_desc.describe_image = AsyncMock(return_value=("설명", False))
+    mock_ctx.research_context = AsyncMock(return_value=Context(events=[], summary="요약"))
+
+    resp = await client.post(
+        "/api/v1/describe/stream",
+        json={"thumbnail": "dGVzdA==", "coordinates": [126.978, 37.566]},
+    )
+
+    payloads = dict(_parse_sse(resp.text))
+    assert payloads["location"] is None
+    assert any(w["module"] == "geocoder" for w in payloads["summary"]["warnings"])
+
+
+@patch("app.api.routes._save_result", new_callable=AsyncMock)
+@patch("app.services.composer.context")
+@patch("app.services.composer.describer")
+@patch("app.services.composer.landcover")
+@patch("app.services.composer.geocoder")
+async def test_stream_unexpected_error_sends_error_event(
+    mock_geo, mock_lc, mock_desc, mock_ctx, mock_save, client
+):
+    mock_geo.geocode = AsyncMock(return_value=_location())
+    mock_lc.get_land_cover = AsyncMock(return_value=None)
+    mock_desc.describe_image = AsyncMock(return_value=("설명", False))
+    mock_ctx.research_context = AsyncMock(return_value=None)
+    mock_save.side_effect = RuntimeError("db down")
+
+    resp = await client.post(
+        "/api/v1/describe/stream",
+        json={"thumbnail": "dGVzdA==", "coordinates": [126.978, 37.566]},
+    )
+
+    events = _parse_sse(resp.text)
+    name, payload = events[-1]
+    assert name == "error"
+    assert payload["status"] == 500
+    assert "summary" not in [n for n, _ in events]
+
+
+async def test_stream_requires_auth():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        resp = await c.post(
+            "/api/v1/describe/stream",
+            json={"thumbnail": "dGVzdA==", "coordinates": [126.978, 37.566]},
+        )
+    assert resp.status_code == 401
@@ -15,7 +15,9 @@ from app.modules.describer import (
     _resize_for_gemini_sync,
     _validate_host_ips,
     _validate_thumbnail_url,
+    cache_key_for,
     describe_image,
+    prepare_image,
 )
 
 
@@ -43,14 +45,14 @@ async def cache(tmp_path):
 
 
 @patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
-@patch("app.modules.describer.genai")
-async def test_describe_image(mock_genai, _mock_resize, cache):
+@patch("app.gemini_client.get_client")
+async def test_describe_image(mock_get_client, _mock_resize, cache):
     mock_response = MagicMock()
     mock_response.text = "  서울 도심의 위성영상입니다.  "
 
     mock_client = MagicMock()
-    mock_client.models.generate_content.return_value = mock_response
-    mock_genai.Client.return_value = mock_client
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
 
     thumbnail = base64.b64encode(b"fake-image-data").decode()
     result = await describe_image(thumbnail, "서울특별시", "2025-06-15", "주거지역 50%", cache)
@@ -58,11 +60,11 @@ async def test_describe_image(mock_genai, _mock_resize, cache):
     description, cached = result
     assert description == "서울 도심의 위성영상입니다."
     assert cached is False
-    mock_client.models.generate_content.assert_called_once()
+    mock_client.aio.models.generate_content.assert_awaited_once()
 
 
-@patch("app.modules.describer.genai")
-async def test_describe_image_cache_hit(mock_genai, cache):
+@patch("app.gemini_client.get_client")
+async def test_describe_image_cache_hit(mock_get_client, cache):
     # Pre-populate cache
     await cache.set("describe:test-id", {"description": "cached description"})
 
@@ -73,7 +75,7 @@ async def test_describe_image_cache_hit(mock_genai, cache):
     description, cached = result
     assert description == "cached description"
     assert cached is True
-    mock_genai.Client.assert_not_called()
+    mock_get_client.assert_not_called()
 
 
 @patch("app.modules.describer.socket.getaddrinfo")
@@ -169,14 +171,14 @@ def test_validate_thumbnail_url_no_hostname():
 
 
 @patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
-@patch("app.modules.describer.genai")
-async def test_describe_image_data_uri(mock_genai, _mock_resize, cache):
+@patch("app.gemini_client.get_client")
+async def test_describe_image_data_uri(mock_get_client, _mock_resize, cache):
     """data:image/... URI should be handled."""
     mock_response = MagicMock()
     mock_response.text = "  설명 텍스트  "
     mock_client = MagicMock()
-    mock_client.models.generate_content.return_value = mock_response
-    mock_genai.Client.return_value = mock_client
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
 
     img = Image.new("RGB", (10, 10))
     buf = io.BytesIO()
@@ -192,9 +194,9 @@ async def test_describe_image_data_uri(mock_genai, _mock_resize, cache):
 @patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
 @patch("app.modules.describer._download_image", new_callable=AsyncMock, return_value=b"image-data")
 @patch("app.modules.describer._validate_thumbnail_url")
-@patch("app.modules.describer.genai")
+@patch("app.gemini_client.get_client")
 async def test_describe_image_url_thumbnail(
-    mock_genai,
+    mock_get_client,
     _mock_validate,
     _mock_download,
     _mock_resize,
@@ -204,8 +206,8 @@ async def test_describe_image_url_thumbnail(
     mock_response = MagicMock()
     mock_response.text = "  URL 영상 설명  "
     mock_client = MagicMock()
-    mock_client.models.generate_content.return_value = mock_response
-    mock_genai.Client.return_value = mock_client
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
 
     desc, cached = await describe_image(
         "https://example.com/image.jpg", "서울", "2025-01-01", "summary", cache
@@ -216,14 +218,14 @@ async def test_describe_image_url_thumbnail(
 
 
 @patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
-@patch("app.modules.describer.genai")
-async def test_describe_image_caches_result(mock_genai, _mock_resize, cache):
+@patch("app.gemini_client.get_client")
+async def test_describe_image_caches_result(mock_get_client, _mock_resize, cache):
     """Result should be cached when cog_image_id is provided."""
     mock_response = MagicMock()
     mock_response.text = "  캐시 테스트  "
     mock_client = MagicMock()
-    mock_client.models.generate_content.return_value = mock_response
-    mock_genai.Client.return_value = mock_client
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
 
     desc, cached = await describe_image(
         "dGVzdA==", "서울", "2025-01-01", "summary", cache, cog_image_id="cache-test-id"
@@ -236,6 +238,29 @@ async def test_describe_image_caches_result(mock_genai, _mock_resize, cache):
     assert stored["description"] == "캐시 테스트"
 
 
+@patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
+@patch("app.gemini_client.get_client")
+async def test_speculative_description_is_not_cached(mock_get_client, _mock_resize, cache):
+    """좌표만으로 만든 추측 설명은 전체 맥락 설명 대신 캐시되지 않는다."""
+    mock_response = MagicMock()
+    mock_response.text = "좌표 기반 설명"
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
+
+    desc, cached = await describe_image(
+        "dGVzdA==",
+        "37.566, 126.978",
+        "2025-01-01",
+        "정보 없음",
+        cache,
+        cog_image_id="speculative-id",
+        speculative=True,
+    )
+    assert (desc, cached) == ("좌표 기반 설명", False)
+    assert await cache.get(cache_key_for("speculative-id")) is None
+
+
 async def test_download_image_success(httpx_mock):
     """Successful image download."""
     httpx_mock.add_response(url="https://example.com/img.jpg", content=b"image-bytes")
@@ -312,3 +337,31 @@ class TestDescriberSettings:
         )
         with pytest.raises(ValueError, match="Image too large"):
             await _download_image("https://example.com/large.jpg")
+
+
+@patch("app.modules.describer.prepare_image", new_callable=AsyncMock)
+@patch("app.gemini_client.get_client")
+async def test_describe_image_uses_prepared_image(mock_get_client, mock_prepare, cache):
+    """이미 시작된 썸네일 준비 결과가 주어지면 다시 준비하지 않는다."""
+    mock_response = MagicMock()
+    mock_response.text = "준비된 이미지 설명"
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+    mock_get_client.return_value = mock_client
+
+    async def _prepared():
+        return b"prepared"
+
+    desc, cached = await describe_image(
+        "dGVzdA==", "서울", "2025-01-01", "summary", cache, image=_prepared()
+    )
+    assert desc == "준비된 이미지 설명"
+    mock_prepare.assert_not_called()
+
+
+@patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
+async def test_prepare_image_decodes_and_resizes(mock_resize):
+    result = await prepare_image(base64.b64encode(b"raw-bytes").decode())
+    assert result == b"resized"
+    mock_resize.assert_awaited_once()
+    assert mock_resize.call_args.args[0] == b"raw-bytes"
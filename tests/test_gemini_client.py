@@ -0,0 +1,85 @@
+"""Tests for the shared async Gemini client (bounded in-flight concurrency)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import app.gemini_client as gemini_mod
+from app.config import settings
+from app.utils.metrics import gemini_calls_in_flight, gemini_calls_queued
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    gemini_mod._client = None
+    gemini_mod._semaphore = None
+    yield
+    gemini_mod._client = None
+    gemini_mod._semaphore = None
+
+
+def test_get_client_returns_same_instance():
+    client1 = gemini_mod.get_client()
+    client2 = gemini_mod.get_client()
+    assert client1 is client2
+
+
+async def test_close_client_resets_instance():
+    client1 = gemini_mod.get_client()
+    await gemini_mod.close_client()
+    assert gemini_mod._client is None
+    assert gemini_mod.get_client() is not client1
+
+
+async def test_generate_content_uses_async_api():
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(return_value="resp")
+    with patch.object(gemini_mod, "get_client", return_value=mock_client):
+        result = await gemini_mod.generate_content(model="m", contents=["x"])
+    assert result == "resp"
+    mock_client.aio.models.generate_content.assert_awaited_once_with(model="m", contents=["x"])
+    mock_client.models.generate_content.assert_not_called()
+
+
+async def test_generate_content_bounded_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "gemini_max_in_flight", 2)
+    release = asyncio.Event()
+    current = 0
+    max_concurrent = 0
+
+    async def _slow_call(**kwargs):
+        nonlocal current, max_concurrent
+        current += 1
+        max_concurrent = max(max_concurrent, current)
+        await release.wait()
+        current -= 1
+        return "ok"
+
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = _slow_call
+    queued_before = gemini_calls_queued._value.get()
+    in_flight_before = gemini_calls_in_flight._value.get()
+
+    with patch.object(gemini_mod, "get_client", return_value=mock_client):
+        tasks = [asyncio.create_task(gemini_mod.generate_content()) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert gemini_calls_in_flight._value.get() - in_flight_before == 2
+        assert gemini_calls_queued._value.get() - queued_before == 3
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+    assert results == ["ok"] * 5
+    assert max_concurrent == 2
+    assert gemini_calls_in_flight._value.get() == in_flight_before
+    assert gemini_calls_queued._value.get() == queued_before
+
+
+async def test_generate_content_releases_gauges_on_error():
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=RuntimeError("boom"))
+    in_flight_before = gemini_calls_in_flight._value.get()
+    with patch.object(gemini_mod, "get_client", return_value=mock_client):
+        with pytest.raises(RuntimeError):
+            await gemini_mod.generate_content()
+    assert gemini_calls_in_flight._value.get() == in_flight_before
@@ -0,0 +1,24 @@
+"""Tests for the shared GeoJSON polygon helpers."""
+
+from app.utils.geo import in_rings, polygon_rings
+
+SQUARE = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+HOLE = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]
+
+
+def test_polygon_rings_flattens_coordinates():
+    rings = polygon_rings({"type": "Polygon", "coordinates": [[[0, 0, 5], [1, 0], [0, 1]]]})
+    assert rings == [[0, 0, 1, 0, 0, 1]]
+
+
+def test_multipolygon_and_other_types():
+    multi = {"type": "MultiPolygon", "coordinates": [[SQUARE], [HOLE]]}
+    assert len(polygon_rings(multi)) == 2
+    assert polygon_rings({"type": "Point", "coordinates": [0, 0]}) == []
+
+
+def test_in_rings_respects_holes():
+    rings = polygon_rings({"type": "Polygon", "coordinates": [SQUARE, HOLE]})
+    assert in_rings(2, 2, rings)
+    assert not in_rings(5, 5, rings)
+    assert not in_rings(11, 5, rings)
@@ -0,0 +1,222 @@
+"""Tests for bulk reverse geocoding with cell-level deduplication."""
+
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.routes import limiter as routes_limiter
+from app.cache.negative import NOT_FOUND, CachedUpstreamError
+from app.cache.store import CacheStore
+from app.config import settings
+from app.main import app
+from app.modules import geocoder, offline_geocoder
+from app.utils.metrics import geocode_bulk_points
+
+SEOUL = {
+    "country": "대한민국",
+    "country_code": "kr",
+    "region": "서울특별시",
+    "city": "중구",
+    "place_name": "서울특별시 중구",
+    "lat": 37.566,
+    "lon": 126.978,
+}
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "test.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+@pytest.fixture
+async def client(cache):
+    app.state.cache = cache
+    routes_limiter.reset()
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"X-API-Key": os.environ["API_KEY"]},
+    ) as c:
+        yield c
+    routes_limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(offline_geocoder, "_index", None)
+    monkeypatch.setattr(settings, "nominatim_rate_per_second", 1000.0)
+    monkeypatch.setattr(geocoder, "_buckets", {})
+
+
+@pytest.fixture
+def nominatim(httpx_mock):
+    requests = []
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        requests.append((request.url.params["lon"], request.url.params["lat"]))
+        return httpx.Response(
+            200,
+            json={
+                "display_name": "부산광역시, 대한민국",
+                "address": {"country": "대한민국", "state": "부산광역시"},
+            },
+        )
+
+    httpx_mock.add_callback(_respond, is_reusable=True, is_optional=True)
+    return requests
+
+
+def _points(source: str) -> float:
+    return geocode_bulk_points.labels(source=source)._value.get()
+
+
+async def _collect(points, cache):
+    return [item async for item in geocoder.geocode_many(points, cache)]
+
+
+class TestGeocodeMany:
+    async def test_dedupes_cells_and_reads_cache_in_bulk(self, cache, nominatim):
+        await cache.set(geocoder.cache_key_for(126.978, 37.566), SEOUL)
+        before = {s: _points(s) for s in ("cache", "miss", "duplicate")}
+        points = [
+            (129.0751, 35.1791),
+            (126.9781, 37.5661),
+            (129.0752, 35.1792),  # 첫 번째 좌표와 같은 셀
+            (126.978, 37.566),
+        ]
+
+        results = await _collect(points, cache)
+
+        assert [i for i, _ in results] == [0, 1, 2, 3]
+        assert [r.region for _, r in results] == ["부산광역시", "서울특별시"] * 2
+        # 좌표는 각 지점의 값
+        assert [(r.lon, r.lat) for _, r in results] == points
+        assert len(nominatim) == 1
+        assert {s: _points(s) - before[s] for s in before} == {
+            "cache": 2,
+            "miss": 1,
+            "duplicate": 1,
+        }
+
+    async def test_failures_are_per_point(self, cache, httpx_mock, monkeypatch):
+        monkeypatch.setattr(settings, "cache_negative_ttl_seconds", 300)
+        await cache.set_negative(geocoder.cache_key_for(0.0, 0.0), NOT_FOUND)
+        httpx_mock.add_response(status_code=400)
+        await cache.set(geocoder.cache_key_for(126.978, 37.566), SEOUL)
+
+        results = await _collect([(0.0, 0.0), (10.0, 10.0), (126.978, 37.566)], cache)
+
+        assert isinstance(results[0][1], CachedUpstreamError)
+        assert isinstance(results[1][1], httpx.HTTPStatusError)
+        assert results[2][1].city == "중구"
+
+    async def test_misses_are_bounded_by_concurrency(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "geocode_bulk_concurrency", 2)
+        active = peak = 0
+
+        async def _uncached(lon, lat, cache_key, cache):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return geocoder._unknown_location(lon, lat)
+
+        monkeypatch.setattr(geocoder, "_geocode_uncached", _uncached)
+        results = await _collect([(float(i), 0.0) for i in range(6)], cache)
+
+        assert len(results) == 6
+        assert peak == 2
+
+    async def test_closing_the_stream_drops_queued_cells(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "geocode_bulk_concurrency", 1)
+        calls = []
+
+        async def _uncached(lon, lat, cache_key, cache):
+            calls.append(lon)
+            # 이미 보낸 조회는 single-flight 공유 작업이라 끝까지 진행되고 캐시에 남는다
+            await asyncio.sleep(0.05 if lon else 0)
+            return geocoder._unknown_location(lon, lat)
+
+        monkeypatch.setattr(geocoder, "_geocode_uncached", _uncached)
+        stream = geocoder.geocode_many([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)], cache)
+        assert (await anext(stream))[0] == 0
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+
+        assert calls == [0.0, 1.0]
+
+
+class TestEndpoint:
+    async def test_streams_ndjson_in_input_order(self, client, cache, nominatim):
+        await cache.set(geocoder.cache_key_for(126.978, 37.566), SEOUL)
+
+        resp = await client.post(
+            "/api/v1/geocode/bulk",
+            json={"coordinates": [[129.075, 35.179], [126.978, 37.566], [129.0751, 35.1791]]},
+        )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[1]["location"]["city"] == "중구"
+        assert lines[2]["location"]["region"] == "부산광역시"
+        assert all(line["error"] is None for line in lines)
+        assert len(nominatim) == 1
+
+    async def test_error_lines(self, client, httpx_mock):
+        httpx_mock.add_response(status_code=400)
+        resp = await client.post("/api/v1/geocode/bulk", json={"coordinates": [[1.0, 2.0]]})
+        line = json.loads(resp.text)
+        assert line["location"] is None
+        assert line["error"]["error_type"] == "service"
+
+    async def test_timeout_ends_with_error_line(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "request_timeout", 0.05)
+
+        async def _uncached(lon, lat, cache_key, cache):
+            if lon:
+                await asyncio.sleep(1)
+            return geocoder._unknown_location(lon, lat)
+
+        monkeypatch.setattr(geocoder, "_geocode_uncached", _uncached)
+        resp = await client.post(
+            "/api/v1/geocode/bulk", json={"coordinates": [[0.0, 0.0], [1.0, 0.0]]}
+        )
+
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines[0]["index"] == 0
+        assert lines[-1] == {
+            "error": {
+                "status": 504,
+                "title": "Gateway Timeout",
+                "detail": "요청 처리 시간이 초과되었습니다",
+            }
+        }
+
+    async def test_unexpected_error_ends_with_error_line(self, client, monkeypatch):
+        async def _uncached(lon, lat, cache_key, cache):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(geocoder, "_geocode_uncached", _uncached)
+        resp = await client.post("/api/v1/geocode/bulk", json={"coordinates": [[1.0, 2.0]]})
+
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["error"]["status"] == 500
+
+    @pytest.mark.parametrize(
+        "coordinates",
+        [[], [[1.0]], [[200.0, 0.0]], [[0.0, 0.0]] * 1001],
+    )
+    async def test_rejects_invalid_requests(self, client, coordinates):
+        resp = await client.post("/api/v1/geocode/bulk", json={"coordinates": coordinates})
+        assert resp.status_code == 422
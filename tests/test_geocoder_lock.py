@@ -1,41 +1,91 @@
-"""Tests for geocoder rate-limiting Lock (#262)."""
+"""Tests for the Nominatim send-slot limiter (#262): only the send is rate limited."""
 
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.modules.geocoder import _lock
+import pytest
 
+from app.api.schemas import Warning
+from app.config import settings
+from app.modules import geocoder
+from app.services.composer import _breakers, _safe_call
+from app.utils.token_bucket import RateLimitQueueFullError
 
-class TestGeocoderLock:
-    def test_lock_is_asyncio_lock(self):
-        assert isinstance(_lock, asyncio.Lock)
 
-    async def test_concurrent_requests_serialized(self):
-        """Concurrent geocode calls should be serialized by the Lock."""
-        call_times = []
+@pytest.fixture
+def fast_limiter(monkeypatch):
+    monkeypatch.setattr(geocoder, "_buckets", {})
+    monkeypatch.setattr(settings, "nominatim_rate_per_second", 10.0)
 
-        def make_resp():
-            resp = MagicMock()
-            resp.json.return_value = {"address": {"country": "Korea"}, "display_name": "Seoul"}
-            resp.raise_for_status.return_value = None
-            return resp
 
-        async def mock_fetch(*args, **kwargs):
-            call_times.append(asyncio.get_running_loop().time())
-            return make_resp()
+def _cache():
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+    cache.index_point = AsyncMock()
+    return cache
 
-        with patch("app.modules.geocoder._fetch_nominatim", side_effect=mock_fetch):
-            from app.cache.store import CacheStore
 
-            cache = AsyncMock(spec=CacheStore)
-            cache.get = AsyncMock(return_value=None)
-            cache.set = AsyncMock()
+def _fake_client(sends: list[float], slow_first: float = 0.0):
+    loop = asyncio.get_running_loop()
 
-            from app.modules.geocoder import geocode
+    async def _get(*args, **kwargs):
+        sends.append(loop.time())
+        if len(sends) == 1 and slow_first:
+            await asyncio.sleep(slow_first)
+        resp = MagicMock()
+        resp.json.return_value = {"address": {"country": "Korea"}, "display_name": "Seoul"}
+        return resp
 
-            await asyncio.gather(
-                geocode(126.0, 37.0, cache),
-                geocode(127.0, 38.0, cache),
-            )
-            # Both calls should have completed (serialized by lock)
-            assert len(call_times) == 2
+    client = MagicMock()
+    client.get = _get
+    return AsyncMock(return_value=client)
+
+
+async def test_slow_response_does_not_block_next_send(fast_limiter):
+    sends: list[float] = []
+    with patch("app.modules.geocoder.get_client", _fake_client(sends, slow_first=0.5)):
+        await asyncio.gather(
+            geocoder.geocode(126.0, 37.0, _cache()),
+            geocoder.geocode(127.0, 38.0, _cache()),
+        )
+    assert len(sends) == 2
+    # 두 번째 전송은 첫 응답(0.5s)을 기다리지 않고 다음 토큰(0.1s)에 나간다
+    assert 0.05 <= sends[1] - sends[0] < 0.3
+
+
+async def test_sends_are_spaced_by_rate(fast_limiter):
+    sends: list[float] = []
+    with patch("app.modules.geocoder.get_client", _fake_client(sends)):
+        await asyncio.gather(*(geocoder.geocode(120.0 + i, 30.0, _cache()) for i in range(3)))
+    gaps = [b - a for a, b in zip(sends, sends[1:], strict=False)]
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+def test_mirror_has_its_own_bucket(fast_limiter, monkeypatch):
+    monkeypatch.setattr(settings, "nominatim_mirror_rate_per_second", 5.0)
+    primary = geocoder._bucket_for(None)
+    mirror = geocoder._bucket_for("http://mirror")
+    assert primary is not mirror
+    assert (primary.rate, mirror.rate) == (10.0, 5.0)
+    assert geocoder._bucket_for(None) is primary
+
+
+async def test_full_queue_is_a_warning_not_a_breaker_failure():
+    breaker = _breakers["geocoder"]
+
+    async def _rejected():
+        raise RateLimitQueueFullError("nominatim")
+
+    breaker._failure_count = 0
+    breaker._open_until = 0.0
+    warnings: list[Warning] = []
+    try:
+        for _ in range(breaker.failure_threshold + 1):
+            assert await _safe_call("geocoder", _rejected(), warnings) is None
+        assert not await breaker.is_open()
+        assert breaker._failure_count == 0
+    finally:
+        breaker._failure_count = 0
+        breaker._open_until = 0.0
+    assert warnings[0].error == "nominatim rate limiter queue is full"
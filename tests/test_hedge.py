@@ -0,0 +1,212 @@
+"""Tests for hedged upstream requests."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import app.utils.hedge as hedge_mod
+from app.config import settings
+from app.utils.hedge import HedgeBudget, hedged
+from app.utils.metrics import external_api_duration, hedged_requests, upstream_request_duration
+
+
+@pytest.fixture(autouse=True)
+def _hedging(monkeypatch):
+    monkeypatch.setattr(settings, "hedging_enabled", True)
+    monkeypatch.setattr(settings, "hedge_budget_ratio", 1.0)
+    monkeypatch.setattr(settings, "hedge_default_delay", 0.01)
+    monkeypatch.setattr(hedge_mod, "_budgets", {})
+
+
+def _outcome(service: str, outcome: str) -> float:
+    return hedged_requests.labels(service=service, outcome=outcome)._value.get()
+
+
+async def _after(delay: float, value):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestHedgeBudget:
+    def test_tokens_accumulate_by_ratio(self):
+        budget = HedgeBudget(ratio=0.5)
+        budget.deposit()
+        assert budget.withdraw() is False
+        budget.deposit()
+        assert budget.withdraw() is True
+        assert budget.withdraw() is False
+
+    def test_tokens_are_capped(self):
+        budget = HedgeBudget(ratio=1.0, max_tokens=2)
+        for _ in range(10):
+            budget.deposit()
+        assert budget.withdraw() and budget.withdraw()
+        assert budget.withdraw() is False
+
+
+class TestHedged:
+    async def test_disabled_runs_primary_only(self, monkeypatch):
+        monkeypatch.setattr(settings, "hedging_enabled", False)
+        backup = AsyncMock(return_value="hedge")
+        assert await hedged("svc-off", lambda: _after(0.03, "primary"), backup) == "primary"
+        backup.assert_not_called()
+
+    async def test_fast_primary_does_not_hedge(self):
+        backup = AsyncMock(return_value="hedge")
+        assert await hedged("svc-fast", lambda: _after(0, "primary"), backup) == "primary"
+        backup.assert_not_called()
+
+    async def test_slow_primary_loses_to_hedge(self):
+        cancelled = False
+
+        async def _slow():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            return "primary"
+
+        won_before = _outcome("svc-slow", "won")
+        result = await hedged("svc-slow", _slow, lambda: _after(0, "hedge"))
+        await asyncio.sleep(0)
+        assert result == "hedge"
+        assert cancelled
+        assert _outcome("svc-slow", "won") - won_before == 1
+
+    async def test_failed_hedge_falls_back_to_primary(self):
+        async def _fail():
+            raise ConnectionError("mirror down")
+
+        assert await hedged("svc-fail", lambda: _after(0.03, "primary"), _fail) == "primary"
+
+    async def test_both_fail_raises_primary_error(self):
+        async def _primary():
+            await asyncio.sleep(0.03)
+            raise TimeoutError("primary")
+
+        async def _backup():
+            raise ConnectionError("hedge")
+
+        with pytest.raises(TimeoutError):
+            await hedged("svc-both", _primary, _backup)
+
+    async def test_exhausted_budget_skips_hedge(self, monkeypatch):
+        monkeypatch.setattr(settings, "hedge_budget_ratio", 0.1)
+        backup = AsyncMock(return_value="hedge")
+        before = _outcome("svc-budget", "budget_exhausted")
+        assert await hedged("svc-budget", lambda: _after(0.03, "primary"), backup) == "primary"
+        backup.assert_not_called()
+        assert _outcome("svc-budget", "budget_exhausted") - before == 1
+
+
+def test_hedge_delay_uses_observed_p95(monkeypatch):
+    monkeypatch.setattr(settings, "hedge_min_samples", 20)
+    for _ in range(19):
+        upstream_request_duration.labels(service="svc-p95").observe(0.2)
+    # 표본이 부족하면 기본값
+    assert hedge_mod.hedge_delay("svc-p95") == settings.hedge_default_delay
+    upstream_request_duration.labels(service="svc-p95").observe(0.2)
+    assert hedge_mod.hedge_delay("svc-p95") == 0.25
+
+
+def test_hedge_delay_ignores_module_call_durations(monkeypatch):
+    # composer의 모듈 호출 시간(캐시 히트 포함)은 p95 계산에 쓰지 않음
+    monkeypatch.setattr(settings, "hedge_min_samples", 20)
+    for _ in range(100):
+        external_api_duration.labels(service="svc-hits").observe(0.001)
+    for _ in range(20):
+        upstream_request_duration.labels(service="svc-hits").observe(0.8)
+    assert hedge_mod.hedge_delay("svc-hits") == 1.0
+
+
+async def test_observe_upstream_records_failures_but_not_cancellation():
+    def _count():
+        return upstream_request_duration.labels(service="svc-observe")._sum.get(), sum(
+            b.get() for b in upstream_request_duration.labels(service="svc-observe")._buckets
+        )
+
+    async def _fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await hedge_mod.observe_upstream("svc-observe", _fail())
+    assert _count()[1] == 1
+
+    task = asyncio.create_task(hedge_mod.observe_upstream("svc-observe", asyncio.sleep(1)))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert _count()[1] == 1
+
+
+async def test_geocoder_hedges_only_to_configured_mirror(monkeypatch):
+    from app.modules import geocoder
+
+    # 다른 테스트가 기록한 geocoder 지연 분포와 무관하게 기본 hedge 지연 사용
+    monkeypatch.setattr(settings, "hedge_min_samples", 10**9)
+    calls = []
+
+    async def _fetch(lon, lat, base_url=None):
+        calls.append(base_url)
+        await asyncio.sleep(0.05 if base_url is None else 0)
+        resp = MagicMock()
+        resp.json.return_value = {"address": {"country": "Korea"}, "display_name": "Seoul"}
+        return resp
+
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+    cache.index_point = AsyncMock()
+
+    with patch.object(geocoder, "_fetch_nominatim", side_effect=_fetch):
+        await geocoder.geocode(10.0, 20.0, cache)
+        assert calls == [None]
+
+        monkeypatch.setattr(settings, "nominatim_mirror_url", "http://mirror")
+        calls.clear()
+        location = await geocoder.geocode(11.0, 21.0, cache)
+
+    assert calls == [None, "http://mirror"]
+    assert location.country == "Korea"
+
+
+@pytest.mark.parametrize(
+    ("module_name", "fetch_name", "mirror_setting"),
+    [
+        ("landcover", "_fetch_overpass", "overpass_mirror_url"),
+        ("mission", "_fetch_stac_item", "stac_mirror_url"),
+    ],
+)
+async def test_public_endpoints_are_not_hedged_without_mirror(
+    monkeypatch, module_name, fetch_name, mirror_setting
+):
+    from app.modules import landcover, mission
+
+    module = {"landcover": landcover, "mission": mission}[module_name]
+    monkeypatch.setattr(settings, "hedge_min_samples", 10**9)
+    monkeypatch.setattr(settings, mirror_setting, "")
+    calls = []
+
+    async def _fetch(arg, url=None):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        resp = MagicMock()
+        resp.json.return_value = {"elements": [], "properties": {}}
+        return resp
+
+    cache = MagicMock()
+    cache.set = AsyncMock()
+    cache.set_negative = AsyncMock()
+    cache.index_point = AsyncMock()
+
+    with patch.object(module, fetch_name, side_effect=_fetch):
+        if module_name == "landcover":
+            await landcover._land_cover_uncached(1.0, 2.0, "landcover:v1:1.0:2.0", cache)
+        else:
+            await mission._mission_uncached("S2A_X_L2A", "mission:v1:S2A_X_L2A", cache)
+
+    assert calls == [None]
@@ -0,0 +1,203 @@
+"""Tests for negative caching of failed upstream lookups."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from google.genai.errors import ClientError
+
+from app.api.schemas import Warning
+from app.cache.negative import (
+    CLIENT_ERROR,
+    INVALID_JSON,
+    NOT_FOUND,
+    CachedUpstreamError,
+    failure_outcome,
+    negative_outcome,
+)
+from app.cache.store import CacheStore
+from app.config import settings
+from app.modules.context import research_context
+from app.modules.describer import describe_image
+from app.modules.geocoder import geocode
+from app.modules.landcover import get_land_cover
+from app.modules.mission import get_mission_metadata
+from app.services.composer import _breakers, _safe_call
+from app.utils.metrics import cache_negative_hits
+
+STAC_ID = "S2C_T52SCG_20260225T022315_L2A"
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "test.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+def _negative_hits(module: str, outcome: str) -> float:
+    return cache_negative_hits.labels(module=module, outcome=outcome)._value.get()
+
+
+def _response(status: int) -> httpx.Response:
+    return httpx.Response(status, request=httpx.Request("GET", "https://example.com"))
+
+
+class TestFailureOutcome:
+    @pytest.mark.parametrize(
+        ("status", "expected"),
+        [
+            (404, NOT_FOUND),
+            (410, NOT_FOUND),
+            (400, CLIENT_ERROR),
+            (422, CLIENT_ERROR),
+            (401, None),
+            (403, None),
+            (407, None),
+            (429, None),
+            (503, None),
+        ],
+    )
+    def test_http_status(self, status, expected):
+        exc = httpx.HTTPStatusError(
+            "x", request=_response(status).request, response=_response(status)
+        )
+        assert failure_outcome(exc) == expected
+
+    def test_transient_errors_are_not_cached(self):
+        assert failure_outcome(httpx.ConnectTimeout("x")) is None
+        assert failure_outcome(ClientError(429, {"error": {"message": "quota"}})) is None
+
+    def test_gemini_client_error(self):
+        assert (
+            failure_outcome(ClientError(400, {"error": {"message": "bad image"}})) == CLIENT_ERROR
+        )
+
+    @pytest.mark.parametrize("code", [401, 403])
+    def test_gemini_credential_errors_are_not_cached(self, code):
+        assert failure_outcome(ClientError(code, {"error": {"message": "denied"}})) is None
+
+    async def test_forbidden_geocode_is_not_cached(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=403, is_reusable=True)
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await geocode(126.978, 37.566, cache)
+        assert len(httpx_mock.get_requests()) == 2
+
+
+class TestModules:
+    async def test_mission_not_found_is_replayed_locally(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=404)
+        before = _negative_hits("mission", NOT_FOUND)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await get_mission_metadata("UNKNOWN_ID", cache)
+        with pytest.raises(CachedUpstreamError, match="404") as exc_info:
+            await get_mission_metadata("UNKNOWN_ID", cache)
+
+        assert exc_info.value.outcome == NOT_FOUND
+        assert len(httpx_mock.get_requests()) == 1
+        assert _negative_hits("mission", NOT_FOUND) - before == 1
+
+    async def test_mission_invalid_json(self, cache, httpx_mock):
+        httpx_mock.add_response(text="<html>oops</html>")
+        assert await get_mission_metadata(STAC_ID, cache) is None
+        assert await get_mission_metadata(STAC_ID, cache) is None
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_geocoder_invalid_json(self, cache, httpx_mock):
+        httpx_mock.add_response(text="<html>Error</html>")
+        before = _negative_hits("geocode", INVALID_JSON)
+
+        first = await geocode(126.978, 37.566, cache)
+        second = await geocode(126.978, 37.566, cache)
+
+        assert first == second
+        assert second.country == "Unknown"
+        assert len(httpx_mock.get_requests()) == 1
+        assert _negative_hits("geocode", INVALID_JSON) - before == 1
+
+    async def test_landcover_client_error(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=400)
+        with pytest.raises(httpx.HTTPStatusError):
+            await get_land_cover(126.978, 37.566, cache)
+        with pytest.raises(CachedUpstreamError):
+            await get_land_cover(126.978, 37.566, cache)
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_context_failure_uses_short_ttl(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=400)
+        result = await research_context("서울", "2025-06-15", cache)
+        again = await research_context("서울", "2025-06-15", cache)
+
+        assert again == result
+        assert "찾지 못했습니다" in again.summary
+        assert len(httpx_mock.get_requests()) == 1
+        rows = await cache._db.execute_fetchall("SELECT expires_at, stale_at FROM cache")
+        (expires_at, stale_at) = rows[0]
+        assert stale_at is None
+        assert expires_at - time.time() <= settings.cache_negative_ttl_seconds
+
+    async def test_context_transient_failure_is_not_cached(self, cache, httpx_mock):
+        httpx_mock.add_exception(httpx.ConnectError("connection refused"))
+        httpx_mock.add_response(json={"RelatedTopics": []})
+
+        first = await research_context("서울", "2025-06-15", cache)
+        await research_context("서울", "2025-06-15", cache)
+
+        assert "찾지 못했습니다" in first.summary
+        assert len(httpx_mock.get_requests()) == 2
+
+    @patch("app.modules.describer._resize_for_gemini", return_value=b"resized")
+    async def test_describer_rejected_image(self, _mock_resize, cache):
+        rejected = ClientError(400, {"error": {"message": "Unable to process input image"}})
+        with patch("app.modules.describer._call_gemini", new=AsyncMock(side_effect=rejected)):
+            args = ("data:image/png;base64,aGVsbG8=", "서울", "2025-01-15", "숲", cache)
+            with pytest.raises(ClientError):
+                await describe_image(*args, cog_image_id="cog-1")
+            with pytest.raises(CachedUpstreamError, match="Unable to process"):
+                await describe_image(*args, cog_image_id="cog-1")
+
+    async def test_entry_expires_after_negative_ttl(self, cache, httpx_mock):
+        httpx_mock.add_response(status_code=404)
+        with pytest.raises(httpx.HTTPStatusError):
+            await get_mission_metadata("UNKNOWN_ID", cache)
+        cache._l1.clear()
+        with patch("app.cache.store.time") as mock_time:
+            mock_time.time.return_value = time.time() + settings.cache_negative_ttl_seconds + 1
+            assert await cache.get("mission:UNKNOWN_ID") is None
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_disabled_with_zero_ttl(self, cache, httpx_mock, monkeypatch):
+        monkeypatch.setattr(settings, "cache_negative_ttl_seconds", 0)
+        httpx_mock.add_response(status_code=404)
+        httpx_mock.add_response(status_code=404)
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await get_mission_metadata("UNKNOWN_ID", cache)
+        assert len(httpx_mock.get_requests()) == 2
+
+
+async def test_replayed_failure_does_not_trip_breaker():
+    breaker = _breakers["mission"]
+
+    async def _replayed():
+        raise CachedUpstreamError(NOT_FOUND, "Client error '404 Not Found'")
+
+    warnings: list[Warning] = []
+    try:
+        for _ in range(breaker.failure_threshold + 1):
+            assert await _safe_call("mission", _replayed(), warnings) is None
+        assert not await breaker.is_open()
+        assert breaker._failure_count == 0
+    finally:
+        breaker._failure_count = 0
+        breaker._open_until = 0.0
+    assert warnings[0].error == "Client error '404 Not Found'"
+
+
+def test_negative_outcome_ignores_regular_values():
+    assert negative_outcome({"place_name": "서울"}) is None
+    assert negative_outcome(None) is None
@@ -0,0 +1,172 @@
+"""Tests for the offline reverse geocoder index."""
+
+import math
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.modules import geocoder, offline_geocoder
+from app.modules.offline_geocoder import OfflineGeocoder, build_index, load_index, save_index
+from app.utils.metrics import geocoder_offline_lookups
+
+
+def _square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+def _boundary(props, *rings, multi=False):
+    geometry = (
+        {"type": "MultiPolygon", "coordinates": [[ring] for ring in rings]}
+        if multi
+        else {"type": "Polygon", "coordinates": list(rings)}
+    )
+    return {"type": "Feature", "properties": props, "geometry": geometry}
+
+
+def _place(name, lon, lat):
+    return {
+        "type": "Feature",
+        "properties": {"name": name},
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+    }
+
+
+BOUNDARIES = {
+    "type": "FeatureCollection",
+    "features": [
+        # 국가 경계 + 그 안의 광역 행정구역: 더 작은 경계가 우선
+        _boundary({"country": "대한민국", "country_code": "KR"}, _square(124, 33, 131, 39)),
+        _boundary(
+            {"country": "대한민국", "country_code": "KR", "region": "서울특별시"},
+            _square(126.7, 37.4, 127.2, 37.7),
+            # 구멍: 국가 경계로 떨어진다
+            _square(126.9, 37.45, 127.0, 37.5),
+        ),
+        _boundary(
+            {"country": "Fiji", "country_code": "FJ", "region": "Northern"},
+            _square(178.5, -17, 180, -16),
+            _square(-180, -17, -179.5, -16),
+            multi=True,
+        ),
+    ],
+}
+PLACES = {
+    "type": "FeatureCollection",
+    "features": [
+        _place("중구", 126.997, 37.564),
+        _place("강남구", 127.047, 37.517),
+        _place("부산", 129.075, 35.18),
+        _place("Labasa", 179.39, -16.43),
+        _place("Dateline", -179.99, -16.5),
+    ],
+}
+
+
+@pytest.fixture
+def index():
+    return OfflineGeocoder(build_index(BOUNDARIES, PLACES), max_place_km=30)
+
+
+class TestLookup:
+    def test_region_and_nearest_place(self, index):
+        location = index.lookup(126.98, 37.57)
+        assert (location.country, location.country_code, location.region) == (
+            "대한민국",
+            "kr",
+            "서울특별시",
+        )
+        assert location.city == "중구"
+        assert location.place_name == "중구, 서울특별시, 대한민국"
+        assert (location.lon, location.lat) == (126.98, 37.57)
+
+    def test_hole_falls_back_to_the_enclosing_boundary(self, index):
+        location = index.lookup(126.95, 37.47)
+        assert location.region == ""
+        assert location.country == "대한민국"
+
+    def test_place_beyond_radius_is_left_out(self, index):
+        location = index.lookup(128.5, 38.5)
+        assert location.city is None
+        assert location.place_name == "대한민국"
+
+    def test_outside_every_boundary_is_unresolved(self, index):
+        assert index.lookup(140.0, 36.0) is None
+
+    def test_nearest_place_across_the_antimeridian(self, index):
+        location = index.lookup(179.95, -16.5)
+        assert location.region == "Northern"
+        assert location.city == "Dateline"
+
+    def test_kd_search_matches_brute_force(self):
+        rng = random.Random(3)
+        points = [(rng.uniform(-180, 180), rng.uniform(-80, 80)) for _ in range(500)]
+        places = {"features": [_place(str(i), lon, lat) for i, (lon, lat) in enumerate(points)]}
+        index = OfflineGeocoder(build_index({"features": []}, places), max_place_km=20000)
+
+        def _haversine(a, b):
+            (lon1, lat1), (lon2, lat2) = (map(math.radians, p) for p in (a, b))
+            h = (
+                math.sin((lat2 - lat1) / 2) ** 2
+                + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+            )
+            return 2 * math.asin(math.sqrt(h))
+
+        for _ in range(50):
+            query = (rng.uniform(-180, 180), rng.uniform(-80, 80))
+            expected = min(range(len(points)), key=lambda i: _haversine(points[i], query))
+            assert index.nearest_place(*query) == str(expected)
+
+
+class TestIndexFile:
+    def test_round_trip_gzip(self, tmp_path):
+        path = tmp_path / "geocoder.idx.json.gz"
+        save_index(build_index(BOUNDARIES, PLACES), path)
+        loaded = OfflineGeocoder.load(path)
+        assert loaded.size == (3, 5)
+        assert loaded.lookup(129.07, 35.17).city == "부산"
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.json"
+        path.write_text('{"type": "FeatureCollection"}')
+        with pytest.raises(ValueError, match="not an offline geocoder index"):
+            OfflineGeocoder.load(path)
+
+    def test_load_failure_keeps_nominatim_only(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(offline_geocoder, "_index", None)
+        assert load_index(str(tmp_path / "missing.idx.json")) is None
+        assert offline_geocoder.get_index() is None
+
+
+class TestGeocodeIntegration:
+    @pytest.fixture(autouse=True)
+    def _installed(self, monkeypatch, index):
+        monkeypatch.setattr(offline_geocoder, "_index", index)
+
+    async def test_resolved_points_skip_cache_and_nominatim(self):
+        cache = MagicMock()
+        cache.get = AsyncMock()
+        before = geocoder_offline_lookups.labels(outcome="resolved")._value.get()
+
+        location = await geocoder.geocode(127.04, 37.52, cache)
+
+        assert location.city == "강남구"
+        cache.get.assert_not_called()
+        assert geocoder_offline_lookups.labels(outcome="resolved")._value.get() - before == 1
+
+    async def test_unresolved_points_go_to_nominatim(self, httpx_mock, monkeypatch):
+        monkeypatch.setattr(geocoder, "_buckets", {})
+        httpx_mock.add_response(
+            json={"display_name": "日本", "address": {"country": "日本", "country_code": "jp"}}
+        )
+        cache = MagicMock()
+        cache.get = AsyncMock(return_value=None)
+        cache.set = AsyncMock()
+        cache.index_point = AsyncMock()
+        before = geocoder_offline_lookups.labels(outcome="unresolved")._value.get()
+
+        location = await geocoder.geocode(140.0, 36.0, cache)
+
+        assert location.country_code == "jp"
+        assert len(httpx_mock.get_requests()) == 1
+        assert geocoder_offline_lookups.labels(outcome="unresolved")._value.get() - before == 1
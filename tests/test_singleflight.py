@@ -0,0 +1,152 @@
+"""Tests for in-process single-flight request coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.api.schemas import DescribeRequest, DescribeResponse, Warning
+from app.utils.metrics import singleflight_coalesced
+from app.utils.singleflight import SingleFlight
+
+
+def _coalesced(scope: str) -> float:
+    return singleflight_coalesced.labels(scope=scope)._value.get()
+
+
+class TestSingleFlight:
+    async def test_concurrent_same_key_runs_once(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def _work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "value"
+
+        before = _coalesced("test")
+        results = await asyncio.gather(*(flight.do("k", _work) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert _coalesced("test") - before == 4
+        assert flight.in_flight() == 0
+
+    async def test_different_keys_run_independently(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def _work(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: _work("a")), flight.do("b", lambda: _work("b"))
+        )
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_exception_propagates_to_all_callers(self):
+        flight = SingleFlight("test")
+
+        async def _fail():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("upstream down")
+
+        results = await asyncio.gather(
+            flight.do("k", _fail), flight.do("k", _fail), return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert flight.in_flight() == 0
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def _work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("k", _work) == 1
+        assert await flight.do("k", _work) == 2
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def _work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", _work))
+        second = asyncio.create_task(flight.do("k", _work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert await second == "done"
+
+
+async def test_compose_description_coalesces_identical_requests(tmp_path):
+    from app.cache.store import CacheStore
+    from app.services import composer
+
+    cache = CacheStore(str(tmp_path / "test.db"))
+    await cache.init()
+    calls = 0
+
+    async def _slow_compose(request, cache):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return DescribeResponse(description="shared")
+
+    request = DescribeRequest(thumbnail="dGVzdA==", coordinates=[126.978, 37.566])
+    try:
+        with patch.object(composer, "_compose", side_effect=_slow_compose):
+            r1, r2 = await asyncio.gather(
+                composer.compose_description(request, cache),
+                composer.compose_description(request.model_copy(), cache),
+            )
+    finally:
+        await cache.close()
+
+    assert calls == 1
+    assert r1.description == r2.description == "shared"
+    # 호출자별 사본이므로 한쪽 수정이 다른 쪽에 영향을 주지 않음
+    assert r1 is not r2
+    r1.warnings.append(Warning(module="supabase", error="save failed"))
+    assert r2.warnings == []
+
+
+async def test_geocode_coalesces_identical_cells():
+    from app.cache.store import CacheStore
+    from app.modules.geocoder import geocode
+
+    fetches = 0
+
+    async def _fetch(*args, **kwargs):
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.02)
+        resp = MagicMock()
+        resp.json.return_value = {"address": {"country": "Korea"}, "display_name": "Seoul"}
+        return resp
+
+    cache = AsyncMock(spec=CacheStore)
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+
+    before = _coalesced("geocode")
+    with patch("app.modules.geocoder._fetch_nominatim", side_effect=_fetch):
+        results = await asyncio.gather(
+            geocode(126.9781, 37.5661, cache),
+            geocode(126.9782, 37.5662, cache),
+        )
+    assert fetches == 1
+    assert results[0].country == results[1].country == "Korea"
+    assert _coalesced("geocode") - before == 1
+    cache.set.assert_awaited_once()
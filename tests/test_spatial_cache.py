@@ -0,0 +1,189 @@
+"""Tests for nearest-neighbour reuse of point-keyed cache entries."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.negative import NOT_FOUND
+from app.cache.sharded import ShardedCacheStore
+from app.cache.spatial import bounding_box, haversine_m
+from app.cache.store import CacheStore
+from app.config import settings
+from app.modules import geocoder, landcover, offline_geocoder
+from app.utils.metrics import cache_spatial_lookups
+
+SEOUL = {
+    "country": "대한민국",
+    "country_code": "kr",
+    "region": "서울특별시",
+    "city": "중구",
+    "place_name": "서울특별시 중구",
+    "lat": 37.566,
+    "lon": 126.978,
+}
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    store = CacheStore(str(tmp_path / "test.db"))
+    await store.init()
+    yield store
+    await store.close()
+
+
+def _lookups(module: str, match: str) -> float:
+    return cache_spatial_lookups.labels(module=module, match=match)._value.get()
+
+
+async def _put(store, key, value, lon, lat, **kwargs):
+    await store.set(key, value, **kwargs)
+    await store.index_point(key, lon, lat)
+
+
+class TestGeometry:
+    def test_haversine(self):
+        # 위도 1도 ≈ 111.2km
+        assert haversine_m(127.0, 37.0, 127.0, 38.0) == pytest.approx(111_195, rel=1e-3)
+        assert haversine_m(179.999, 0, -179.999, 0) < 300
+
+    def test_bounding_box_contains_the_radius(self):
+        min_lon, max_lon, min_lat, max_lat = bounding_box(127.0, 37.5, 500)
+        assert haversine_m(127.0, 37.5, max_lon, 37.5) >= 500
+        assert haversine_m(127.0, 37.5, 127.0, min_lat) >= 500
+        assert haversine_m(127.0, 37.5, max_lon, 37.5) < 520
+        assert min_lon < 127.0 < max_lon and min_lat < 37.5 < max_lat
+
+
+class TestNearest:
+    async def test_within_and_beyond_radius(self, cache):
+        await _put(cache, "geocode:v1:126.978:37.566", SEOUL, 126.978, 37.566)
+        before = _lookups("geocode", "neighbour")
+
+        # 약 90m 떨어진 이웃 셀
+        assert await cache.nearest("geocode", 1, 126.979, 37.566, 150) == SEOUL
+        assert await cache.nearest("geocode", 1, 126.979, 37.566, 50) is None
+        assert _lookups("geocode", "neighbour") - before == 1
+
+    async def test_closest_candidate_wins(self, cache):
+        await _put(cache, "geocode:v1:126.978:37.566", SEOUL, 126.978, 37.566)
+        other = {**SEOUL, "city": "종로구"}
+        await _put(cache, "geocode:v1:126.981:37.566", other, 126.981, 37.566)
+
+        assert (await cache.nearest("geocode", 1, 126.980, 37.566, 500))["city"] == "종로구"
+
+    async def test_other_modules_are_not_matched(self, cache):
+        await _put(cache, "geocode:v1:126.978:37.566", SEOUL, 126.978, 37.566)
+        assert await cache.nearest("landcover", 1, 126.978, 37.566, 500) is None
+
+    async def test_negative_and_expired_entries_are_skipped(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_negative_ttl_seconds", 300)
+        await cache.set_negative("geocode:v1:126.978:37.566", NOT_FOUND)
+        await cache.index_point("geocode:v1:126.978:37.566", 126.978, 37.566)
+        await _put(cache, "geocode:v1:126.977:37.566", SEOUL, 126.977, 37.566, ttl_seconds=1)
+        await cache._db.execute(
+            "UPDATE cache SET expires_at = ? WHERE key = ?",
+            (time.time() - 10, "geocode:v1:126.977:37.566"),
+        )
+        await cache._db.commit()
+
+        assert await cache.nearest("geocode", 1, 126.978, 37.566, 500) is None
+
+    async def test_point_joins_the_rows_group_commit(self, cache):
+        key = "geocode:v1:126.978:37.566"
+        await asyncio.gather(cache.set(key, SEOUL), cache.index_point(key, 126.978, 37.566))
+        assert await cache.nearest("geocode", 1, 126.978, 37.566, 10) == SEOUL
+
+    async def test_unknown_key_is_not_indexed(self, cache):
+        await cache.index_point("geocode:v1:0.0:0.0", 0.0, 0.0)
+        rows = await cache._db.execute_fetchall("SELECT COUNT(*) FROM cache_geo")
+        assert rows[0][0] == 0
+
+    async def test_deleting_rows_drops_spatial_entries(self, cache):
+        await _put(cache, "geocode:v1:126.978:37.566", SEOUL, 126.978, 37.566)
+        await _put(cache, "geocode:v1:126.979:37.566", SEOUL, 126.979, 37.566)
+
+        await cache.delete("geocode:v1:126.978:37.566")
+        await cache.invalidate_prefix("geocode:v1:")
+
+        for table in ("cache_geo", "cache_rtree"):
+            rows = await cache._db.execute_fetchall(f"SELECT COUNT(*) FROM {table}")
+            assert rows[0][0] == 0
+        assert await cache.nearest("geocode", 1, 126.978, 37.566, 500) is None
+
+    async def test_sharded_store_searches_the_module_shards(self, tmp_path):
+        store = ShardedCacheStore(str(tmp_path / "cache.db"), "hash", count=3)
+        await store.init()
+        try:
+            for i in range(6):
+                lon = round(126.970 + i * 0.002, 3)
+                await _put(store, f"geocode:v1:{lon}:37.566", {**SEOUL, "lon": lon}, lon, 37.566)
+            found = await store.nearest("geocode", 1, 126.9795, 37.566, 500)
+            assert found["lon"] == 126.98
+        finally:
+            await store.close()
+
+
+class TestModules:
+    @pytest.fixture(autouse=True)
+    def _no_offline_index(self, monkeypatch):
+        monkeypatch.setattr(offline_geocoder, "_index", None)
+
+    async def test_geocode_reuses_a_neighbour(self, cache, monkeypatch, httpx_mock):
+        monkeypatch.setattr(settings, "cache_geocode_neighbour_m", 200.0)
+        await _put(cache, geocoder.cache_key_for(126.978, 37.566), SEOUL, 126.978, 37.566)
+
+        location = await geocoder.geocode(126.9791, 37.5662, cache)
+
+        assert location.city == "중구"
+        assert (location.lon, location.lat) == (126.9791, 37.5662)
+        assert httpx_mock.get_requests() == []
+
+    async def test_geocode_exact_hit_is_counted(self, cache):
+        await cache.set(geocoder.cache_key_for(126.978, 37.566), SEOUL)
+        before = _lookups("geocode", "exact")
+        await geocoder.geocode(126.978, 37.566, cache)
+        assert _lookups("geocode", "exact") - before == 1
+
+    async def test_disabled_radius_skips_the_lookup(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "cache_geocode_neighbour_m", 0.0)
+        monkeypatch.setattr(geocoder, "_geocode_uncached", AsyncMock(return_value="fetched"))
+        spy = MagicMock(wraps=cache.nearest)
+        monkeypatch.setattr(cache, "nearest", spy)
+
+        assert await geocoder.geocode(126.978, 37.566, cache) == "fetched"
+        spy.assert_not_called()
+
+    async def test_disabled_radius_skips_indexing(self, cache, monkeypatch, httpx_mock):
+        monkeypatch.setattr(settings, "cache_landcover_neighbour_m", 0.0)
+        httpx_mock.add_response(json={"elements": []})
+
+        await landcover.get_land_cover(126.98, 37.57, cache)
+
+        rows = await cache._db.execute_fetchall("SELECT COUNT(*) FROM cache_geo")
+        assert rows[0][0] == 0
+
+    async def test_version_bump_retires_neighbours(self, cache, monkeypatch, httpx_mock):
+        monkeypatch.setattr(settings, "cache_landcover_neighbour_m", 500.0)
+        httpx_mock.add_response(json={"elements": []}, is_reusable=True)
+        await landcover.get_land_cover(126.98, 37.57, cache)
+
+        monkeypatch.setattr(landcover, "CACHE_VERSION", 2)
+        assert await cache.nearest("landcover", 2, 126.98, 37.57, 500) is None
+        await landcover.get_land_cover(126.983, 37.571, cache)
+        assert len(httpx_mock.get_requests()) == 2
+
+    async def test_fetched_results_are_indexed(self, cache, monkeypatch, httpx_mock):
+        monkeypatch.setattr(settings, "cache_landcover_neighbour_m", 500.0)
+        httpx_mock.add_response(
+            json={"elements": [{"type": "way", "tags": {"landuse": "residential"}}]}
+        )
+
+        first = await landcover.get_land_cover(126.98, 37.57, cache)
+        second = await landcover.get_land_cover(126.983, 37.571, cache)
+
+        assert second == first
+        assert len(httpx_mock.get_requests()) == 1
+        rows = await cache._db.execute_fetchall("SELECT module, lon, lat FROM cache_geo")
+        assert rows == [("landcover", 126.98, 37.57)]
@@ -0,0 +1,60 @@
+"""Tests for the token-bucket upstream rate limiter."""
+
+import asyncio
+
+import pytest
+
+from app.utils.metrics import rate_limiter_queue_depth, rate_limiter_rejected
+from app.utils.token_bucket import RateLimitQueueFullError, TokenBucket
+
+
+async def test_burst_then_spaced_by_rate():
+    bucket = TokenBucket("test-spacing", rate=20, burst=2)
+    loop = asyncio.get_running_loop()
+    times = []
+    for _ in range(4):
+        await bucket.acquire()
+        times.append(loop.time())
+    assert times[1] - times[0] < 0.02
+    assert times[2] - times[1] >= 0.04
+    assert times[3] - times[2] >= 0.04
+
+
+async def test_waiters_are_served_in_arrival_order():
+    bucket = TokenBucket("test-fifo", rate=100)
+    order = []
+
+    async def _take(i: int) -> None:
+        await bucket.acquire()
+        order.append(i)
+
+    await asyncio.gather(*(_take(i) for i in range(6)))
+    assert order == list(range(6))
+
+
+async def test_full_queue_rejects_instead_of_waiting():
+    bucket = TokenBucket("test-full", rate=10, max_waiters=2)
+    before = rate_limiter_rejected.labels(limiter="test-full")._value.get()
+    await bucket.acquire()  # 버스트 토큰 소모
+    waiters = [asyncio.create_task(bucket.acquire()) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert rate_limiter_queue_depth.labels(limiter="test-full")._value.get() == 2
+
+    with pytest.raises(RateLimitQueueFullError):
+        await bucket.acquire()
+    assert rate_limiter_rejected.labels(limiter="test-full")._value.get() - before == 1
+
+    await asyncio.gather(*waiters)
+    assert rate_limiter_queue_depth.labels(limiter="test-full")._value.get() == 0
+
+
+async def test_cancelled_waiter_does_not_use_a_token():
+    bucket = TokenBucket("test-cancel", rate=10)
+    await bucket.acquire()
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0.05)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    # 취소된 대기자가 토큰을 가져가지 않았으므로 다음 호출은 남은 시간만 기다린다
+    assert await bucket.acquire() < 0.09